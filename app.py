@@ -6,310 +6,215 @@
 - GitHub Actions 자동 업데이트 지원
 - 데이터 상태 모니터링
 - 유연한 기간 선택
+- 계산 로직은 core 패키지, 이 파일은 UI만 담당 (Plotly는 차트 렌더링 시점에 import)
 ================================================================================
 """
 
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from datetime import datetime, timedelta, timezone
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from core.registry import load_registry, universe_files, symbol_name, intrabar_files, intrabar_filename, intrabar_source
+from core.plan import compile_plan, evaluate_plan
+from core.indicator_cache import INDICATOR_CACHE
+from core.result_store import ResultStore, data_fingerprint, result_key
+from core.integrity import CHECKS, MANIFEST_FILENAME, read_manifest, registry_data_files, summarize, verify_files
+from core.simulator import ENGINES, simulate_plan
+from core.data import file_version, get_data_path, read_csv_data, read_resampled_data, read_universe_bars, get_data_status as data_status
+from core.metrics import calculate_metrics, relative_metrics
+from core.executor import EXECUTOR_MODES
+from core.bootstrap import BOOTSTRAP_METRICS, bootstrap_metrics, summarize_bootstrap
+from core.bars import compare_bars
+from core.timebase import date_slice, universe_clock
+from core.snapshot import (PERIODS, SNAPSHOT_FILENAME, period_range, filter_and_rebase,
+                           build_snapshot, read_snapshot, snapshot_is_current, write_snapshot)
+from core.risk import daily_leg_returns, daily_price_returns, leg_weights, compute_risk
+from core.regimes import REGIME_LABELS, REGIME_COLORS, RegimeStore, regime_breakdown
+from core.aggregates import AGGREGATE_FREQS, AggregateStore, to_heatmap
+from core.profiling import (timed, mark_cache_miss, start_run, memory_usage_mb,
+                            available_profilers, capture_profile)
+
 # ════════════════════════════════════════════════════════════════════════════════
-# 📌 페이지 설정
+# 📌 데이터 로드 (캐시)
 # ════════════════════════════════════════════════════════════════════════════════
 
-st.set_page_config(
-    page_title="트레이딩 포트폴리오 대시보드",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_csv_data(filename: str, timezone: str, version: str) -> pd.DataFrame:
+    mark_cache_miss('load_csv_data')
+    return read_csv_data(filename, timezone)
 
-# ════════════════════════════════════════════════════════════════════════════════
-# 📌 전략 설정
-# ════════════════════════════════════════════════════════════════════════════════
 
-TQQQ_CONFIG = {
-    'stoch_period': 166,
-    'stoch_k': 57,
-    'stoch_d': 19,
-    'ma_periods': [20, 45, 151, 212]
-}
-
-BITGET_CONFIG = {
-    'BTCUSDT': {'ma_period': 248, 'stoch': (46, 37, 4), 'leverage_up': 4},
-    'ETHUSDT': {'ma_period': 152, 'stoch': (58, 23, 18), 'leverage_up': 4},
-    'SOLUSDT': {'ma_period': 64, 'stoch': (51, 20, 16), 'leverage_up': 2},
-}
-
-UPBIT_CONFIG = {
-    'KRW-ADA': {'ma': 83, 'stoch': (60, 25, 5)},
-    'KRW-ANKR': {'ma': 253, 'stoch': (70, 25, 5)},
-    'KRW-AVAX': {'ma': 99, 'stoch': (120, 20, 5)},
-    'KRW-AXS': {'ma': 276, 'stoch': (50, 20, 5)},
-    'KRW-BCH': {'ma': 99, 'stoch': (50, 30, 5)},
-    'KRW-BTC': {'ma': 276, 'stoch': (80, 25, 5)},
-    'KRW-CRO': {'ma': 253, 'stoch': (120, 45, 5)},
-    'KRW-DOGE': {'ma': 213, 'stoch': (50, 30, 5)},
-    'KRW-ETH': {'ma': 201, 'stoch': (60, 20, 5)},
-    'KRW-HBAR': {'ma': 180, 'stoch': (50, 35, 5)},
-    'KRW-IMX': {'ma': 137, 'stoch': (50, 20, 5)},
-    'KRW-MANA': {'ma': 190, 'stoch': (150, 35, 5)},
-    'KRW-MVL': {'ma': 163, 'stoch': (50, 50, 5)},
-    'KRW-SAND': {'ma': 52, 'stoch': (60, 20, 5)},
-    'KRW-SOL': {'ma': 254, 'stoch': (50, 30, 5)},
-    'KRW-THETA': {'ma': 145, 'stoch': (120, 30, 5)},
-    'KRW-VET': {'ma': 172, 'stoch': (50, 30, 5)},
-    'KRW-WAXP': {'ma': 271, 'stoch': (50, 30, 5)},
-    'KRW-XLM': {'ma': 115, 'stoch': (50, 25, 5)},
-    'KRW-XRP': {'ma': 64, 'stoch': (70, 20, 5)},
-}
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_resampled_data(filename: str, interval: str, base_interval: str, version: str) -> pd.DataFrame:
+    mark_cache_miss('load_resampled_data')
+    return read_resampled_data(filename, interval, base_interval)
 
-# ════════════════════════════════════════════════════════════════════════════════
-# 📌 데이터 로드 함수
-# ════════════════════════════════════════════════════════════════════════════════
 
-def get_data_path():
-    """데이터 폴더 경로"""
-    base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, 'data')
+@timed('load_csv_data', cached=True)
+def load_csv_data(filename: str, timezone: str = 'UTC') -> pd.DataFrame:
+    """CSV 파일 로드 (캐시 - 파일 버전이 키에 포함되어 업데이트 직후에도 이전 내용을 쓰지 않음)"""
+    return _load_csv_data(filename, timezone, file_version(filename))
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def load_csv_data(filename: str) -> pd.DataFrame:
-    """CSV 파일 로드"""
-    try:
-        filepath = os.path.join(get_data_path(), filename)
-        if not os.path.exists(filepath):
-            return None
-        
-        df = pd.read_csv(filepath)
-        
-        if 'date' in df.columns:
-            df['datetime'] = pd.to_datetime(df['date'])
-        elif 'datetime' in df.columns:
-            df['datetime'] = pd.to_datetime(df['datetime'])
-        
-        df.set_index('datetime', inplace=True)
-        df.index = df.index.tz_localize(None)
-        df.columns = [c.lower() for c in df.columns]
-        
-        return df
-    except Exception as e:
-        return None
+@timed('load_resampled_data', cached=True)
+def load_resampled_data(filename: str, interval: str, base_interval: str) -> pd.DataFrame:
+    """인트라바 로드 + 리샘플 (캐시 - 파일 버전 키)"""
+    return _load_resampled_data(filename, interval, base_interval, file_version(filename))
+
 
+def load_bars(universe: dict, symbol: str, interval: str) -> pd.DataFrame:
+    """CSV 봉 우선, 없으면 (또는 derive_intervals) 인트라바에서 리샘플 (캐시된 로더 사용)"""
+    return read_universe_bars(universe, symbol, interval, csv_loader=load_csv_data, resampled_loader=load_resampled_data)
 
-def get_data_status(filename: str) -> dict:
+
+def get_data_status(filename: str, timezone: str = 'UTC') -> dict:
     """데이터 파일 상태 확인"""
-    filepath = os.path.join(get_data_path(), filename)
-    
-    if not os.path.exists(filepath):
-        return {'exists': False, 'filename': filename}
-    
-    try:
-        df = load_csv_data(filename)
-        if df is None or len(df) == 0:
-            return {'exists': False, 'filename': filename}
-        
-        return {
-            'exists': True,
-            'filename': filename,
-            'rows': len(df),
-            'start': df.index.min().strftime('%Y-%m-%d'),
-            'end': df.index.max().strftime('%Y-%m-%d %H:%M'),
-            'last_update': df.index.max()
-        }
-    except:
-        return {'exists': False, 'filename': filename}
+    return data_status(filename, loader=load_csv_data, timezone=timezone)
 
-# ════════════════════════════════════════════════════════════════════════════════
-# 📌 지표 계산 함수
-# ════════════════════════════════════════════════════════════════════════════════
 
-def calculate_stochastic(df: pd.DataFrame, period: int, k_smooth: int, d_period: int) -> pd.DataFrame:
-    """스토캐스틱 계산"""
-    df = df.copy()
-    df['hh'] = df['high'].rolling(window=period, min_periods=period).max()
-    df['ll'] = df['low'].rolling(window=period, min_periods=period).min()
-    
-    denom = df['hh'] - df['ll']
-    denom = denom.replace(0, np.nan)
-    
-    df['k_raw'] = (df['close'] - df['ll']) / denom * 100
-    df['stoch_k'] = df['k_raw'].rolling(window=k_smooth, min_periods=k_smooth).mean()
-    df['stoch_d'] = df['stoch_k'].rolling(window=d_period, min_periods=d_period).mean()
-    
-    return df
+@timed('verify_data', cached=True)
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def verify_data(registry: dict, data_path: str, fingerprint: str) -> dict:
+    """데이터 무결성 검증 (파일 지문별 1회, 체크섬이 매니페스트와 같은 파일은 검증 생략)"""
+    mark_cache_miss('verify_data')
+    entries, validated = verify_files(registry_data_files(registry), data_path, read_manifest(data_path))
+    return {'entries': entries, 'validated': validated, 'summary': summarize(entries)}
 
 
-def calculate_ma(series: pd.Series, period: int) -> pd.Series:
-    """이동평균선 계산"""
-    return series.rolling(window=period, min_periods=period).mean()
+def get_data_verification(registry: dict, data_path: str) -> dict:
+    """데이터 파일 + 매니페스트가 바뀌었을 때만 다시 검증"""
+    manifest_path = os.path.join(data_path, MANIFEST_FILENAME)
+    manifest_mtime = os.stat(manifest_path).st_mtime_ns if os.path.exists(manifest_path) else 0
+    return verify_data(registry, data_path, f"{data_fingerprint(registry, data_path)}:{manifest_mtime}")
 
 # ════════════════════════════════════════════════════════════════════════════════
-# 📌 백테스트 함수
+# 📌 캐시 / 렌더링 헬퍼
 # ════════════════════════════════════════════════════════════════════════════════
 
-def backtest_tqqq_strategy(data: pd.DataFrame) -> pd.DataFrame:
-    """TQQQ 전략 백테스트"""
-    if data is None or len(data) < 220:
-        return None
-    
-    df = data.copy()
-    df = calculate_stochastic(df, TQQQ_CONFIG['stoch_period'], TQQQ_CONFIG['stoch_k'], TQQQ_CONFIG['stoch_d'])
-    
-    for ma in TQQQ_CONFIG['ma_periods']:
-        df[f'ma{ma}'] = calculate_ma(df['close'], ma)
-    
-    df = df.dropna()
-    if len(df) < 50:
-        return None
-    
-    positions = []
-    for i in range(len(df)):
-        row = df.iloc[i]
-        is_bullish = row['stoch_k'] > row['stoch_d']
-        ma_signals = {p: row['close'] > row[f'ma{p}'] for p in TQQQ_CONFIG['ma_periods']}
-        
-        if is_bullish:
-            tqqq_ratio = sum(ma_signals.values()) * 0.25
-        else:
-            tqqq_ratio = (int(ma_signals[20]) + int(ma_signals[45])) * 0.5
-        
-        positions.append(tqqq_ratio)
-    
-    df['position'] = positions
-    df['daily_return'] = df['close'].pct_change()
-    df['strategy_return'] = df['position'].shift(1) * df['daily_return']
-    df['strategy_return'] = df['strategy_return'].fillna(0)
-    df['cumulative_return'] = (1 + df['strategy_return']).cumprod()
-    
-    return df
+@timed('bootstrap', cached=True)
+@st.cache_data(ttl=300, show_spinner=False)
+def run_bootstrap(returns: pd.Series, periods_per_year: int, n_paths: int, block_size: int, seed: int) -> dict:
+    """블록 부트스트랩 (입력이 같으면 캐시 재사용)"""
+    mark_cache_miss('bootstrap')
+    return bootstrap_metrics(returns, periods_per_year, n_paths=n_paths, block_size=block_size, seed=seed)
 
 
-def backtest_bitget_strategy(btc_data, eth_data, sol_data) -> pd.DataFrame:
-    """Bitget 선물 전략 백테스트"""
-    results = {}
-    data_dict = {'BTCUSDT': btc_data, 'ETHUSDT': eth_data, 'SOLUSDT': sol_data}
-    
-    for symbol, config in BITGET_CONFIG.items():
-        data = data_dict.get(symbol)
-        if data is None or len(data) < config['ma_period'] + 50:
-            continue
-        
-        df = data.copy()
-        df['ma'] = calculate_ma(df['close'], config['ma_period'])
-        k_period, k_smooth, d_period = config['stoch']
-        df = calculate_stochastic(df, k_period, k_smooth, d_period)
-        df = df.dropna()
-        
-        if len(df) < 50:
-            continue
-        
-        df['signal'] = (df['open'] > df['ma']) & (df['stoch_k'] > df['stoch_d'])
-        df['position'] = df['signal'].astype(float) * config['leverage_up']
-        df['return'] = df['close'].pct_change()
-        df['strategy_return'] = df['position'].shift(1) * df['return']
-        df['strategy_return'] = df['strategy_return'].clip(lower=-0.99).fillna(0)
-        
-        results[symbol.replace('USDT', '')] = df['strategy_return']
-    
-    if not results:
+@timed('risk', cached=True)
+@st.cache_data(ttl=300, show_spinner=False, max_entries=16)
+def run_risk(returns: pd.DataFrame, benchmark: pd.Series, weights: pd.Series, window: int, step: int) -> dict:
+    """상관 / 베타 / 위험 기여도 (기간 · 윈도우별 캐시)"""
+    mark_cache_miss('risk')
+    return compute_risk(returns, benchmark, weights, window=window, step=step)
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_store() -> ResultStore:
+    """백테스트 결과 저장소 (세션 간 공유, 같은 입력의 동시 실행은 한 번만 계산)"""
+    return ResultStore()
+
+
+@st.cache_resource(show_spinner=False)
+def get_regime_store() -> RegimeStore:
+    """시장 국면 라벨 저장소 (세션 간 공유, 새 봉만 계산)"""
+    return RegimeStore()
+
+
+@st.cache_resource(show_spinner=False)
+def get_aggregate_store() -> AggregateStore:
+    """기간별 집계 저장소 (세션 간 공유)"""
+    return AggregateStore()
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def read_snapshot_cached(filepath: str, mtime: float) -> dict:
+    """스냅샷 로드 (파일 수정 시각별 1회, 세션 간 공유 - 읽기 전용으로만 사용)"""
+    return read_snapshot(filepath)
+
+
+def get_snapshot() -> dict:
+    """data/snapshot.npz (없으면 None)"""
+    filepath = os.path.join(get_data_path(), SNAPSHOT_FILENAME)
+    if not os.path.exists(filepath):
         return None
-    
-    combined = pd.DataFrame(results).fillna(0)
-    combined['portfolio_return'] = combined.mean(axis=1)
-    combined['cumulative_return'] = (1 + combined['portfolio_return']).cumprod()
-    
-    return combined
+    return read_snapshot_cached(filepath, os.path.getmtime(filepath))
 
 
-def backtest_upbit_strategy(data_4h_dict: dict, data_1d_dict: dict) -> pd.DataFrame:
-    """업비트 현물 전략 백테스트"""
-    results = {}
-    
-    for ticker, config in UPBIT_CONFIG.items():
-        symbol = ticker.replace('KRW-', '').lower()
-        data_4h = data_4h_dict.get(symbol)
-        data_1d = data_1d_dict.get(symbol)
-        
-        if data_4h is None or data_1d is None or len(data_4h) < config['ma'] + 10:
-            continue
-        
-        df_4h = data_4h.copy()
-        df_4h['ma'] = calculate_ma(df_4h['close'], config['ma'])
+def publish_snapshot(registry: dict, results: dict, fingerprint: str):
+    """실시간 계산 결과로 data/snapshot.npz 생성 (스냅샷은 저장소에 커밋하지 않으므로 데이터가 바뀐 뒤 첫 계산이 만듦)"""
+    files = {
+        filename: get_data_status(filename, universe_clock(universe)[0])
+        for universe in registry['universes'].values()
+        for _, _, filename in universe_files(universe)
+    }
+    try:
+        with timed('snapshot:write'):
+            snapshot = build_snapshot(registry, results, files, fingerprint=fingerprint)
+            write_snapshot(snapshot, os.path.join(get_data_path(), SNAPSHOT_FILENAME))
+    except OSError:
+        pass  # 읽기 전용 배포 - 다음 실행도 실시간 계산
+
+
+def show_chart(fig, name: str):
+    """Plotly 차트 렌더링 (직렬화 시간 계측)"""
+    with timed(f'plotly:{name}'):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def get_profile_path():
+    """프로파일 저장 폴더 경로"""
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, 'profiles')
+
+
+def render_debug_panel(container, profile):
+    """단계별 소요 시간 / 캐시 hit·miss / 메모리"""
+    with container:
+        st.metric("전체 실행 시간", f"{profile.elapsed()*1000:.0f} ms")
         
-        df_1d = data_1d.copy()
-        k_period, k_smooth, d_period = config['stoch']
-        df_1d = calculate_stochastic(df_1d, k_period, k_smooth, d_period)
+        memory = memory_usage_mb()
+        if memory['rss'] is not None:
+            st.caption(f"메모리: 현재 {memory['rss']:.0f} MB / 최대 {memory['peak'] or 0:.0f} MB")
         
-        df_4h['date'] = df_4h.index.date
-        df_1d['date'] = df_1d.index.date
+        st.markdown("**단계별 시간 (ms)**")
+        st.dataframe(profile.stage_table().style.format({'total_ms': '{:.1f}', 'max_ms': '{:.1f}'}), use_container_width=True)
+        st.caption("코인별 세부 단계(지표, 날짜 매핑)는 serial 모드에서만 측정됩니다.")
         
-        stoch_daily = df_1d[['date', 'stoch_k', 'stoch_d']].drop_duplicates(subset='date', keep='last').set_index('date')
-        df_4h['stoch_k'] = df_4h['date'].map(stoch_daily['stoch_k'])
-        df_4h['stoch_d'] = df_4h['date'].map(stoch_daily['stoch_d'])
-        df_4h = df_4h.dropna()
+        st.markdown("**캐시**")
+        st.dataframe(profile.cache_table(), use_container_width=True)
         
-        if len(df_4h) < 50:
-            continue
+        stats = INDICATOR_CACHE.stats()
+        st.caption(
+            f"지표 캐시 (누적): 적중률 {stats['hit_rate']*100:.0f}% ({stats['hits']:,} hit / {stats['misses']:,} miss) · "
+            f"{stats['entries']}개 · {stats['bytes']/1024**2:.1f} / {stats['max_bytes']/1024**2:.0f} MB · 제거 {stats['evictions']}"
+        )
+        st.caption("process 모드에서는 워커 프로세스마다 지표 캐시를 따로 가집니다.")
         
-        df_4h['signal'] = (df_4h['open'] > df_4h['ma']) & (df_4h['stoch_k'] > df_4h['stoch_d'])
-        df_4h['position'] = df_4h['signal'].astype(float)
-        df_4h['return'] = df_4h['close'].pct_change()
-        df_4h['strategy_return'] = df_4h['position'].shift(1) * df_4h['return']
-        df_4h['strategy_return'] = df_4h['strategy_return'].fillna(0)
+        stats = get_result_store().stats()
+        st.caption(
+            f"결과 저장소 (세션 공유): {stats['hits']:,} hit / {stats['waits']:,} 대기(중복 제거) / {stats['misses']:,} 계산 · "
+            f"{stats['entries']}/{stats['max_entries']}개 · 계산 중 {stats['in_flight']} · 누적 계산 {stats['compute_seconds']:.1f}s"
+        )
         
-        results[symbol.upper()] = df_4h['strategy_return']
-    
-    if not results:
-        return None
-    
-    combined = pd.DataFrame(results).fillna(0)
-    combined['portfolio_return'] = combined.mean(axis=1)
-    combined['cumulative_return'] = (1 + combined['portfolio_return']).cumprod()
-    
-    return combined
-
-# ════════════════════════════════════════════════════════════════════════════════
-# 📌 성과 지표 계산
-# ════════════════════════════════════════════════════════════════════════════════
-
-def calculate_metrics(returns: pd.Series, periods_per_year: int = 252) -> dict:
-    """성과 지표 계산"""
-    returns = returns.dropna()
-    if len(returns) < 10:
-        return {'total_return': 0, 'cagr': 0, 'volatility': 0, 'sharpe': 0, 'max_drawdown': 0, 'win_rate': 0}
-    
-    cumulative = (1 + returns).cumprod()
-    total_return = cumulative.iloc[-1] - 1
-    years = max(len(returns) / periods_per_year, 0.1)
-    cagr = (cumulative.iloc[-1]) ** (1/years) - 1 if cumulative.iloc[-1] > 0 else 0
-    volatility = returns.std() * np.sqrt(periods_per_year)
-    sharpe = (cagr / volatility) if volatility > 0 else 0
-    peak = cumulative.expanding().max()
-    max_drawdown = ((cumulative - peak) / peak).min()
-    win_rate = (returns > 0).mean()
-    
-    return {
-        'total_return': total_return * 100,
-        'cagr': cagr * 100,
-        'volatility': volatility * 100,
-        'sharpe': sharpe,
-        'max_drawdown': max_drawdown * 100,
-        'win_rate': win_rate * 100
-    }
+        engine = st.selectbox("프로파일러", available_profilers(), key="profile_engine")
+        st.button("📸 다음 실행 프로파일 저장", on_click=lambda: st.session_state.update(capture_profile=engine))
 
 # ════════════════════════════════════════════════════════════════════════════════
 # 📌 메인 UI
 # ════════════════════════════════════════════════════════════════════════════════
 
 def main():
+    st.set_page_config(
+        page_title="트레이딩 포트폴리오 대시보드",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    profile = start_run()
+    
     st.title("📊 트레이딩 전략 포트폴리오 대시보드")
     st.markdown("**CSV 데이터 기반 백테스트 + GitHub Actions 자동 업데이트**")
     
@@ -322,26 +227,14 @@ def main():
     # 기간 선택 (개선됨)
     period_option = st.sidebar.selectbox(
         "📅 분석 기간",
-        ["최근 1개월", "최근 6개월", "최근 1년", "YTD (연초부터)", "전체 기간", "📆 기간 직접 설정"]
+        list(PERIODS.values()) + ["📆 기간 직접 설정"]
     )
     
-    today = datetime.now().date()
-    
-    if period_option == "최근 1개월":
-        start_date = today - timedelta(days=30)
-        end_date = today
-    elif period_option == "최근 6개월":
-        start_date = today - timedelta(days=180)
-        end_date = today
-    elif period_option == "최근 1년":
-        start_date = today - timedelta(days=365)
-        end_date = today
-    elif period_option == "YTD (연초부터)":
-        start_date = datetime(today.year, 1, 1).date()
-        end_date = today
-    elif period_option == "전체 기간":
-        start_date = today - timedelta(days=365*10)
-        end_date = today
+    today = datetime.now(timezone.utc).date()
+    period = next((key for key, label in PERIODS.items() if label == period_option), None)
+    
+    if period is not None:
+        start_date, end_date = period_range(period, today)
     else:  # 기간 직접 설정
         st.sidebar.markdown("##### 📆 기간 직접 설정")
         col1, col2 = st.sidebar.columns(2)
@@ -350,10 +243,20 @@ def main():
     
     st.sidebar.markdown("---")
     st.sidebar.subheader("💰 포트폴리오 배분")
-    col1, col2, col3 = st.sidebar.columns(3)
-    tqqq_weight = col1.number_input("TQQQ", 0, 100, 33)
-    bitget_weight = col2.number_input("Bitget", 0, 100, 33)
-    upbit_weight = col3.number_input("업비트", 0, 100, 34)
+    registry = load_registry()
+    strategies = registry['strategies']
+    weight_cols = st.sidebar.columns(len(strategies))
+    weights = {}
+    for idx, (strategy_id, strategy) in enumerate(strategies.items()):
+        default = 100 - (100 // len(strategies)) * idx if idx == len(strategies) - 1 else 100 // len(strategies)
+        label = registry['universes'][strategy['universe']].get('label', strategy_id)
+        weights[strategy_id] = weight_cols[idx].number_input(label, 0, 100, default)
+    
+    st.sidebar.markdown("---")
+    executor_mode = st.sidebar.selectbox("⚡ 코인별 백테스트 실행 방식", EXECUTOR_MODES, index=0)
+    engine = st.sidebar.radio("🧮 백테스트 엔진", list(ENGINES), format_func=ENGINES.get, horizontal=True)
+    debug_mode = st.sidebar.checkbox("🐞 성능 디버그 패널", value=False)
+    debug_panel = st.sidebar.expander("🐞 성능 디버그", expanded=True) if debug_mode else None
     
     # ════════════════════════════════════════════════════════════════════════════
     # 데이터 로딩
@@ -366,90 +269,129 @@ def main():
         st.info("📁 GitHub Actions가 자동으로 데이터를 생성합니다. 잠시 기다려주세요.")
         return
     
-    # 데이터 로드
-    with st.spinner("📡 데이터 로딩 중..."):
-        tqqq_data = load_csv_data('tqqq_daily.csv')
-        btc_4h = load_csv_data('bitget_btc_4h.csv')
-        eth_4h = load_csv_data('bitget_eth_4h.csv')
-        sol_4h = load_csv_data('bitget_sol_4h.csv')
-        
-        upbit_4h_data = {}
-        upbit_1d_data = {}
-        for ticker in UPBIT_CONFIG.keys():
-            symbol = ticker.replace('KRW-', '').lower()
-            upbit_4h_data[symbol] = load_csv_data(f'upbit_{symbol}_4h.csv')
-            upbit_1d_data[symbol] = load_csv_data(f'upbit_{symbol}_1d.csv')
+    # 고정 기간 + 벡터화 엔진이면 업데이터가 만든 스냅샷으로 렌더링 (CSV 로드 / 백테스트 생략)
+    snapshot = get_snapshot()
+    fingerprint = data_fingerprint(registry, data_path)
+    use_snapshot = period is not None and engine == 'vectorized' and snapshot_is_current(snapshot, registry, today, fingerprint)
+    
+    def status_of(filename, universe):
+        if use_snapshot:
+            return snapshot['files'].get(filename, {'exists': False, 'filename': filename})
+        return get_data_status(filename, universe_clock(universe)[0])
     
     # ════════════════════════════════════════════════════════════════════════════
     # 📊 데이터 상태 표시
     # ════════════════════════════════════════════════════════════════════════════
     
     with st.sidebar.expander("📁 데이터 상태 확인", expanded=False):
-        # TQQQ
-        status = get_data_status('tqqq_daily.csv')
-        if status['exists']:
-            st.success(f"**TQQQ**: {status['rows']:,}행")
-            st.caption(f"{status['start']} ~ {status['end']}")
+        verification = get_data_verification(registry, data_path)
+        summary = verification['summary']
+        checked = f"{summary['files']}개 파일 (체크섬 일치 {summary['files'] - verification['validated']} / 새로 검증 {verification['validated']})"
+        if summary['error_files']:
+            st.error(f"🔍 무결성 검증: 오류 {len(summary['error_files'])}개 파일 - {checked}")
+            for filename in summary['error_files'][:5]:
+                errors = verification['entries'][filename]['errors']
+                st.caption(f"❌ {filename}: " + ', '.join(f"{CHECKS[name][0]} {count}" for name, count in errors.items()))
         else:
-            st.error("**TQQQ**: 없음")
-        
+            st.success(f"🔍 무결성 검증: 오류 없음 - {checked}")
+        if summary['warnings']:
+            st.caption("⚠️ " + ', '.join(
+                f"{CHECKS[name][0]} {count}건" for name, count in summary['warnings'].items()
+            ) + f" ({len(summary['warning_files'])}개 파일, 주말 · 휴장 · 점검)")
         st.markdown("---")
         
-        # Bitget
-        st.markdown("**Bitget (4H)**")
-        for symbol in ['btc', 'eth', 'sol']:
-            status = get_data_status(f'bitget_{symbol}_4h.csv')
-            if status['exists']:
-                st.write(f"✅ {symbol.upper()}: {status['rows']:,}행")
-            else:
-                st.write(f"❌ {symbol.upper()}: 없음")
-        
-        st.markdown("---")
-        
-        # 업비트
-        st.markdown("**업비트**")
-        upbit_4h_count = sum(1 for s in UPBIT_CONFIG.keys() 
-                            if get_data_status(f'upbit_{s.replace("KRW-", "").lower()}_4h.csv')['exists'])
-        upbit_1d_count = sum(1 for s in UPBIT_CONFIG.keys() 
-                            if get_data_status(f'upbit_{s.replace("KRW-", "").lower()}_1d.csv')['exists'])
-        
-        st.write(f"4H 데이터: {upbit_4h_count}/{len(UPBIT_CONFIG)} 코인")
-        st.write(f"1D 데이터: {upbit_1d_count}/{len(UPBIT_CONFIG)} 코인")
-        
-        # 누락된 코인 표시
-        missing_coins = []
-        for ticker in UPBIT_CONFIG.keys():
-            symbol = ticker.replace('KRW-', '').lower()
-            if not get_data_status(f'upbit_{symbol}_4h.csv')['exists']:
-                missing_coins.append(symbol.upper())
-        
-        if missing_coins:
-            st.warning(f"누락: {', '.join(missing_coins[:5])}{'...' if len(missing_coins) > 5 else ''}")
+        for idx, (universe_id, universe) in enumerate(registry['universes'].items()):
+            if idx > 0:
+                st.markdown("---")
+            
+            label = universe.get('label', '')
+            files = universe_files(universe)
+            
+            # 단일 파일 유니버스 (TQQQ)
+            if len(files) == 1:
+                status = status_of(files[0][2], universe)
+                if status['exists']:
+                    st.success(f"**{label}**: {status['rows']:,}행")
+                    st.caption(f"{status['start']} ~ {status['end']}")
+                else:
+                    st.error(f"**{label}**: 없음")
+                continue
+            
+            st.markdown(f"**{label}**")
+            exists = {(symbol, interval): status_of(filename, universe)['exists'] for symbol, interval, filename in files}
+            for interval in universe['intervals']:
+                count = sum(1 for symbol in universe['symbols'] if exists[(symbol, interval)])
+                st.write(f"{interval.upper()} 데이터: {count}/{len(universe['symbols'])} 코인")
+            
+            # 누락된 코인 표시
+            missing_coins = [
+                symbol_name(universe, symbol).upper() for symbol in universe['symbols']
+                if not all(exists[(symbol, interval)] for interval in universe['intervals'])
+            ]
+            if missing_coins:
+                st.warning(f"누락: {', '.join(missing_coins[:5])}{'...' if len(missing_coins) > 5 else ''}")
+            
+            # 인트라바 (.npz) 파일 수 + 리샘플 봉과 저장된 봉 일치 여부
+            for interval in universe.get('intrabar', []):
+                available = [
+                    symbol for symbol, iv, filename in intrabar_files(universe)
+                    if iv == interval and os.path.exists(os.path.join(data_path, filename))
+                ]
+                st.caption(f"인트라바 {interval.upper()}: {len(available)}/{len(universe['symbols'])} 코인")
+                
+                for target in universe['intervals']:
+                    if use_snapshot or intrabar_source(universe, target) != interval or universe.get('derive_intervals'):
+                        continue
+                    checks = [
+                        compare_bars(
+                            load_bars(universe, symbol, target),
+                            load_resampled_data(intrabar_filename(universe, symbol, interval), target, interval),
+                        )
+                        for symbol in available
+                    ]
+                    overlap = sum(c['overlap'] for c in checks)
+                    if overlap:
+                        matched = sum(c['matched'] for c in checks)
+                        st.caption(f"{interval.upper()} → {target.upper()} 리샘플 검증: {matched:,}/{overlap:,}봉 일치")
     
     # ════════════════════════════════════════════════════════════════════════════
     # 백테스트 실행
     # ════════════════════════════════════════════════════════════════════════════
     
-    with st.spinner("📈 전략 백테스트 중..."):
-        tqqq_result = backtest_tqqq_strategy(tqqq_data)
-        bitget_result = backtest_bitget_strategy(btc_4h, eth_4h, sol_4h)
-        upbit_result = backtest_upbit_strategy(upbit_4h_data, upbit_1d_data)
+    if use_snapshot:
+        results = {sid: snapshot['strategies'].get(sid) for sid in strategies}
+    else:
+        def run_backtest():
+            # 데이터 로드 (레지스트리의 유니버스 × 심볼 × 봉 간격) + 백테스트 - 결과 저장소에 없을 때만
+            frames = {}
+            for universe_id, universe in registry['universes'].items():
+                for symbol, interval, filename in universe_files(universe):
+                    frames[(universe_id, symbol, interval)] = load_bars(universe, symbol, interval)
+            
+            plan = compile_plan(registry)
+            results = evaluate_plan(plan, frames, executor=executor_mode)
+            if engine == 'event':
+                results = simulate_plan(plan, frames, results)
+            else:
+                publish_snapshot(registry, results, fingerprint)
+            return results
+        
+        # 같은 입력이면 세션 간 결과 공유 (다른 세션이 계산 중이면 기다림)
+        with st.spinner("📈 전략 백테스트 중..."):
+            results = get_result_store().get_or_compute(result_key(registry, data_path, engine), run_backtest)
     
-    # 기간 필터링
-    start_ts = pd.Timestamp(start_date)
-    end_ts = pd.Timestamp(end_date)
+    # 기간 필터링 (UTC 날짜 기준, 시작일 / 종료일 포함 - 모든 시리즈 인덱스가 UTC)
+    full_returns = {sid: res['returns'] if res else None for sid, res in results.items()}
+    filtered = {sid: filter_and_rebase(df, start_date, end_date) for sid, df in full_returns.items()}
+    positions = {sid: date_slice(res['positions'], start_date, end_date) if res else None for sid, res in results.items()}
+    # Buy & Hold: 백테스트가 같은 봉 수익률로 함께 만든 시리즈 (추가 로드 / 계산 없음)
+    benchmarks = {sid: filter_and_rebase(res['benchmark'], start_date, end_date) if res else None for sid, res in results.items()}
     
-    def filter_and_rebase(df, return_col):
-        if df is None or len(df) == 0:
-            return None
-        filtered = df[start_ts:end_ts].copy()
-        if len(filtered) > 0:
-            filtered['cumulative_return'] = (1 + filtered[return_col]).cumprod()
-        return filtered
+    def has_data(strategy_id):
+        return filtered.get(strategy_id) is not None and len(filtered[strategy_id]) > 0
     
-    tqqq_filtered = filter_and_rebase(tqqq_result, 'strategy_return')
-    bitget_filtered = filter_and_rebase(bitget_result, 'portfolio_return')
-    upbit_filtered = filter_and_rebase(upbit_result, 'portfolio_return')
+    def leg_columns(df):
+        return [c for c in df.columns if c not in ['portfolio_return', 'cumulative_return']]
     
     # ════════════════════════════════════════════════════════════════════════════
     # 📈 성과 요약
@@ -457,42 +399,33 @@ def main():
     
     st.markdown("---")
     st.subheader("📈 전략별 성과 요약")
-    st.caption(f"분석 기간: {start_date} ~ {end_date}")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("### 🇺🇸 TQQQ Sniper")
-        if tqqq_filtered is not None and len(tqqq_filtered) > 0:
-            metrics = calculate_metrics(tqqq_filtered['strategy_return'], 252)
-            st.metric("누적 수익률", f"{metrics['total_return']:.1f}%")
-            st.metric("CAGR", f"{metrics['cagr']:.1f}%")
-            st.metric("최대 낙폭", f"{metrics['max_drawdown']:.1f}%")
-            st.metric("샤프 비율", f"{metrics['sharpe']:.2f}")
-        else:
-            st.warning("데이터 없음")
-    
-    with col2:
-        st.markdown("### 🔶 Bitget 선물")
-        if bitget_filtered is not None and len(bitget_filtered) > 0:
-            metrics = calculate_metrics(bitget_filtered['portfolio_return'], 252*6)
-            st.metric("누적 수익률", f"{metrics['total_return']:.1f}%")
-            st.metric("CAGR", f"{metrics['cagr']:.1f}%")
-            st.metric("최대 낙폭", f"{metrics['max_drawdown']:.1f}%")
-            st.metric("샤프 비율", f"{metrics['sharpe']:.2f}")
-        else:
-            st.warning("데이터 없음")
-    
-    with col3:
-        st.markdown("### 🟠 업비트 현물")
-        if upbit_filtered is not None and len(upbit_filtered) > 0:
-            metrics = calculate_metrics(upbit_filtered['portfolio_return'], 252*6)
-            st.metric("누적 수익률", f"{metrics['total_return']:.1f}%")
-            st.metric("CAGR", f"{metrics['cagr']:.1f}%")
-            st.metric("최대 낙폭", f"{metrics['max_drawdown']:.1f}%")
-            st.metric("샤프 비율", f"{metrics['sharpe']:.2f}")
-        else:
-            st.warning("데이터 없음")
+    st.caption(f"분석 기간: {start_date} ~ {end_date} (UTC, 차트 시각도 UTC)")
+    if use_snapshot:
+        st.caption(f"🧊 스냅샷 v{snapshot['version']} ({snapshot['created_at'][:16].replace('T', ' ')} UTC 생성) 기준")
+    
+    for col, (strategy_id, strategy) in zip(st.columns(len(strategies)), strategies.items()):
+        with col:
+            st.markdown(f"### {strategy['icon']} {strategy['label']}")
+            if has_data(strategy_id):
+                if use_snapshot and period in results[strategy_id]['metrics']:
+                    metrics = results[strategy_id]['metrics'][period]
+                else:
+                    metrics = calculate_metrics(filtered[strategy_id]['portfolio_return'], strategy['periods_per_year'])
+                st.metric("누적 수익률", f"{metrics['total_return']:.1f}%")
+                st.metric("CAGR", f"{metrics['cagr']:.1f}%")
+                st.metric("최대 낙폭", f"{metrics['max_drawdown']:.1f}%")
+                st.metric("샤프 비율", f"{metrics['sharpe']:.2f}")
+                
+                if use_snapshot and period in results[strategy_id]['relative']:
+                    relative = results[strategy_id]['relative'][period]
+                else:
+                    relative = relative_metrics(
+                        filtered[strategy_id]['portfolio_return'], benchmarks[strategy_id]['portfolio_return'], strategy['periods_per_year']
+                    )
+                st.metric("Buy & Hold", f"{relative['benchmark_return']:.1f}%", delta=f"{relative['excess_return']:+.1f}%p 초과")
+                st.caption(f"추적오차 {relative['tracking_error']:.1f}% · 정보비율 {relative['information_ratio']:.2f}")
+            else:
+                st.warning("데이터 없음")
     
     # ════════════════════════════════════════════════════════════════════════════
     # 📊 누적 수익률 차트
@@ -501,34 +434,30 @@ def main():
     st.markdown("---")
     st.subheader("📊 누적 수익률 비교")
     
-    fig = go.Figure()
-    
-    if tqqq_filtered is not None and len(tqqq_filtered) > 0:
-        fig.add_trace(go.Scatter(
-            x=tqqq_filtered.index,
-            y=(tqqq_filtered['cumulative_return'] - 1) * 100,
-            name='TQQQ Sniper',
-            line=dict(color='#2962FF', width=2)
-        ))
+    with timed('import:plotly'):
+        import plotly.graph_objects as go
     
-    if bitget_filtered is not None and len(bitget_filtered) > 0:
-        fig.add_trace(go.Scatter(
-            x=bitget_filtered.index,
-            y=(bitget_filtered['cumulative_return'] - 1) * 100,
-            name='Bitget 선물',
-            line=dict(color='#FF6D00', width=2)
-        ))
+    fig = go.Figure()
     
-    if upbit_filtered is not None and len(upbit_filtered) > 0:
-        fig.add_trace(go.Scatter(
-            x=upbit_filtered.index,
-            y=(upbit_filtered['cumulative_return'] - 1) * 100,
-            name='업비트 현물',
-            line=dict(color='#00C853', width=2)
-        ))
+    for strategy_id, strategy in strategies.items():
+        if has_data(strategy_id):
+            fig.add_trace(go.Scatter(
+                x=filtered[strategy_id].index,
+                y=(filtered[strategy_id]['cumulative_return'] - 1) * 100,
+                name=strategy['label'],
+                legendgroup=strategy_id,
+                line=dict(color=strategy['color'], width=2)
+            ))
+            fig.add_trace(go.Scatter(
+                x=benchmarks[strategy_id].index,
+                y=(benchmarks[strategy_id]['cumulative_return'] - 1) * 100,
+                name=f"{strategy['label']} B&H",
+                legendgroup=strategy_id,
+                line=dict(color=strategy['color'], width=1, dash='dot')
+            ))
     
     fig.update_layout(
-        title=f'전략별 누적 수익률 (%) - {start_date} ~ {end_date}',
+        title=f'전략별 누적 수익률 (%) - {start_date} ~ {end_date} (점선: Buy & Hold)',
         xaxis_title='날짜',
         yaxis_title='수익률 (%)',
         hovermode='x unified',
@@ -538,7 +467,7 @@ def main():
     )
     fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
     
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig, 'cumulative')
     
     # ════════════════════════════════════════════════════════════════════════════
     # 📋 전략별 상세
@@ -547,103 +476,339 @@ def main():
     st.markdown("---")
     st.subheader("📋 전략별 상세 정보")
     
-    tab1, tab2, tab3 = st.tabs(["🇺🇸 TQQQ Sniper", "🔶 Bitget 선물", "🟠 업비트 현물"])
+    tabs = st.tabs([f"{s['icon']} {s['label']}" for s in strategies.values()] + ["🎲 부트스트랩", "📐 리스크", "🧭 시장 국면"])
+    
+    for tab, (strategy_id, strategy) in zip(tabs, strategies.items()):
+        with tab:
+            st.markdown(f"**전략 설명**: {strategy.get('description', '')}")
+            if not has_data(strategy_id):
+                continue
+            
+            # 이벤트 기반: 심볼별 거래 / 강제청산 / 수수료 (전체 기간)
+            if results[strategy_id].get('stats') is not None:
+                st.caption(f"이벤트 기반 체결 설정: {strategy.get('execution', {})}")
+                st.dataframe(results[strategy_id]['stats'].style.format({'fees': '{:.4f}', 'final_equity': '{:.3f}'}), use_container_width=True)
+            
+            legs = leg_columns(filtered[strategy_id])
+            benchmark = benchmarks[strategy_id]
+            
+            # 전략 vs Buy & Hold (다수 종목은 동일 비중 바스켓) + 누적 초과 수익률
+            bh_label = 'Buy & Hold' if len(legs) == 1 else '동일 비중 바스켓 (Buy & Hold)'
+            strategy_curve = (filtered[strategy_id]['cumulative_return'] - 1) * 100
+            benchmark_curve = (benchmark['cumulative_return'] - 1) * 100
+            fig_bh = go.Figure()
+            fig_bh.add_trace(go.Scatter(x=strategy_curve.index, y=strategy_curve, name=strategy['label'], line=dict(color=strategy['color'], width=2)))
+            fig_bh.add_trace(go.Scatter(x=benchmark_curve.index, y=benchmark_curve, name=bh_label, line=dict(color='#757575', width=1.5, dash='dot')))
+            fig_bh.add_trace(go.Scatter(
+                x=strategy_curve.index, y=strategy_curve - benchmark_curve, name='초과 (%p)',
+                fill='tozeroy', line=dict(color='rgba(120,120,120,0.4)', width=0)
+            ))
+            fig_bh.update_layout(title=f'전략 vs {bh_label} (%)', yaxis_title='수익률 (%)', hovermode='x unified', height=350, template='plotly_white')
+            show_chart(fig_bh, f'{strategy_id}_benchmark')
+            
+            # 다수 종목: 심볼별 Buy & Hold 대비 지표
+            if len(legs) > 1:
+                relative_table = pd.DataFrame.from_dict({
+                    leg: relative_metrics(filtered[strategy_id][leg], benchmark[leg], strategy['periods_per_year'])
+                    for leg in legs
+                }, orient='index')
+                relative_table.columns = ['B&H 수익률 (%)', 'B&H CAGR (%)', '초과 수익률 (%p)', '추적오차 (%)', '정보비율']
+                st.dataframe(relative_table.sort_values('정보비율', ascending=False).style.format("{:.2f}"), use_container_width=True)
+            
+            # 단일 종목: 포지션 비중 변화
+            if len(legs) == 1:
+                position = positions[strategy_id][legs[0]].dropna()
+                if len(position) == 0:
+                    continue
+                st.metric(f"현재 {legs[0]} 비중", f"{position.iloc[-1]*100:.0f}%")
+                
+                fig_pos = go.Figure()
+                fig_pos.add_trace(go.Scatter(
+                    x=position.index,
+                    y=position * 100,
+                    fill='tozeroy',
+                    line=dict(color=strategy['color'])
+                ))
+                fig_pos.update_layout(title='포지션 비중 변화', yaxis_title='비중 (%)', height=300, template='plotly_white')
+                show_chart(fig_pos, f'{strategy_id}_position')
+                continue
+            
+            # 소수 종목: 코인별 수익률 지표
+            coin_returns = {col: ((1 + filtered[strategy_id][col]).cumprod().iloc[-1] - 1) * 100 for col in legs}
+            if len(legs) <= 4:
+                for col, name in zip(st.columns(len(legs)), legs):
+                    col.metric(f"{name}", f"{coin_returns[name]:.1f}%")
+                continue
+            
+            # 다수 종목: 코인별 수익률 막대
+            st.caption(f"{len(legs)}개 코인")
+            df_coins = pd.DataFrame.from_dict(coin_returns, orient='index', columns=['수익률'])
+            df_coins = df_coins.sort_values('수익률', ascending=False)
+            
+            fig_bar = go.Figure(go.Bar(
+                x=df_coins.index,
+                y=df_coins['수익률'],
+                marker_color=['#00C853' if v >= 0 else '#FF1744' for v in df_coins['수익률']]
+            ))
+            fig_bar.update_layout(title='코인별 수익률', yaxis_title='수익률 (%)', height=400, template='plotly_white')
+            show_chart(fig_bar, f'{strategy_id}_coins')
+    
+    with tabs[-3]:
+        st.markdown("""
+        **블록 부트스트랩**: 선택 기간의 수익률을 블록 단위로 재표본추출해 CAGR / 샤프 / MDD 신뢰구간 추정
+        - 블록 길이 기본값: 약 1개월 (자기상관 보존)
+        """)
+        
+        col1, col2, col3 = st.columns(3)
+        n_paths = col1.select_slider("경로 수", [500, 1000, 2000, 5000], value=2000)
+        block_months = col2.number_input("블록 길이 (개월)", 0.25, 6.0, 1.0, step=0.25)
+        seed = col3.number_input("Seed", 0, 1_000_000, 42)
+        
+        metric_labels = {'cagr': 'CAGR (%)', 'sharpe': '샤프 비율', 'max_drawdown': '최대 낙폭 (%)'}
+        
+        from plotly.subplots import make_subplots
+        
+        with st.spinner("🎲 부트스트랩 계산 중..."):
+            for strategy_id, strategy in strategies.items():
+                if not has_data(strategy_id) or len(filtered[strategy_id]) < 10:
+                    continue
+                
+                periods_per_year = strategy['periods_per_year']
+                block_size = max(1, int(periods_per_year / 12 * block_months))
+                dist = run_bootstrap(filtered[strategy_id]['portfolio_return'], periods_per_year, n_paths, block_size, int(seed))
+                if dist is None:
+                    continue
+                
+                st.markdown(f"##### {strategy['label']}")
+                summary = summarize_bootstrap(dist).rename(index=metric_labels)
+                st.dataframe(summary.style.format("{:.2f}"), use_container_width=True)
+                
+                fig_dist = make_subplots(rows=1, cols=3, subplot_titles=[metric_labels[m] for m in BOOTSTRAP_METRICS])
+                for idx, metric in enumerate(BOOTSTRAP_METRICS):
+                    fig_dist.add_trace(go.Histogram(x=dist[metric], nbinsx=50, marker_color=strategy['color'], showlegend=False), row=1, col=idx + 1)
+                fig_dist.update_layout(height=280, template='plotly_white', margin=dict(t=40, b=20))
+                show_chart(fig_dist, 'bootstrap')
     
-    with tab1:
+    with tabs[-2]:
         st.markdown("""
-        **전략 설명**: Stochastic(166,57,19) + MA(20,45,151,212)
-        - Bullish (K>D): 4개 MA 각 25% 배분
-        - Bearish (K<D): MA20+MA45 각 50% 배분
+        **리스크 분석**: 모든 전략의 코인별 수익률을 일간 복리 수익률로 맞춘 뒤 롤링 상관행렬 / 베타 / 위험 기여도 계산
+        - 위험 기여도 비중: 포트폴리오 배분 × 전략 내 동일 비중
         """)
         
-        if tqqq_filtered is not None and len(tqqq_filtered) > 0:
-            current_pos = tqqq_filtered['position'].iloc[-1]
-            st.metric("현재 TQQQ 비중", f"{current_pos*100:.0f}%")
+        risk_config = registry.get('risk', {})
+        universe_labels = {sid: registry['universes'][s['universe']].get('label', sid) for sid, s in strategies.items()}
+        
+        col1, col2 = st.columns(2)
+        window = col1.number_input("롤링 윈도우 (일)", 20, 365, risk_config.get('window', 60), step=10)
+        step = col2.select_slider("상관행렬 간격 (일)", [1, 5, 10, 20], value=5)
+        
+        with timed('risk_matrix'):
+            leg_returns = date_slice(daily_leg_returns(results, universe_labels), start_date, end_date)
+            risk_weights = leg_weights(results, universe_labels, weights)
+        
+        # 벤치마크 (기본: BTC) - 스냅샷 모드에서도 파일 하나만 로드
+        benchmark, benchmark_label = None, None
+        benchmark_config = risk_config.get('benchmark')
+        if benchmark_config is not None:
+            bars = load_bars(registry['universes'][benchmark_config['universe']], benchmark_config['symbol'], benchmark_config['interval'])
+            if bars is not None:
+                benchmark = date_slice(daily_price_returns(bars), start_date, end_date)
+                benchmark_label = benchmark_config.get('label', benchmark_config['symbol'])
+        
+        if len(leg_returns) < window:
+            st.info(f"선택 기간이 롤링 윈도우({window}일)보다 짧습니다.")
+        else:
+            risk = run_risk(leg_returns, benchmark, risk_weights, int(window), int(step))
+            contributions = risk['contributions']
+            n_legs = len(risk['legs'])
             
-            fig_pos = go.Figure()
-            fig_pos.add_trace(go.Scatter(
-                x=tqqq_filtered.index,
-                y=tqqq_filtered['position'] * 100,
-                fill='tozeroy',
-                line=dict(color='#2962FF')
+            # 많은 leg: 위험 기여도 상위만 히트맵에 표시 (순서는 전략 / 심볼 순 유지)
+            shown = np.arange(n_legs)
+            if n_legs > 30:
+                top = st.slider("히트맵 표시 코인 수 (위험 기여도 상위)", 10, n_legs, 30)
+                shown = np.sort(np.argsort(-contributions['pct'].abs().to_numpy())[:top])
+            labels = [risk['legs'][i] for i in shown]
+            
+            dates = [d.strftime('%Y-%m-%d') for d in risk['dates']]
+            as_of = st.select_slider("상관행렬 기준일 (윈도우 끝)", dates, value=dates[-1])
+            matrix = risk['correlations'][dates.index(as_of)][np.ix_(shown, shown)]
+            
+            fig_corr = go.Figure(data=go.Heatmap(
+                z=matrix,
+                x=labels,
+                y=labels,
+                colorscale='RdBu_r',
+                zmin=-1,
+                zmax=1,
+                text=np.round(matrix, 2) if len(labels) <= 20 else None,
+                texttemplate="%{text}" if len(labels) <= 20 else None,
+                textfont={"size": 9}
             ))
-            fig_pos.update_layout(title='포지션 비중 변화', yaxis_title='비중 (%)', height=300, template='plotly_white')
-            st.plotly_chart(fig_pos, use_container_width=True)
-    
-    with tab2:
+            fig_corr.update_layout(
+                title=f'{window}일 롤링 상관행렬 ({as_of})',
+                height=min(max(400, 22 * len(labels)), 900),
+                template='plotly_white',
+                yaxis=dict(autorange='reversed')
+            )
+            show_chart(fig_corr, 'risk_correlation')
+            
+            fig_avg = go.Figure(go.Scatter(x=risk['average_correlation'].index, y=risk['average_correlation'], line=dict(color='#5C6BC0')))
+            fig_avg.update_layout(title='평균 상관계수 (대각선 제외)', height=250, template='plotly_white', margin=dict(t=40, b=20))
+            show_chart(fig_avg, 'risk_average_correlation')
+            
+            col1, col2 = st.columns(2)
+            
+            if risk['betas'] is not None:
+                beta = risk['betas'].sort_values(ascending=False)
+                fig_beta = go.Figure(go.Bar(x=beta.index, y=beta, marker_color='#FFA000'))
+                fig_beta.update_layout(title=f'{benchmark_label} 베타 (선택 기간)', height=400, template='plotly_white')
+                with col1:
+                    show_chart(fig_beta, 'risk_beta')
+            
+            pct = contributions['pct'].sort_values(ascending=False)
+            fig_contrib = go.Figure(go.Bar(
+                x=pct.index,
+                y=pct,
+                marker_color=['#FF1744' if v >= 0 else '#00C853' for v in pct]
+            ))
+            fig_contrib.update_layout(title='위험 기여도 (%)', height=400, template='plotly_white')
+            with col2:
+                show_chart(fig_contrib, 'risk_contribution')
+            
+            table = contributions.rename(columns={
+                'weight': '비중 (%)', 'volatility': '변동성 (%)', 'marginal': '한계 기여 (%)',
+                'contribution': '기여 변동성 (%)', 'pct': '기여 비중 (%)'
+            })
+            if risk['betas'] is not None:
+                table[f'{benchmark_label} 베타'] = risk['betas']
+            st.dataframe(table.sort_values('기여 비중 (%)', ascending=False).style.format("{:.2f}"), use_container_width=True)
+            st.caption(f"포트폴리오 변동성 (연환산): {contributions['contribution'].sum():.1f}% · 모든 시리즈를 UTC 날짜로 묶습니다 (업비트 일봉 경계 KST 09시 = UTC 00시).")
+            
+            if risk['rolling_betas'] is not None:
+                picked = st.multiselect("롤링 베타", risk['legs'], default=list(pct.index[:3]))
+                fig_rolling = go.Figure()
+                for leg in picked:
+                    fig_rolling.add_trace(go.Scatter(x=risk['rolling_betas'].index, y=risk['rolling_betas'][leg], name=leg))
+                fig_rolling.update_layout(title=f'{window}일 롤링 {benchmark_label} 베타', height=300, template='plotly_white')
+                show_chart(fig_rolling, 'risk_rolling_beta')
+    
+    with tabs[-1]:
         st.markdown("""
-        **전략**: BTC(MA248), ETH(MA152), SOL(MA64) + 각 스토캐스틱
-        - 진입: 시가 > MA AND K > D → 레버리지 진입
+        **시장 국면별 성과**: 기준 시리즈의 추세(종가 vs 이동평균) × 변동성(최근 변동성 vs 장기 중앙값)으로 봉마다 국면을 나눠 전략 성과 비교
+        - 전략 봉에는 그 봉이 시작되기 전에 마감된 국면을 사용 (미래 정보 없음)
         """)
         
-        if bitget_filtered is not None and len(bitget_filtered) > 0:
-            cols = st.columns(3)
-            for idx, name in enumerate(['BTC', 'ETH', 'SOL']):
-                with cols[idx]:
-                    if name in bitget_filtered.columns:
-                        ret = (1 + bitget_filtered[name]).cumprod().iloc[-1] - 1
-                        st.metric(f"{name}", f"{ret*100:.1f}%")
-    
-    with tab3:
-        st.markdown(f"**전략**: {len(UPBIT_CONFIG)}개 알트코인, MA(4H) + Stoch(1D)")
+        regimes = registry.get('regimes', {})
+        available = [sid for sid in strategies if has_data(sid)]
         
-        if upbit_filtered is not None and len(upbit_filtered) > 0:
-            coin_returns = {}
-            for col in upbit_filtered.columns:
-                if col not in ['portfolio_return', 'cumulative_return']:
-                    ret = (1 + upbit_filtered[col]).cumprod().iloc[-1] - 1
-                    coin_returns[col] = ret * 100
+        if not regimes or not available:
+            st.info("strategies.json에 regimes 설정이 없거나 선택 기간에 데이터가 없습니다.")
+        else:
+            col1, col2 = st.columns(2)
+            regime_id = col1.selectbox("국면 기준", list(regimes), format_func=lambda rid: regimes[rid].get('label', rid))
+            regime_strategy = col2.selectbox("전략", available, format_func=lambda sid: strategies[sid]['label'], key="regime_strategy")
+            
+            config = regimes[regime_id]
+            source_universe = registry['universes'][config['universe']]
+            with timed('regimes'):
+                labeler = get_regime_store().update(
+                    regime_id, config, load_bars(source_universe, config['symbol'], config['interval'])
+                )
             
-            if coin_returns:
-                df_coins = pd.DataFrame.from_dict(coin_returns, orient='index', columns=['수익률'])
-                df_coins = df_coins.sort_values('수익률', ascending=False)
+            if len(labeler) == 0:
+                st.warning("국면 기준 데이터가 없습니다.")
+            else:
+                current = int(labeler.codes[-1])
+                st.metric(f"현재 국면 ({config.get('label', regime_id)})", REGIME_LABELS.get(current, '지표 준비 중'))
                 
-                fig_bar = go.Figure(go.Bar(
-                    x=df_coins.index,
-                    y=df_coins['수익률'],
-                    marker_color=['#00C853' if v >= 0 else '#FF1744' for v in df_coins['수익률']]
-                ))
-                fig_bar.update_layout(title='코인별 수익률', yaxis_title='수익률 (%)', height=400, template='plotly_white')
-                st.plotly_chart(fig_bar, use_container_width=True)
+                def breakdown(strategy_id):
+                    returns = filtered[strategy_id]['portfolio_return']
+                    codes = labeler.align(returns.index)
+                    return regime_breakdown(returns, codes, strategies[strategy_id]['periods_per_year'])
+                
+                # 전략 × 국면 CAGR 요약
+                with timed('regime_breakdown'):
+                    breakdowns = {sid: breakdown(sid) for sid in available}
+                summary = pd.DataFrame({strategies[sid]['label']: table['cagr'] for sid, (table, _) in breakdowns.items()}).T
+                st.markdown("**전략별 국면 CAGR (%)**")
+                st.dataframe(summary.style.format("{:.1f}"), use_container_width=True)
+                
+                table, curves = breakdowns[regime_strategy]
+                st.dataframe(table.rename(columns={
+                    'share': '비중 (%)', 'bars': '봉 수', 'total_return': '누적 (%)', 'cagr': 'CAGR (%)',
+                    'volatility': '변동성 (%)', 'sharpe': '샤프', 'max_drawdown': 'MDD (%)', 'win_rate': '승률 (%)'
+                }).style.format("{:.2f}"), use_container_width=True)
+                
+                fig_regime = go.Figure()
+                for code, label in REGIME_LABELS.items():
+                    fig_regime.add_trace(go.Scatter(
+                        x=curves.index,
+                        y=(curves[label] - 1) * 100,
+                        name=label,
+                        line=dict(color=REGIME_COLORS[code], width=2)
+                    ))
+                fig_regime.update_layout(
+                    title=f"{strategies[regime_strategy]['label']} 국면별 누적 수익률 (해당 국면 봉만 반영, %)",
+                    height=400,
+                    template='plotly_white',
+                    hovermode='x unified'
+                )
+                show_chart(fig_regime, 'regimes')
     
     # ════════════════════════════════════════════════════════════════════════════
-    # 📅 월별 히트맵
+    # 📅 기간별 히트맵
     # ════════════════════════════════════════════════════════════════════════════
     
     st.markdown("---")
-    st.subheader("📅 월별 수익률 히트맵")
-    
-    strategy_choice = st.selectbox("전략 선택", ["TQQQ Sniper", "Bitget 선물", "업비트 현물"])
-    
-    monthly = None
-    if strategy_choice == "TQQQ Sniper" and tqqq_filtered is not None:
-        monthly = tqqq_filtered['strategy_return'].resample('M').sum() * 100
-    elif strategy_choice == "Bitget 선물" and bitget_filtered is not None:
-        monthly = bitget_filtered['portfolio_return'].resample('M').sum() * 100
-    elif strategy_choice == "업비트 현물" and upbit_filtered is not None:
-        monthly = upbit_filtered['portfolio_return'].resample('M').sum() * 100
-    
-    if monthly is not None and len(monthly) > 0:
-        monthly_df = pd.DataFrame({
-            'Year': monthly.index.year,
-            'Month': monthly.index.month,
-            'Return': monthly.values
-        })
-        pivot = monthly_df.pivot(index='Year', columns='Month', values='Return')
+    st.subheader("📅 기간별 수익률 히트맵")
+    
+    # 전체 기간 결과를 집계 저장소에 반영 (새 봉만 증분 계산)
+    aggregate_store = get_aggregate_store()
+    heatmap_series = {}
+    for strategy_id, strategy in strategies.items():
+        if full_returns[strategy_id] is not None:
+            heatmap_series[strategy['label']] = full_returns[strategy_id]['portfolio_return']
+    for strategy_id, strategy in strategies.items():
+        df = full_returns[strategy_id]
+        if df is not None and len(leg_columns(df)) > 1:
+            label = registry['universes'][strategy['universe']].get('label', strategy_id)
+            for col in leg_columns(df):
+                heatmap_series[f"{label} · {col}"] = df[col]
+    
+    for key, returns in heatmap_series.items():
+        aggregate_store.update(f"{engine}:{key}", returns)
+    
+    col1, col2 = st.columns([3, 1])
+    strategy_choice = col1.selectbox("전략 선택", list(heatmap_series.keys()) or ["-"])
+    freq = col2.radio("단위", list(AGGREGATE_FREQS.keys()), index=1,
+                      format_func=lambda f: AGGREGATE_FREQS[f], horizontal=True)
+    
+    aggregator = aggregate_store.get(f"{engine}:{strategy_choice}")
+    compounded = aggregator.compounded(freq, start_date, end_date) if aggregator is not None else None
+    
+    if compounded is not None and len(compounded) > 0:
+        pivot = to_heatmap(compounded, freq)
         month_labels = ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월']
         
+        if freq == 'M':
+            x_labels = [month_labels[i-1] for i in pivot.columns]
+        elif freq == 'W':
+            x_labels = [f'W{i}' for i in pivot.columns]
+        else:
+            x_labels = [str(i) for i in pivot.columns]
+        
         fig_heatmap = go.Figure(data=go.Heatmap(
             z=pivot.values,
-            x=[month_labels[i-1] for i in pivot.columns],
+            x=x_labels,
             y=pivot.index,
             colorscale='RdYlGn',
             zmid=0,
             text=[[f'{v:.1f}%' if not pd.isna(v) else '' for v in row] for row in pivot.values],
-            texttemplate="%{text}",
+            texttemplate="%{text}" if freq != 'W' else None,
             textfont={"size": 10}
         ))
-        fig_heatmap.update_layout(title=f'{strategy_choice} 월별 수익률', height=350, template='plotly_white')
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        fig_heatmap.update_layout(title=f'{strategy_choice} {AGGREGATE_FREQS[freq]} 수익률 (복리)', height=350, template='plotly_white')
+        show_chart(fig_heatmap, 'heatmap')
     
     # 푸터
     st.markdown("---")
@@ -653,7 +818,15 @@ def main():
     ⚠️ 교육 목적으로만 사용. 투자 조언이 아닙니다.
     </div>
     """, unsafe_allow_html=True)
+    
+    if debug_panel is not None:
+        render_debug_panel(debug_panel, profile)
 
 
 if __name__ == "__main__":
-    main()
+    engine = st.session_state.pop('capture_profile', None)
+    if engine:
+        path = capture_profile(main, get_profile_path(), engine)
+        st.sidebar.success(f"📸 프로파일 저장: {os.path.relpath(path, os.path.dirname(get_profile_path()))}")
+    else:
+        main()
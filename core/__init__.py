@@ -0,0 +1,8 @@
+"""
+================================================================================
+📦 트레이딩 대시보드 코어 패키지
+================================================================================
+- Streamlit 없이 import 가능한 계산 로직
+- 워커 프로세스에서도 그대로 사용
+================================================================================
+"""
@@ -0,0 +1,157 @@
+"""
+기간별(주/월/연) 복리 수익률 집계
+- 봉 로그수익률 / 누적 로그수익률 + 기간 코드만 보관 → 임의 구간의 기간별 복리 수익률을 벡터 연산으로 조회
+- 새 봉이 들어오면 뒤에 이어 붙이기만 함 (과거 값이 바뀌면 전체 재구성)
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.timebase import DAY
+
+AGGREGATE_FREQS = {
+    'W': '주별',
+    'M': '월별',
+    'Y': '연도별',
+}
+
+# 봉 로그수익률 하한 (-100% 봉의 log1p(-1) = -inf가 이후 누적합을 모두 NaN으로 만들지 않도록)
+LOG_FLOOR = np.log(1e-12)
+
+
+def _log_returns(returns: np.ndarray) -> np.ndarray:
+    """봉 수익률 → 로그수익률 (-100% 이하는 LOG_FLOOR)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ret = np.log1p(np.maximum(returns, -1.0))
+    return np.maximum(log_ret, LOG_FLOOR)
+
+
+def _empty_state(version: int = 0) -> dict:
+    """빈 집계 상태 (갱신은 새 상태 dict를 만들어 한 번에 교체 → 잠금 없이 읽어도 섞인 상태를 보지 않음)"""
+    return {
+        'index': np.empty(0, dtype=np.int64),
+        'log_ret': np.empty(0),
+        'log_cum': np.zeros(1),
+        'codes': {freq: np.empty(0, dtype=np.int64) for freq in AGGREGATE_FREQS},
+        'version': version,
+        'tables': {},
+    }
+
+
+class PeriodAggregator:
+    """수익률 시리즈 하나의 기간별 복리 집계 상태"""
+    
+    def __init__(self):
+        self._state = _empty_state()
+    
+    def __len__(self):
+        return len(self._state['index'])
+    
+    @property
+    def version(self) -> int:
+        return self._state['version']
+    
+    @staticmethod
+    def _is_prefix(state: dict, index: np.ndarray, log_ret: np.ndarray) -> bool:
+        """기존 상태가 새 시리즈의 앞부분과 동일한지 확인 (봉 시각 + 봉 로그수익률 전체 비교 → 중간 봉 수정도 감지)"""
+        n = len(state['index'])
+        if len(index) < n:
+            return False
+        return np.array_equal(index[:n], state['index']) and np.array_equal(log_ret[:n], state['log_ret'])
+    
+    def update(self, returns: pd.Series) -> int:
+        """전체 수익률 시리즈를 받아 새 봉만 반영, 추가된 봉 수 반환
+        
+        -100% 이하 봉은 LOG_FLOOR로 잘라 누적합을 유한하게 유지
+        (그 봉이 든 기간은 -100%로 표시, 이후 기간은 NaN 없이 그대로 계산)
+        """
+        returns = returns.dropna()
+        index = returns.index.as_unit('ns').asi8
+        log_ret = _log_returns(returns.to_numpy(dtype=np.float64))
+        
+        state = self._state
+        if not self._is_prefix(state, index, log_ret):
+            state = _empty_state(state['version'])
+        
+        n = len(state['index'])
+        if len(index) == n:
+            self._state = state
+            return 0
+        
+        new_index = index[n:]
+        new_periods = pd.DatetimeIndex(new_index.view('M8[ns]'))
+        
+        self._state = {
+            'index': np.concatenate([state['index'], new_index]),
+            'log_ret': np.concatenate([state['log_ret'], log_ret[n:]]),
+            'log_cum': np.concatenate([state['log_cum'], state['log_cum'][-1] + np.cumsum(log_ret[n:])]),
+            'codes': {freq: np.concatenate([state['codes'][freq], new_periods.to_period(freq).asi8]) for freq in AGGREGATE_FREQS},
+            'version': state['version'] + 1,
+            'tables': {},
+        }
+        return len(new_index)
+    
+    def compounded(self, freq: str, start=None, end=None) -> pd.Series:
+        """UTC 날짜 구간 [start, end] (양 끝 포함)의 기간별 복리 수익률 (%) - 경계 기간은 구간 안의 봉만 반영"""
+        state = self._state
+        key = (freq, start, end)
+        if key in state['tables']:
+            return state['tables'][key]
+        
+        lo = 0 if start is None else np.searchsorted(state['index'], pd.Timestamp(start).normalize().as_unit('ns').value, 'left')
+        hi = len(state['index']) if end is None else np.searchsorted(state['index'], (pd.Timestamp(end).normalize() + DAY).as_unit('ns').value, 'left')
+        
+        codes = state['codes'][freq][lo:hi]
+        if len(codes) == 0:
+            result = pd.Series(dtype=float)
+        else:
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+            ends = np.concatenate([starts[1:], [len(codes)]])
+            values = np.expm1(state['log_cum'][lo + ends] - state['log_cum'][lo + starts]) * 100
+            periods = pd.PeriodIndex(pd.arrays.PeriodArray(codes[starts], dtype=pd.PeriodDtype(freq)))
+            result = pd.Series(values, index=periods)
+        
+        if len(state['tables']) >= 64:
+            state['tables'].clear()
+        state['tables'][key] = result
+        return result
+
+
+class AggregateStore:
+    """전략/코인별 PeriodAggregator 모음"""
+    
+    def __init__(self):
+        self.aggregators = {}
+        self._lock = threading.Lock()
+    
+    def update(self, key: str, returns: pd.Series) -> PeriodAggregator:
+        """키별 집계 갱신 (새 봉만 반영) - 여러 세션이 공유하므로 잠금"""
+        with self._lock:
+            if key not in self.aggregators:
+                self.aggregators[key] = PeriodAggregator()
+            aggregator = self.aggregators[key]
+            if returns is not None and len(returns) > 0:
+                aggregator.update(returns)
+        return aggregator
+    
+    def get(self, key: str) -> PeriodAggregator:
+        return self.aggregators.get(key)
+
+
+def to_heatmap(compounded: pd.Series, freq: str) -> pd.DataFrame:
+    """기간별 수익률 → 히트맵용 피벗 (행: 연도, 열: 월/주)"""
+    if len(compounded) == 0:
+        return pd.DataFrame()
+    
+    if freq == 'M':
+        years, columns = compounded.index.year, compounded.index.month
+    elif freq == 'W':
+        iso = compounded.index.end_time.isocalendar()
+        years, columns = iso['year'].to_numpy(), iso['week'].to_numpy()
+    else:
+        return pd.DataFrame([compounded.values], index=['전체'], columns=compounded.index.year)
+    
+    df = pd.DataFrame({'Year': years, 'Col': columns, 'Return': compounded.values})
+    return df.pivot(index='Year', columns='Col', values='Return')
@@ -0,0 +1,240 @@
+"""
+신호 변경 알림 (업데이터가 새 봉 저장 후 실행)
+- 최신 신호: 시리즈마다 지표 준비에 필요한 마지막 봉만 잘라 같은 플랜 / 커널로 평가 → 심볼별 마지막 포지션
+  (전체 기간 백테스트 없이 대시보드와 같은 신호 로직)
+- 이전 실행의 신호 상태(data/signals.json)와 비교 → 바뀐 심볼만 이벤트 (상태는 임시 파일에 쓴 뒤 교체)
+- 이벤트는 싱크(stdout / file / webhook)로 전달, 싱크 하나가 실패해도 나머지와 업데이트는 계속
+- 테스트: MemorySink를 넘기면 전달된 이벤트를 그대로 보관
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from core.plan import evaluate_plan
+
+SIGNAL_STATE_VERSION = 1
+
+# 지표 준비 구간 외에 더 남겨 두는 봉 수 (커널의 dropna 후 최소 50봉 조건 포함)
+SIGNAL_MARGIN = 60
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 최신 신호
+# ════════════════════════════════════════════════════════════════════════════════
+
+def node_warmup(indicator: str, params: tuple) -> int:
+    """지표 노드의 첫 유효 값까지 필요한 봉 수"""
+    if indicator == 'ma':
+        return params[1]
+    if indicator == 'stoch':
+        return sum(params)
+    raise ValueError(f"Unknown indicator: {indicator}")
+
+
+def tail_frames(plan: dict, frames: dict, margin: int = SIGNAL_MARGIN) -> dict:
+    """시리즈별로 마지막 (지표 준비 + margin)봉만 남긴 프레임 (전략 min_bars도 만족)"""
+    min_bars = max((s['options']['min_bars'] for s in plan['strategies'].values()), default=0)
+    tails = {}
+    for series, nodes in plan['nodes'].items():
+        df = frames.get(series)
+        if df is None:
+            continue
+        need = max(max(node_warmup(ind, params) for ind, params in nodes.values()) + margin, min_bars)
+        tails[series] = df.iloc[-need:]
+    return tails
+
+
+def latest_signals(plan: dict, frames: dict, strategies: list = None) -> dict:
+    """심볼별 마지막 봉의 목표 포지션
+    
+    반환: {'{strategy_id}/{symbol}': {'strategy', 'symbol', 'name', 'position', 'bar'}}
+    """
+    if strategies is not None:
+        plan = {**plan, 'strategies': {sid: s for sid, s in plan['strategies'].items() if sid in strategies}}
+    results = evaluate_plan(plan, tail_frames(plan, frames))
+    
+    signals = {}
+    for strategy_id, strategy in plan['strategies'].items():
+        result = results.get(strategy_id)
+        if result is None:
+            continue
+        
+        for leg in strategy['legs']:
+            position = result['positions'].get(leg['name'])
+            if position is None or len(position.dropna()) == 0:
+                continue
+            position = position.dropna()
+            signals[f"{strategy_id}/{leg['symbol']}"] = {
+                'strategy': strategy_id,
+                'symbol': leg['symbol'],
+                'name': leg['name'],
+                'position': float(position.iloc[-1]),
+                'bar': str(position.index[-1]),
+            }
+    
+    return signals
+
+
+def diff_signals(previous: dict, current: dict) -> list:
+    """이전 / 현재 신호 → 포지션이 바뀐 심볼의 이벤트 목록
+    
+    kind: entry (0 → 보유), exit (보유 → 0), resize (보유 비중 변경)
+    이전 상태에 없는 심볼(첫 실행 / 새 심볼)은 이벤트 없음
+    """
+    events = []
+    for key, signal in current.items():
+        before = previous.get(key)
+        if before is None or before['position'] == signal['position']:
+            continue
+        
+        if before['position'] == 0:
+            kind = 'entry'
+        elif signal['position'] == 0:
+            kind = 'exit'
+        else:
+            kind = 'resize'
+        events.append({**signal, 'previous': before['position'], 'previous_bar': before['bar'], 'kind': kind})
+    
+    return events
+
+
+def format_event(event: dict, labels: dict = None) -> str:
+    """이벤트 → 한 줄 메시지"""
+    icon = {'entry': '🟢', 'exit': '🔴', 'resize': '🔁'}[event['kind']]
+    label = (labels or {}).get(event['strategy'], event['strategy'])
+    return f"{icon} {label} {event['name']}: {event['previous']:g} → {event['position']:g} ({event['bar']} UTC 봉)"
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 신호 상태 저장 / 로드
+# ════════════════════════════════════════════════════════════════════════════════
+
+def read_signal_state(filepath: str) -> dict:
+    """저장된 신호 상태 (없거나 버전이 다르면 None)"""
+    if not os.path.exists(filepath):
+        return None
+    
+    try:
+        with open(filepath, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state['signals'] if state.get('version') == SIGNAL_STATE_VERSION else None
+
+
+def write_signal_state(signals: dict, filepath: str):
+    """신호 상태 저장 (임시 파일에 쓴 뒤 교체)"""
+    state = {
+        'version': SIGNAL_STATE_VERSION,
+        'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'signals': dict(sorted(signals.items())),
+    }
+    
+    tmp = filepath + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(tmp, filepath)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 싱크
+# ════════════════════════════════════════════════════════════════════════════════
+
+class StdoutSink:
+    """표준 출력 (워크플로 로그)"""
+    
+    def __init__(self, stream=None):
+        self.stream = stream
+    
+    def emit(self, events: list, messages: list):
+        for message in messages:
+            print(f"  {message}", file=self.stream or sys.stdout)
+
+
+class FileSink:
+    """JSON Lines 파일에 이벤트 추가 (한 줄 = 이벤트 하나)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def emit(self, events: list, messages: list):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for event, message in zip(events, messages):
+                f.write(json.dumps({**event, 'message': message}, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """웹훅 POST (Slack / Discord 호환: text / content + events)"""
+    
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+    
+    def emit(self, events: list, messages: list):
+        import requests
+        
+        text = '\n'.join(messages)
+        response = requests.post(self.url, json={'text': text, 'content': text, 'events': events}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class MemorySink:
+    """전달된 이벤트를 보관 (테스트 / 로컬 확인용)"""
+    
+    def __init__(self):
+        self.events = []
+        self.messages = []
+    
+    def emit(self, events: list, messages: list):
+        self.events.extend(events)
+        self.messages.extend(messages)
+
+
+def build_sinks(configs: list, base_path: str) -> list:
+    """레지스트리 alerts.sinks → 싱크 목록
+    
+    - file: path는 base_path(logs 폴더, 커밋하지 않음) 기준
+    - webhook: url_env 환경 변수에 URL (저장소에 URL을 남기지 않음), 비어 있으면 건너뜀
+    """
+    sinks = []
+    for config in configs:
+        if config['type'] == 'stdout':
+            sinks.append(StdoutSink())
+        elif config['type'] == 'file':
+            sinks.append(FileSink(os.path.join(base_path, config['path'])))
+        elif config['type'] == 'webhook':
+            url = os.environ.get(config.get('url_env', ''), '') or config.get('url')
+            if url:
+                sinks.append(WebhookSink(url, config.get('timeout', 10)))
+        else:
+            raise ValueError(f"Unknown alert sink: {config['type']}")
+    return sinks
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 실행
+# ════════════════════════════════════════════════════════════════════════════════
+
+def run_alerts(plan: dict, frames: dict, state_path: str, sinks: list,
+               labels: dict = None, strategies: list = None) -> list:
+    """최신 신호 평가 → 이전 상태와 비교 → 이벤트를 싱크로 전달 → 상태 저장
+    
+    반환: 이벤트 목록 (싱크 오류는 이벤트 대신 출력만 하고 계속)
+    """
+    current = latest_signals(plan, frames, strategies)
+    previous = read_signal_state(state_path)
+    events = diff_signals(previous, current) if previous is not None else []
+    
+    if events:
+        messages = [format_event(event, labels) for event in events]
+        for sink in sinks:
+            try:
+                sink.emit(events, messages)
+            except Exception as e:
+                print(f"  ❌ Alert sink {type(sink).__name__} failed: {e}")
+    
+    # 첫 실행이거나 신호가 바뀌었을 때만 저장 (워크플로가 빈 커밋을 만들지 않도록)
+    if previous is None or events or set(previous) != set(current):
+        write_signal_state(current, state_path)
+    
+    return events
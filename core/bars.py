@@ -0,0 +1,186 @@
+"""
+인트라바(1H / 15M) 봉 저장 + OHLCV 리샘플링
+- 저장: 비압축 .npz (int64 UTC epoch 초 인덱스 + float64 OHLCV 2차원 배열) → CSV 파싱 없이 로드, 행당 48바이트 고정
+  (가격 float는 zlib 압축 효과가 20% 안팎이라 압축 해제 비용만 커서 비압축)
+- 추가: 기존 .npz를 메모리에 올리지 않고 zip 항목을 스트리밍 복사한 뒤 새 청크를 이어 씀 (메모리 상한 = 청크 1개)
+- 리샘플: 버킷 코드 + reduceat 벡터 연산 (pandas resample / groupby 없음)
+- 버킷 경계는 UTC 기준 (인덱스가 UTC라 업비트도 KST 4H 01/05/09…시, 1D 09시 경계와 그대로 일치)
+"""
+
+import os
+import shutil
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+INTERVAL_SECONDS = {
+    '15m': 15 * 60,
+    '1h': 60 * 60,
+    '4h': 4 * 60 * 60,
+    '1d': 24 * 60 * 60,
+}
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 저장 / 로드
+# ════════════════════════════════════════════════════════════════════════════════
+
+def write_bars(df: pd.DataFrame, filepath: str):
+    """OHLCV DataFrame → .npz (임시 파일에 쓴 뒤 교체)"""
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    index = df.index.as_unit('s').asi8
+    values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    
+    tmp = filepath + '.tmp.npz'
+    np.savez(tmp, index=index, ohlcv=values)
+    os.replace(tmp, filepath)
+
+
+def read_bars(filepath: str) -> pd.DataFrame:
+    """.npz → OHLCV DataFrame (naive UTC DatetimeIndex 'datetime')"""
+    if not os.path.exists(filepath):
+        return None
+    
+    with np.load(filepath) as data:
+        index, values = data['index'], data['ohlcv']
+    
+    index = pd.DatetimeIndex(index.astype('M8[s]'), name='datetime')
+    return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+
+def read_last_time(filepath: str) -> pd.Timestamp:
+    """.npz 마지막 봉 시각 (인덱스 배열만 읽음, 없으면 None)"""
+    if not os.path.exists(filepath):
+        return None
+    
+    with np.load(filepath) as data:
+        index = data['index']
+    return pd.Timestamp(int(index[-1]), unit='s') if len(index) else None
+
+
+def _read_npy_header(fp) -> tuple:
+    """.npy 헤더 → (shape, fortran_order, dtype), fp는 데이터 시작 위치로 이동"""
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(fp)
+    return np.lib.format.read_array_header_2_0(fp)
+
+
+def append_bars(filepath: str, chunk_paths: list) -> int:
+    """기존 .npz 뒤에 청크 .npz들을 이어 붙임 (임시 파일에 쓴 뒤 교체)
+    
+    chunk_paths: write_bars로 저장한 청크 (청크 안은 정렬됨, 청크끼리는 순서 무관)
+    기존 배열은 zip 항목째 스트리밍 복사, 청크는 한 번에 하나씩 로드 → 메모리 상한은 청크 1개
+    기존 마지막 시각 이하 / 앞 청크와 겹치는 봉은 버림
+    반환: 추가된 봉 수
+    """
+    existing_rows, last = 0, None
+    if os.path.exists(filepath):
+        with zipfile.ZipFile(filepath) as src, src.open('index.npy') as f:
+            shape, _, _ = _read_npy_header(f)
+        existing_rows = shape[0]
+        last = read_last_time(filepath)
+        last = None if last is None else int(last.value // 10**9)
+    
+    # 1차: 청크별 추가할 행 (인덱스만)
+    chunk_paths = sorted(chunk_paths, key=lambda path: read_last_time(path))
+    keeps = []
+    for path in chunk_paths:
+        with np.load(path) as data:
+            index = data['index']
+        keep = np.ones(len(index), dtype=bool) if last is None else index > last
+        keeps.append(keep)
+        if keep.any():
+            last = int(index[keep][-1])
+    added = int(sum(keep.sum() for keep in keeps))
+    total = existing_rows + added
+    
+    # 2차: 항목별로 기존 데이터 복사 + 청크 추가
+    tmp = filepath + '.tmp.npz'
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED, allowZip64=True) as dst:
+        for name, dtype, tail in (('index', np.dtype('<i8'), ()), ('ohlcv', np.dtype('<f8'), (len(OHLCV_COLUMNS),))):
+            with dst.open(f'{name}.npy', 'w', force_zip64=True) as out:
+                np.lib.format.write_array_header_1_0(out, {
+                    'descr': np.lib.format.dtype_to_descr(dtype),
+                    'fortran_order': False,
+                    'shape': (total,) + tail,
+                })
+                if existing_rows:
+                    with zipfile.ZipFile(filepath) as src, src.open(f'{name}.npy') as f:
+                        _read_npy_header(f)
+                        shutil.copyfileobj(f, out, 1024 * 1024)
+                for path, keep in zip(chunk_paths, keeps):
+                    with np.load(path) as data:
+                        out.write(np.ascontiguousarray(data[name][keep], dtype=dtype).tobytes())
+    
+    os.replace(tmp, filepath)
+    return added
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 리샘플링
+# ════════════════════════════════════════════════════════════════════════════════
+
+def resample_ohlcv(df: pd.DataFrame, interval: str, base_interval: str = None,
+                   drop_incomplete: bool = True) -> pd.DataFrame:
+    """하위 봉 → 상위 봉 (open=첫 봉 시가, high=최대, low=최소, close=마지막 종가, volume=합)
+    
+    base_interval: 원본 봉 간격 (drop_incomplete 판정용, 생략 시 인덱스 최소 간격)
+    drop_incomplete: 하위 봉이 다 차지 않은 버킷 (진행 중인 마지막 봉, 결측 구간) 제외
+    """
+    if df is None or len(df) == 0:
+        return df
+    
+    step = INTERVAL_SECONDS[interval]
+    seconds = df.index.as_unit('s').asi8
+    
+    buckets = seconds // step
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    counts = np.diff(np.concatenate([starts, [len(buckets)]]))
+    
+    values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    ends = starts + counts - 1
+    out = np.column_stack([
+        values[starts, 0],
+        np.maximum.reduceat(values[:, 1], starts),
+        np.minimum.reduceat(values[:, 2], starts),
+        values[ends, 3],
+        np.add.reduceat(values[:, 4], starts),
+    ])
+    
+    index = buckets[starts] * step
+    if drop_incomplete:
+        if base_interval is not None:
+            base = INTERVAL_SECONDS[base_interval]
+        else:
+            base = int(np.diff(seconds).min()) if len(seconds) > 1 else step
+        keep = counts == step // base
+        out, index = out[keep], index[keep]
+    
+    index = pd.DatetimeIndex(index.astype('M8[s]'), name='datetime')
+    return pd.DataFrame(out, index=index, columns=OHLCV_COLUMNS)
+
+
+def compare_bars(stored: pd.DataFrame, derived: pd.DataFrame) -> dict:
+    """저장된 봉 vs 인트라바에서 만든 봉 (겹치는 구간) - 리샘플 / 시간대 정렬 검증용
+    
+    반환: overlap(겹치는 봉 수), matched(OHLC 상대오차 1e-9 이내 봉 수), max_rel_diff
+    """
+    if stored is None or derived is None:
+        return {'overlap': 0, 'matched': 0, 'max_rel_diff': np.nan}
+    
+    common = stored.index.intersection(derived.index)
+    if len(common) == 0:
+        return {'overlap': 0, 'matched': 0, 'max_rel_diff': np.nan}
+    
+    columns = ['open', 'high', 'low', 'close']
+    a = stored.loc[common, columns].to_numpy(dtype=np.float64)
+    b = derived.loc[common, columns].to_numpy(dtype=np.float64)
+    rel = np.abs(a - b) / np.maximum(np.abs(a), 1e-12)
+    
+    return {
+        'overlap': len(common),
+        'matched': int((rel.max(axis=1) <= 1e-9).sum()),
+        'max_rel_diff': float(rel.max()),
+    }
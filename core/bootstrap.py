@@ -0,0 +1,81 @@
+"""
+블록 부트스트랩 robustness 엔진
+- 수익률 시리즈를 블록 단위로 재표본추출 (paths × time 행렬)
+- 청크 단위로 계산해 메모리 상한 유지
+- 동일 seed → 청크 크기와 무관하게 동일 결과
+"""
+
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_METRICS = ('cagr', 'sharpe', 'max_drawdown')
+
+
+def block_start_indices(n: int, n_paths: int, block_size: int, seed: int = 42) -> np.ndarray:
+    """경로별 블록 시작 인덱스 (n_paths × n_blocks)"""
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n - block_size + 1, size=(n_paths, n_blocks), dtype=np.int32)
+
+
+def resample_paths(returns: np.ndarray, starts: np.ndarray, block_size: int) -> np.ndarray:
+    """블록 시작 인덱스 → 재표본 수익률 행렬 (paths × time)"""
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    idx = starts[:, :, None] + np.arange(block_size, dtype=np.int32)
+    idx = idx.reshape(len(starts), -1)[:, :n]
+    return returns[idx]
+
+
+def path_metrics(paths: np.ndarray, periods_per_year: int = 252) -> dict:
+    """경로별 CAGR / 샤프 / MDD (calculate_metrics와 동일한 정의, 단위 %)"""
+    n = paths.shape[1]
+    cumulative = np.cumprod(1 + paths, axis=1)
+    final = cumulative[:, -1]
+    years = max(n / periods_per_year, 0.1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(final > 0, np.maximum(final, 0) ** (1 / years) - 1, 0.0)
+        volatility = paths.std(axis=1, ddof=1) * np.sqrt(periods_per_year)
+        sharpe = np.where(volatility > 0, cagr / volatility, 0.0)
+    
+    peak = np.maximum.accumulate(cumulative, axis=1)
+    max_drawdown = ((cumulative - peak) / peak).min(axis=1)
+    
+    return {
+        'cagr': cagr * 100,
+        'sharpe': sharpe,
+        'max_drawdown': max_drawdown * 100,
+    }
+
+
+def bootstrap_metrics(returns: pd.Series, periods_per_year: int = 252, n_paths: int = 2000,
+                      block_size: int = None, seed: int = 42, chunk_size: int = 250) -> dict:
+    """블록 부트스트랩 → 지표별 분포 배열
+    
+    block_size 기본값: 약 1개월 (periods_per_year / 12)
+    chunk_size: 한 번에 메모리에 올리는 경로 수 (chunk_size × len(returns) × 8 bytes)
+    """
+    values = returns.dropna().to_numpy(dtype=np.float64)
+    if len(values) < 10:
+        return None
+    
+    block_size = block_size or max(1, periods_per_year // 12)
+    starts = block_start_indices(len(values), n_paths, block_size, seed)
+    
+    out = {name: np.empty(n_paths) for name in BOOTSTRAP_METRICS}
+    for lo in range(0, n_paths, chunk_size):
+        hi = min(lo + chunk_size, n_paths)
+        paths = resample_paths(values, starts[lo:hi], block_size)
+        chunk = path_metrics(paths, periods_per_year)
+        for name in BOOTSTRAP_METRICS:
+            out[name][lo:hi] = chunk[name]
+    
+    return out
+
+
+def summarize_bootstrap(dist: dict, levels: tuple = (5, 50, 95)) -> pd.DataFrame:
+    """분포 → 백분위 요약 테이블 (행: 지표, 열: 백분위)"""
+    rows = {name: np.percentile(dist[name], levels) for name in BOOTSTRAP_METRICS}
+    return pd.DataFrame.from_dict(rows, orient='index', columns=[f'P{p}' for p in levels])
@@ -0,0 +1,104 @@
+"""CSV 데이터 접근 (Streamlit 캐시는 app.py에서 감쌈) - 인덱스는 모두 naive UTC (core.timebase)"""
+
+import os
+
+import pandas as pd
+
+from core.bars import read_bars, resample_ohlcv
+from core.registry import data_filename, intrabar_filename, intrabar_source
+from core.timebase import EPOCH_COLUMN, epoch_index, parse_local_times, universe_clock
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# 현지 시각 문자열 열 (사람이 읽는 용도, 로드 시 건너뜀)
+LABEL_COLUMNS = ('datetime', 'date')
+
+
+def get_data_path():
+    """데이터 폴더 경로"""
+    return DATA_DIR
+
+
+def file_version(filename: str, data_path: str = None) -> str:
+    """데이터 파일 버전 (크기, 수정 시각 ns) - 내용을 읽지 않음, 없으면 '-'
+    
+    캐시 키에 넣어 파일이 바뀌면 TTL과 관계없이 다시 로드 (result_store.data_fingerprint와 같은 기준)
+    """
+    try:
+        stat = os.stat(os.path.join(data_path or get_data_path(), filename))
+    except FileNotFoundError:
+        return '-'
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def read_csv_data(filename: str, timezone: str = 'UTC') -> pd.DataFrame:
+    """CSV 파일 로드 → naive UTC 인덱스 'datetime'
+    
+    timestamp 열(UTC epoch 초)만 읽어 인덱스로 사용 (현지 시각 문자열 열은 읽지 않음)
+    timestamp 열이 없는 구 형식은 문자열을 timezone 현지 시각으로 해석 (업데이터가 다음 실행에 변환)
+    """
+    try:
+        filepath = os.path.join(get_data_path(), filename)
+        if not os.path.exists(filepath):
+            return None
+        
+        df = pd.read_csv(filepath, usecols=lambda c: c.lower() not in LABEL_COLUMNS)
+        df.columns = [c.lower() for c in df.columns]
+        if EPOCH_COLUMN in df.columns:
+            index = epoch_index(df.pop(EPOCH_COLUMN).to_numpy())
+        else:
+            labels = pd.read_csv(filepath, usecols=lambda c: c.lower() in LABEL_COLUMNS)
+            labels.columns = [c.lower() for c in labels.columns]
+            index = parse_local_times(labels['date' if 'date' in labels else 'datetime'], timezone)
+        
+        df.index = index
+        return df
+    except Exception as e:
+        return None
+
+
+def read_resampled_data(filename: str, interval: str, base_interval: str) -> pd.DataFrame:
+    """인트라바 .npz 로드 → interval 봉으로 리샘플 (완성된 봉만, UTC 경계)"""
+    df = read_bars(os.path.join(get_data_path(), filename))
+    if df is None or len(df) == 0:
+        return None
+    return resample_ohlcv(df, interval, base_interval)
+
+
+def read_universe_bars(universe: dict, symbol: str, interval: str,
+                       csv_loader=read_csv_data, resampled_loader=read_resampled_data) -> pd.DataFrame:
+    """유니버스 심볼 / 봉 간격 로드: CSV 우선, 없으면 (또는 derive_intervals) 인트라바에서 리샘플
+    
+    csv_loader / resampled_loader: 캐시된 로더를 넘길 수 있음
+    """
+    timezone, _ = universe_clock(universe)
+    df = None if universe.get('derive_intervals') else csv_loader(data_filename(universe, symbol, interval), timezone)
+    if df is None:
+        base_interval = intrabar_source(universe, interval)
+        if base_interval is not None:
+            df = resampled_loader(intrabar_filename(universe, symbol, base_interval), interval, base_interval)
+    return df
+
+
+def get_data_status(filename: str, loader=read_csv_data, timezone: str = 'UTC') -> dict:
+    """데이터 파일 상태 확인 (loader: 캐시된 로더를 넘길 수 있음, 시각은 UTC)"""
+    filepath = os.path.join(get_data_path(), filename)
+    
+    if not os.path.exists(filepath):
+        return {'exists': False, 'filename': filename}
+    
+    try:
+        df = loader(filename, timezone)
+        if df is None or len(df) == 0:
+            return {'exists': False, 'filename': filename}
+        
+        return {
+            'exists': True,
+            'filename': filename,
+            'rows': len(df),
+            'start': df.index.min().strftime('%Y-%m-%d'),
+            'end': df.index.max().strftime('%Y-%m-%d %H:%M'),
+            'last_update': df.index.max()
+        }
+    except:
+        return {'exists': False, 'filename': filename}
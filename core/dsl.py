@@ -0,0 +1,412 @@
+"""
+전략 신호 / 포지션 표현식 (kind: expr)
+- 예: (open > ma(close, $ma) & stoch_k($stoch[0], $stoch[1])@1d > stoch_d($stoch[0], $stoch[1], $stoch[2])@1d) * $leverage
+- 문법: 비교(> < >= <= == !=), 논리(& | ~), 산술(+ - * /), 괄호, 숫자, 가격 컬럼(open / high / low / close / volume)
+  연산자 우선순위: | < & < ~ < 비교 < +- < */ < 단항 - (파이썬과 달리 &가 비교보다 낮음 → 괄호 없이 조건 결합)
+- $이름 / $이름[i]: 심볼별 파라미터 (defaults 병합), 리스트 파라미터는 원소별로 펼쳐짐 (vote(close > ma(close, $ma_periods)))
+- 지표@간격: 다른 봉 간격 시리즈의 지표 (더 긴 간격만, 기준 봉 UTC 시각을 그 간격으로 내림해 매핑 - core.timebase)
+- 컴파일: 심볼마다 파라미터를 대입해 노드 그래프로 변환, 같은 부분식은 노드 하나로 공유 (CSE)
+  지표는 플랜 노드로 등록 → 다른 전략 / 심볼과 지표 캐시 공유
+- 평가: 결측 행 제거 후 노드 순서대로 NumPy 배열 연산 한 번씩 (봉 단위 반복문 / pandas 중간 객체 없음)
+"""
+
+import re
+
+import numpy as np
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# 함수 이름 → (최소, 최대) 인자 수
+FUNCTIONS = {
+    'ma': (2, 2),          # ma(컬럼, 기간)
+    'stoch_k': (2, 3),     # stoch_k(기간, K 평활[, D 기간])
+    'stoch_d': (3, 3),     # stoch_d(기간, K 평활, D 기간)
+    'where': (3, 3),       # where(조건, 참, 거짓)
+    'vote': (1, None),     # vote(조건, ...) → 참인 비율 (리스트 인자는 펼침)
+    'min': (2, None),
+    'max': (2, None),
+    'abs': (1, 1),
+}
+
+INDICATOR_FUNCTIONS = ('ma', 'stoch_k', 'stoch_d')
+
+# 기존 전략 종류(kind)를 표현식으로 옮긴 것 (같은 결과 - scripts/benchmark.py dsl로 비트 단위 비교)
+KIND_EXPRESSIONS = {
+    'ma_vote': (
+        "where(stoch_k($stoch[0], $stoch[1]) > stoch_d($stoch[0], $stoch[1], $stoch[2]),"
+        " vote(close > ma(close, $ma_periods)), vote(close > ma(close, $bear_ma_periods)))"
+    ),
+    'ma_stoch_gate': (
+        "(open > ma(close, $ma) & stoch_k($stoch[0], $stoch[1])@{stoch_interval}"
+        " > stoch_d($stoch[0], $stoch[1], $stoch[2])@{stoch_interval}) * $leverage"
+    ),
+}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<interval>@\s*\$?\w+)
+      | (?P<number>\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+      | (?P<param>\$[A-Za-z_]\w*)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>>=|<=|==|!=|[<>&|~+\-*/(),\[\]])
+    )""", re.VERBOSE)
+
+# 이항 연산자 → (우선순위, 노드 연산)
+_BINARY = {
+    '|': (1, 'or'), '&': (2, 'and'),
+    '>': (4, 'gt'), '<': (4, 'lt'), '>=': (4, 'ge'), '<=': (4, 'le'), '==': (4, 'eq'), '!=': (4, 'ne'),
+    '+': (5, 'add'), '-': (5, 'sub'), '*': (6, 'mul'), '/': (6, 'div'),
+}
+_NOT_PRECEDENCE = 3
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 파서
+# ════════════════════════════════════════════════════════════════════════════════
+
+def tokenize(text: str) -> list:
+    """표현식 → [(종류, 값), ...]"""
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"표현식 오류: '{text[pos:pos + 10]}' 위치를 해석할 수 없음")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, value.replace(' ', '')[1:] if kind == 'interval' else value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """우선순위 상승(precedence climbing) 파서 → 튜플 AST"""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+    
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+    
+    def take(self, value: str = None):
+        kind, token = self.peek()
+        if kind is None or (value is not None and token != value):
+            raise ValueError(f"표현식 오류: '{value or '값'}' 필요 ({self.text})")
+        self.pos += 1
+        return kind, token
+    
+    def parse(self):
+        node = self.expression(0)
+        if self.pos != len(self.tokens):
+            raise ValueError(f"표현식 오류: '{self.peek()[1]}' 이후를 해석할 수 없음 ({self.text})")
+        return node
+    
+    def expression(self, min_precedence: int):
+        left = self.unary(min_precedence)
+        while True:
+            kind, token = self.peek()
+            if kind != 'op' or token not in _BINARY or _BINARY[token][0] < min_precedence:
+                return left
+            precedence, op = _BINARY[token]
+            self.take()
+            left = ('binary', op, left, self.expression(precedence + 1))
+    
+    def unary(self, min_precedence: int):
+        kind, token = self.peek()
+        if kind == 'op' and token == '~':
+            self.take()
+            return ('unary', 'not', self.expression(max(min_precedence, _NOT_PRECEDENCE)))
+        if kind == 'op' and token == '-':
+            self.take()
+            return ('unary', 'neg', self.unary(7))
+        return self.atom()
+    
+    def atom(self):
+        kind, token = self.take()
+        if kind == 'number':
+            return ('const', float(token) if any(c in token for c in '.eE') else int(token))
+        if kind == 'param':
+            node = ('param', token[1:], None)
+            if self.peek() == ('op', '['):
+                self.take('[')
+                index = self.take()
+                if index[0] != 'number':
+                    raise ValueError(f"표현식 오류: 파라미터 인덱스는 정수 ({self.text})")
+                self.take(']')
+                node = ('param', token[1:], int(index[1]))
+            return node
+        if kind == 'op' and token == '(':
+            node = self.expression(0)
+            self.take(')')
+            return node
+        if kind == 'name' and self.peek() == ('op', '('):
+            return self.call(token)
+        if kind == 'name' and token in COLUMNS:
+            return self.with_interval(('column', token, None))
+        raise ValueError(f"표현식 오류: 알 수 없는 이름 '{token}' ({self.text})")
+    
+    def call(self, name: str):
+        if name not in FUNCTIONS:
+            raise ValueError(f"표현식 오류: 알 수 없는 함수 '{name}' ({self.text})")
+        self.take('(')
+        args = []
+        while self.peek() != ('op', ')'):
+            args.append(self.expression(0))
+            if self.peek() != ('op', ')'):
+                self.take(',')
+        self.take(')')
+        
+        low, high = FUNCTIONS[name]
+        if len(args) < low or (high is not None and len(args) > high):
+            raise ValueError(f"표현식 오류: {name}() 인자 수 {len(args)} ({self.text})")
+        return self.with_interval(('call', name, tuple(args), None))
+    
+    def with_interval(self, node):
+        kind, token = self.peek()
+        if kind != 'interval':
+            return node
+        self.take()
+        if node[0] == 'call' and node[1] not in INDICATOR_FUNCTIONS:
+            raise ValueError(f"표현식 오류: @간격은 가격 컬럼 / 지표에만 사용 ({self.text})")
+        return node[:-1] + (token,)
+
+
+def as_expression(strategy: dict) -> dict:
+    """ma_vote / ma_stoch_gate 전략 정의 → 같은 결과의 expr 전략 정의"""
+    if strategy['kind'] == 'ma_vote':
+        return {**strategy, 'kind': 'expr', 'position': KIND_EXPRESSIONS['ma_vote']}
+    if strategy['kind'] == 'ma_stoch_gate':
+        return {
+            **strategy,
+            'kind': 'expr',
+            'interval': strategy['ma_interval'],
+            'position': KIND_EXPRESSIONS['ma_stoch_gate'].format(stoch_interval=strategy['stoch_interval']),
+            'defaults': {'leverage': 1, **strategy.get('defaults', {})},
+        }
+    return strategy
+
+
+_AST_CACHE = {}
+
+
+def parse(text: str):
+    """표현식 문자열 → AST (문자열별 캐시)"""
+    ast = _AST_CACHE.get(text)
+    if ast is None:
+        ast = _AST_CACHE[text] = _Parser(text).parse()
+    return ast
+
+
+def expression_intervals(text: str) -> set:
+    """표현식에 쓰인 @간격 (파라미터 간격은 '$이름')"""
+    found = set()
+    
+    def walk(node):
+        if node[0] in ('column', 'call') and node[-1] is not None:
+            found.add(node[-1])
+        for child in node[1:]:
+            if isinstance(child, tuple) and child and isinstance(child[0], str):
+                walk(child)
+            elif isinstance(child, tuple):
+                for item in child:
+                    walk(item)
+    
+    walk(parse(text))
+    return found
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 컴파일 (심볼 단위)
+# ════════════════════════════════════════════════════════════════════════════════
+
+class _Program:
+    """노드 그래프 (키 → 연산), 같은 키는 한 번만 등록 (CSE)"""
+    
+    def __init__(self, base: tuple, params: dict, add_node):
+        self.base = base
+        self.params = params
+        self.add_node = add_node
+        self.nodes = {}
+        self.ops = {}
+        self.leaves = {}
+        self.stoch = {}
+        self.base_ma = 0
+    
+    def emit(self, op: str, args: tuple) -> str:
+        key = f"{op}({','.join(str(a) for a in args)})"
+        self.ops.setdefault(key, (op, args))
+        return key
+    
+    def leaf(self, key: str, spec: tuple) -> str:
+        self.leaves.setdefault(key, spec)
+        return key
+    
+    def node(self, series: tuple, indicator: str, params: tuple) -> str:
+        """플랜 지표 노드 등록 (심볼 안에서는 한 번만)"""
+        key = (series, indicator, params)
+        if key not in self.nodes:
+            self.nodes[key] = self.add_node(series, indicator, params)
+        return self.nodes[key]
+    
+    def series(self, interval: str) -> tuple:
+        if interval is None:
+            return self.base
+        if interval.startswith('$'):
+            interval = self.params[interval[1:]]
+        return self.base[:2] + (interval,)
+    
+    def constant(self, node):
+        """상수 / 파라미터 노드 → 파이썬 값 또는 리스트 (지표 기간 등)"""
+        value = self.compile(node)
+        if isinstance(value, str) or (isinstance(value, list) and any(isinstance(v, str) for v in value)):
+            raise ValueError("지표 기간은 상수 또는 $파라미터")
+        return value
+    
+    def compile(self, node):
+        """AST → 노드 키(str) / 상수(int, float) / 리스트 (리스트 파라미터가 펼쳐진 경우)"""
+        kind = node[0]
+        if kind == 'const':
+            return node[1]
+        if kind == 'param':
+            if node[1] not in self.params:
+                raise ValueError(f"파라미터 '${node[1]}' 없음")
+            value = self.params[node[1]]
+            return value[node[2]] if node[2] is not None else (list(value) if isinstance(value, (list, tuple)) else value)
+        if kind == 'column':
+            series = self.series(node[2])
+            return self.leaf(f"{node[1]}@{series[2]}", ('column', series, node[1]))
+        if kind == 'unary':
+            return self.broadcast(node[1], [self.compile(node[2])])
+        if kind == 'binary':
+            return self.broadcast(node[1], [self.compile(node[2]), self.compile(node[3])])
+        return self.call(node[1], node[2], node[3])
+    
+    def broadcast(self, op: str, args: list):
+        """리스트 인자는 원소별로 펼쳐 연산 (길이가 다르면 오류), 상수끼리는 바로 계산"""
+        lengths = {len(a) for a in args if isinstance(a, list)}
+        if len(lengths) > 1:
+            raise ValueError("길이가 다른 리스트 파라미터끼리 연산할 수 없음")
+        if lengths:
+            n = lengths.pop()
+            return [self.broadcast(op, [a[i] if isinstance(a, list) else a for a in args]) for i in range(n)]
+        if all(not isinstance(a, str) for a in args):
+            return _OPS[op](*[np.asarray(a) for a in args]).item()
+        return self.emit(op, tuple(args))
+    
+    def call(self, name: str, args: tuple, interval: str):
+        if name == 'ma':
+            column = args[0]
+            if column[0] != 'column' or column[2] is not None:
+                raise ValueError("ma()의 첫 인자는 가격 컬럼")
+            periods = self.constant(args[1])
+            series = self.series(interval)
+            if isinstance(periods, list):
+                return [self.ma(series, column[1], int(p)) for p in periods]
+            return self.ma(series, column[1], int(periods))
+        
+        if name in ('stoch_k', 'stoch_d'):
+            params = tuple(int(self.constant(a)) for a in args)
+            series = self.series(interval)
+            if name == 'stoch_k' and len(params) == 2:
+                # D 기간은 K 값에 영향 없음 → 같은 (기간, K 평활)의 stoch_d가 있으면 그 노드 공유
+                params = self.stoch.get((series, params), params + (1,))
+            self.stoch.setdefault((series, params[:2]), params)
+            node_id = self.node(series, 'stoch', params)
+            field = 'k' if name == 'stoch_k' else 'd'
+            return self.leaf(f"{node_id}.{field}@{series[2]}", ('indicator', series, f'{node_id}.{field}'))
+        
+        values = [self.compile(a) for a in args]
+        if name == 'vote':
+            flat = [v for value in values for v in (value if isinstance(value, list) else [value])]
+            return self.emit('vote', tuple(flat))
+        if name in ('min', 'max'):
+            result = values[0]
+            for value in values[1:]:
+                result = self.broadcast(name, [result, value])
+            return result
+        return self.broadcast(name, values)
+    
+    def ma(self, series: tuple, column: str, period: int) -> str:
+        node_id = self.node(series, 'ma', (column, period))
+        if series == self.base:
+            self.base_ma = max(self.base_ma, period)
+        return self.leaf(f"{node_id}@{series[2]}", ('indicator', series, node_id))
+
+
+def _prescan_stoch(node, found: list):
+    """stoch_d(p, k, d) 호출 수집 (stoch_k(p, k)가 같은 노드를 쓰도록 먼저 등록)"""
+    if not isinstance(node, tuple) or not node:
+        return
+    if node[0] == 'call' and node[1] == 'stoch_d':
+        found.append(node)
+    for child in node[1:]:
+        if isinstance(child, tuple):
+            if child and isinstance(child[0], str):
+                _prescan_stoch(child, found)
+            else:
+                for item in child:
+                    _prescan_stoch(item, found)
+
+
+def compile_expression(text: str, base: tuple, params: dict, add_node) -> dict:
+    """표현식 + 심볼 파라미터 → 실행 프로그램
+    
+    base: 기준 시리즈 (universe, symbol, interval) - 수익률 / 체결 / 결과 인덱스
+    add_node(series, indicator, params) → node_id: 플랜 지표 노드 등록 함수
+    반환: {'ops': [(key, op, args)], 'leaves': {key: ('column' | 'indicator', series, name)},
+           'output': 키 또는 상수, 'series': 사용한 시리즈, 'base_ma': 기준 시리즈 최장 MA 기간}
+    """
+    ast = parse(text)
+    program = _Program(base, params, add_node)
+    
+    stoch_d = []
+    _prescan_stoch(ast, stoch_d)
+    for node in stoch_d:
+        program.call('stoch_d', node[2], node[3])
+    
+    output = program.compile(ast)
+    if isinstance(output, list):
+        raise ValueError("표현식 결과가 리스트 (vote() 등으로 묶어야 함)")
+    
+    # 연산 / 값은 출력 식을 컴파일하면서만 등록되므로 모두 출력에서 도달 가능 (별도 제거 단계 없음)
+    return {
+        'ops': [(key, op, args) for key, (op, args) in program.ops.items()],
+        'leaves': program.leaves,
+        'output': output,
+        'series': sorted({spec[1] for spec in program.leaves.values()} | {base}),
+        'base_ma': program.base_ma,
+    }
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 평가
+# ════════════════════════════════════════════════════════════════════════════════
+
+def _vote(*conditions):
+    """참인 비율 (ma_vote 커널과 같은 연산: 정수 합 × (1 / 개수))"""
+    return sum(np.asarray(c).astype(np.int64) for c in conditions) * (1 / len(conditions))
+
+
+_OPS = {
+    'or': np.logical_or, 'and': np.logical_and, 'not': np.logical_not, 'neg': np.negative,
+    'gt': np.greater, 'lt': np.less, 'ge': np.greater_equal, 'le': np.less_equal,
+    'eq': np.equal, 'ne': np.not_equal,
+    'add': np.add, 'sub': np.subtract, 'mul': np.multiply, 'div': np.true_divide,
+    'min': np.minimum, 'max': np.maximum, 'abs': np.abs,
+    'where': np.where, 'vote': _vote,
+}
+
+
+def run_program(program: dict, leaves: dict, n_rows: int) -> np.ndarray:
+    """노드 순서대로 평가 (각 노드 한 번) → float64 배열
+    
+    leaves: {leaf 키: 결측 행을 제거한 배열}
+    """
+    values = dict(leaves)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for key, op, args in program['ops']:
+            values[key] = _OPS[op](*[values[a] if isinstance(a, str) else a for a in args])
+    
+    output = program['output']
+    result = values[output] if isinstance(output, str) else output
+    return np.broadcast_to(np.asarray(result, dtype=np.float64), (n_rows,)).copy()
+
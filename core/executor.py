@@ -0,0 +1,184 @@
+"""
+심볼 단위 백테스트 실행기 (serial / thread / process)
+- process 모드: OHLCV 배열을 공유 메모리 블록 하나에 담아 이름과 레이아웃만 워커로 전달
+- 결과는 태스크 제출 순서대로 병합
+"""
+
+import atexit
+import os
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+EXECUTOR_MODES = ('serial', 'thread', 'process')
+
+_POOLS = {}
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 공유 메모리 패킹
+# ════════════════════════════════════════════════════════════════════════════════
+
+def _numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """공유 메모리에 담을 숫자 컬럼만 선택"""
+    return df.select_dtypes(include='number')
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    """프레임 하나가 차지하는 바이트 (int64 인덱스 + float64 값)"""
+    return len(df) * 8 * (1 + len(_numeric(df).columns))
+
+
+def pack_frames(tasks: list) -> tuple:
+    """태스크의 모든 DataFrame을 공유 메모리 한 블록에 복사
+    
+    반환: (SharedMemory, 태스크별 레이아웃 리스트)
+    레이아웃: {프레임 키: (offset, rows, columns)} - None 프레임은 None
+    """
+    total = 0
+    for _, frames, _ in tasks:
+        for df in frames.values():
+            if df is not None:
+                total += _frame_nbytes(df)
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    layouts = []
+    offset = 0
+    
+    for _, frames, _ in tasks:
+        layout = {}
+        for name, df in frames.items():
+            if df is None:
+                layout[name] = None
+                continue
+            
+            df = _numeric(df)
+            rows = len(df)
+            columns = list(df.columns)
+            index = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf, offset=offset)
+            index[:] = df.index.as_unit('ns').asi8
+            values = np.ndarray((rows, len(columns)), dtype=np.float64, buffer=shm.buf, offset=offset + rows * 8)
+            values[:] = df.to_numpy(dtype=np.float64)
+            
+            layout[name] = (offset, rows, columns)
+            offset += _frame_nbytes(df)
+            del index, values
+        layouts.append(layout)
+    
+    return shm, layouts
+
+
+def unpack_frames(buf, layout: dict) -> dict:
+    """공유 메모리 레이아웃 → DataFrame 딕셔너리 (워커 로컬 복사본)"""
+    frames = {}
+    for name, spec in layout.items():
+        if spec is None:
+            frames[name] = None
+            continue
+        
+        offset, rows, columns = spec
+        index = np.ndarray((rows,), dtype=np.int64, buffer=buf, offset=offset).copy()
+        values = np.ndarray((rows, len(columns)), dtype=np.float64, buffer=buf, offset=offset + rows * 8).copy()
+        frames[name] = pd.DataFrame(values, index=pd.DatetimeIndex(index.view('M8[ns]')), columns=columns)
+    
+    return frames
+
+
+def _process_task(func, shm_name: str, layout: dict, config: dict):
+    """워커 프로세스: 공유 메모리에서 입력을 읽어 func 실행"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frames = unpack_frames(shm.buf, layout)
+    finally:
+        shm.close()
+    
+    result = func(frames, config)
+    if result is None:
+        return None
+    # Series / DataFrame 대신 원시 배열로 반환 (피클 비용 최소화)
+    columns = list(result.columns) if isinstance(result, pd.DataFrame) else result.name
+    return result.index.as_unit('ns').asi8.copy(), result.to_numpy(dtype=np.float64), columns
+
+
+def _rebuild_result(index: np.ndarray, values: np.ndarray, columns):
+    """워커 반환 배열 → Series / DataFrame"""
+    index = pd.DatetimeIndex(index.view('M8[ns]'))
+    if isinstance(columns, list):
+        return pd.DataFrame(values, index=index, columns=columns)
+    return pd.Series(values, index=index, name=columns)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 실행기
+# ════════════════════════════════════════════════════════════════════════════════
+
+def get_pool(mode: str, max_workers: int = None):
+    """모드별 풀 재사용 (Streamlit 재실행마다 워커를 새로 띄우지 않도록)"""
+    max_workers = max_workers or os.cpu_count() or 1
+    key = (mode, max_workers)
+    
+    if key not in _POOLS:
+        if mode == 'thread':
+            _POOLS[key] = ThreadPoolExecutor(max_workers=max_workers)
+        elif mode == 'process':
+            # spawn: Streamlit 서버 스레드를 fork하지 않도록
+            _POOLS[key] = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context('spawn'))
+        else:
+            raise ValueError(f"Unknown executor mode: {mode}")
+    
+    return _POOLS[key]
+
+
+@atexit.register
+def shutdown_pools():
+    """생성된 풀 전부 종료"""
+    for pool in _POOLS.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _POOLS.clear()
+
+
+def run_tasks(func, tasks: list, mode: str = 'serial', max_workers: int = None) -> dict:
+    """심볼 단위 태스크 실행
+    
+    tasks: [(key, {프레임 키: DataFrame}, config), ...]
+    func: func(frames, config) -> Series / DataFrame 또는 None (모듈 최상위 함수여야 process 모드 가능)
+    반환: {key: 결과} - 태스크 순서 유지, None 결과는 제외
+    """
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor mode: {mode}")
+    
+    results = {}
+    
+    if mode == 'serial' or len(tasks) <= 1:
+        for key, frames, config in tasks:
+            result = func(frames, config)
+            if result is not None:
+                results[key] = result
+        return results
+    
+    pool = get_pool(mode, max_workers)
+    
+    if mode == 'thread':
+        futures = [(key, pool.submit(func, frames, config)) for key, frames, config in tasks]
+        for key, future in futures:
+            result = future.result()
+            if result is not None:
+                results[key] = result
+        return results
+    
+    shm, layouts = pack_frames(tasks)
+    try:
+        futures = [
+            (key, pool.submit(_process_task, func, shm.name, layout, config))
+            for (key, _, config), layout in zip(tasks, layouts)
+        ]
+        for key, future in futures:
+            result = future.result()
+            if result is not None:
+                results[key] = _rebuild_result(*result)
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return results
@@ -0,0 +1,132 @@
+"""
+지표 메모이제이션 캐시
+- 키: (시리즈 지문, 지표, 파라미터) → 데이터가 같으면 재실행 / 전략 / 파라미터 탐색 간 재사용
+- 스토캐스틱은 원시 %K(period)를 따로 캐시 → (50,30,5) / (50,20,5)처럼 period가 같은 조합끼리 롤링 max/min 공유
+- 값은 읽기 전용 float64 배열, 전체 바이트 상한을 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU)
+- 프로세스 단위 캐시 (process 실행기 워커는 각자 캐시를 가짐)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.indicators import calculate_ma, calculate_stochastic_raw, smooth_stochastic
+from core.profiling import current_run
+
+DEFAULT_MAX_BYTES = 128 * 1024 ** 2
+
+
+def series_fingerprint(df: pd.DataFrame) -> str:
+    """프레임 내용 지문 (인덱스 + 숫자 컬럼 이름/값)"""
+    h = hashlib.sha256()
+    
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        index = index.as_unit('ns').asi8
+    h.update(np.ascontiguousarray(np.asarray(index, dtype=np.int64)).data)
+    
+    for column, values in df.items():
+        if values.dtype.kind in 'iufb':
+            h.update(str(column).encode())
+            h.update(np.ascontiguousarray(values.to_numpy(dtype=np.float64)).data)
+    
+    return h.hexdigest()[:32]
+
+
+class IndicatorCache:
+    """(지문, 지표, 파라미터) → 배열 튜플 LRU 캐시 (스레드 안전)"""
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_or_compute(self, key: tuple, compute) -> tuple:
+        """캐시된 배열 튜플 반환, 없으면 compute() (Series/배열 튜플) 결과를 저장 후 반환"""
+        profile = current_run()
+        name = f'indicator:{key[1]}'
+        if profile is not None:
+            profile.cache_call(name)
+        
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        
+        # 계산은 잠금 밖에서 (다른 스레드가 같은 키를 동시에 계산하면 나중 결과는 버림)
+        value = tuple(np.array(a, dtype=np.float64) for a in compute())
+        for array in value:
+            array.flags.writeable = False
+        nbytes = sum(array.nbytes for array in value)
+        
+        if profile is not None:
+            profile.cache_miss(name)
+        
+        with self._lock:
+            self.misses += 1
+            if key in self._entries or nbytes > self.max_bytes:
+                return value
+            
+            self._entries[key] = value
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= sum(array.nbytes for array in evicted)
+                self.evictions += 1
+        
+        return value
+    
+    def ma(self, fingerprint: str, data: pd.DataFrame, column: str, period: int) -> pd.Series:
+        """이동평균 (calculate_ma와 동일)"""
+        (values,) = self.get_or_compute(
+            (fingerprint, 'ma', (column, period)),
+            lambda: (calculate_ma(data[column], period),),
+        )
+        return pd.Series(values, index=data.index)
+    
+    def stochastic(self, fingerprint: str, data: pd.DataFrame, period: int, k_smooth: int, d_period: int) -> tuple:
+        """스토캐스틱 (stoch_k, stoch_d) - 원시 %K(calculate_stochastic_raw) + 평활(smooth_stochastic)"""
+        def compute():
+            (k_raw,) = self.get_or_compute(
+                (fingerprint, 'stoch_raw', (period,)),
+                lambda: (calculate_stochastic_raw(data, period),),
+            )
+            return smooth_stochastic(pd.Series(k_raw, index=data.index), k_smooth, d_period)
+        
+        stoch_k, stoch_d = self.get_or_compute((fingerprint, 'stoch', (period, k_smooth, d_period)), compute)
+        return pd.Series(stoch_k, index=data.index), pd.Series(stoch_d, index=data.index)
+    
+    def stats(self) -> dict:
+        """누적 hit / miss / 적중률 / 항목 수 / 사용 바이트 / 제거 수"""
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / calls if calls else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+# 프로세스 전역 캐시 (Streamlit 세션 / 재실행 간 공유)
+INDICATOR_CACHE = IndicatorCache()
@@ -0,0 +1,30 @@
+"""지표 계산 함수"""
+
+import pandas as pd
+import numpy as np
+
+from core.profiling import timed
+
+
+@timed('calculate_stochastic_raw')
+def calculate_stochastic_raw(df: pd.DataFrame, period: int) -> pd.Series:
+    """스토캐스틱 원시 %K - period가 같은 (K, D) 조합끼리 공유"""
+    hh = df['high'].rolling(window=period, min_periods=period).max()
+    ll = df['low'].rolling(window=period, min_periods=period).min()
+    
+    denom = (hh - ll).replace(0, np.nan)
+    return (df['close'] - ll) / denom * 100
+
+
+@timed('smooth_stochastic')
+def smooth_stochastic(k_raw: pd.Series, k_smooth: int, d_period: int) -> tuple:
+    """원시 %K → (stoch_k, stoch_d)"""
+    stoch_k = k_raw.rolling(window=k_smooth, min_periods=k_smooth).mean()
+    stoch_d = stoch_k.rolling(window=d_period, min_periods=d_period).mean()
+    return stoch_k, stoch_d
+
+
+@timed('calculate_ma')
+def calculate_ma(series: pd.Series, period: int) -> pd.Series:
+    """이동평균선 계산"""
+    return series.rolling(window=period, min_periods=period).mean()
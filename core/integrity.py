@@ -0,0 +1,204 @@
+"""
+데이터 파일 무결성 검증 + 체크섬 매니페스트
+- 검증: 파일 전체를 벡터 연산으로 한 번에 (봉 단위 반복문 없음)
+  오류: 시각 누락 / UTC 시각 ≠ 현지 표기 / 정렬·중복 / 봉 간격 격자 이탈 / OHLC 결측 · 불일치 / 가격 ≤ 0 / 거래량 < 0
+  경고: 봉 누락 구간 (주말 · 휴장 · 거래소 점검은 정상이라 오류로 보지 않음), timestamp 열 없는 구 형식
+- 격자 / 누락 구간은 유니버스 grid 시계로 검사 (utc: UTC, local: 현지 시각 - 서머타임이 있어도 거래일 자정 격자)
+- 매니페스트 (data/checksums.json): 파일별 sha256 + 검증 결과, 임시 파일에 쓴 뒤 교체
+- 체크섬이 매니페스트와 같으면 검증 결과를 그대로 사용 (변경된 파일만 다시 검증)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from core.bars import INTERVAL_SECONDS, read_bars
+from core.registry import universe_files, intrabar_files
+from core.timebase import EPOCH_COLUMN, epoch_index, grid_times, parse_local_times, universe_clock
+
+MANIFEST_FILENAME = 'checksums.json'
+MANIFEST_VERSION = 2
+
+# 검사 이름 → (표시 이름, 심각도)
+CHECKS = {
+    'missing_time': ('시각 누락', 'error'),
+    'time_mismatch': ('UTC 시각 ≠ 현지 표기', 'error'),
+    'not_increasing': ('시각 역순 / 중복', 'error'),
+    'off_grid': ('봉 간격 격자 이탈', 'error'),
+    'missing_price': ('OHLC 결측', 'error'),
+    'ohlc_inconsistent': ('OHLC 불일치', 'error'),
+    'non_positive_price': ('가격 ≤ 0', 'error'),
+    'negative_volume': ('거래량 < 0', 'error'),
+    'gaps': ('봉 누락 구간', 'warning'),
+    'legacy_time': ('timestamp 열 없음 (구 형식)', 'warning'),
+}
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 검증
+# ════════════════════════════════════════════════════════════════════════════════
+
+def check_bars(df: pd.DataFrame, interval: str, timezone: str = 'UTC', grid: str = 'utc', labels=None) -> dict:
+    """OHLCV 프레임 (naive UTC 인덱스) 검사 → {검사 이름: 위반 행 수} (위반 없는 검사는 제외)
+    
+    timezone / grid: 유니버스 시간 메타데이터 (core.timebase)
+    labels: 현지 시각 문자열 열을 UTC로 변환한 인덱스 (timestamp 열과 비교, 없으면 생략)
+    """
+    counts = {}
+    valid = ~np.isnat(df.index.to_numpy())
+    counts['missing_time'] = int((~valid).sum())
+    if labels is not None:
+        counts['time_mismatch'] = int((valid & (labels.to_numpy() != df.index.to_numpy())).sum())
+    
+    times = grid_times(df.index[valid], timezone, grid).as_unit('ns').asi8
+    diff = np.diff(times)
+    step = INTERVAL_SECONDS[interval] * 10**9
+    counts['not_increasing'] = int((diff <= 0).sum())
+    counts['off_grid'] = int((times % step != 0).sum())
+    counts['gaps'] = int((diff > step).sum())
+    
+    o, h, l, c = (df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+    prices = np.stack([o, h, l, c])
+    finite = np.isfinite(prices).all(axis=0)
+    counts['missing_price'] = int((~finite).sum())
+    
+    with np.errstate(invalid='ignore'):
+        inconsistent = (h < np.maximum(o, c)) | (l > np.minimum(o, c)) | (h < l)
+        counts['ohlc_inconsistent'] = int((inconsistent & finite).sum())
+        counts['non_positive_price'] = int(((prices <= 0).any(axis=0) & finite).sum())
+        if 'volume' in df:
+            counts['negative_volume'] = int((df['volume'].to_numpy(dtype=np.float64) < 0).sum())
+    
+    return {name: count for name, count in counts.items() if count}
+
+
+def file_checksum(filepath: str, block_size: int = 1 << 20) -> str:
+    """파일 sha256 (블록 단위로 읽음)"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_raw(filepath: str, timezone: str = 'UTC') -> tuple:
+    """검증용 원본 로드 (정렬 / 중복 제거 / 결측 행 제거 없이 파일 그대로)
+    
+    반환: (UTC 인덱스 DataFrame, 현지 표기를 UTC로 변환한 인덱스 - timestamp 열이 없으면 None)
+    """
+    if filepath.endswith('.npz'):
+        return read_bars(filepath), None
+    
+    df = pd.read_csv(filepath)
+    df.columns = [c.lower() for c in df.columns]
+    date_col = 'date' if 'date' in df.columns else 'datetime'
+    labels = parse_local_times(df[date_col], timezone) if date_col in df.columns else None
+    if EPOCH_COLUMN not in df.columns:
+        return df.set_index(labels), None
+    return df.set_index(epoch_index(df[EPOCH_COLUMN].to_numpy())), labels
+
+
+def validate_file(filepath: str, interval: str, timezone: str = 'UTC', grid: str = 'utc', checksum: str = None) -> dict:
+    """파일 하나 검증 → 매니페스트 항목 (sha256, 크기, 행 수, 기간(UTC), errors / warnings)"""
+    df, labels = _load_raw(filepath, timezone)
+    counts = check_bars(df, interval, timezone, grid, labels)
+    if labels is None and not filepath.endswith('.npz'):
+        counts['legacy_time'] = len(df)
+    times = df.index.dropna()
+    
+    return {
+        'sha256': checksum or file_checksum(filepath),
+        'size': os.path.getsize(filepath),
+        'interval': interval,
+        'timezone': timezone,
+        'grid': grid,
+        'rows': len(df),
+        'start': str(times.min()) if len(times) else None,
+        'end': str(times.max()) if len(times) else None,
+        'errors': {name: n for name, n in counts.items() if CHECKS[name][1] == 'error'},
+        'warnings': {name: n for name, n in counts.items() if CHECKS[name][1] == 'warning'},
+    }
+
+
+def registry_data_files(registry: dict) -> list:
+    """레지스트리가 참조하는 데이터 파일 [(filename, interval, timezone, grid), ...]"""
+    files = []
+    for universe in registry['universes'].values():
+        clock = universe_clock(universe)
+        files += [(filename, interval, *clock) for _, interval, filename in universe_files(universe) + intrabar_files(universe)]
+    return files
+
+
+def verify_files(files: list, data_path: str, manifest: dict = None) -> tuple:
+    """파일 목록 검증 (체크섬이 매니페스트와 같은 파일은 이전 결과 재사용)
+    
+    files: [(filename, interval, timezone, grid), ...] - 없는 파일은 건너뜀
+    반환: ({filename: 매니페스트 항목}, 새로 검증한 파일 수)
+    """
+    previous = (manifest or {}).get('files', {})
+    entries, validated = {}, 0
+    
+    for filename, interval, tz, grid in files:
+        filepath = os.path.join(data_path, filename)
+        if not os.path.exists(filepath):
+            continue
+        
+        checksum = file_checksum(filepath)
+        entry = previous.get(filename)
+        if entry is not None and (entry.get('sha256'), entry.get('interval'), entry.get('timezone'), entry.get('grid')) == (checksum, interval, tz, grid):
+            entries[filename] = entry
+            continue
+        
+        entries[filename] = validate_file(filepath, interval, tz, grid, checksum)
+        validated += 1
+    
+    return entries, validated
+
+
+def summarize(entries: dict) -> dict:
+    """매니페스트 항목들 → {files, error_files, warning_files, errors: {검사: 행 수}, warnings: {...}}"""
+    summary = {'files': len(entries), 'error_files': [], 'warning_files': [], 'errors': {}, 'warnings': {}}
+    for filename, entry in entries.items():
+        for kind in ('errors', 'warnings'):
+            if entry.get(kind):
+                summary[f'{kind[:-1]}_files'].append(filename)
+            for name, count in entry.get(kind, {}).items():
+                summary[kind][name] = summary[kind].get(name, 0) + count
+    return summary
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 매니페스트 저장 / 로드
+# ════════════════════════════════════════════════════════════════════════════════
+
+def read_manifest(data_path: str) -> dict:
+    """data/checksums.json (없거나 버전이 다르면 None)"""
+    filepath = os.path.join(data_path, MANIFEST_FILENAME)
+    if not os.path.exists(filepath):
+        return None
+    
+    try:
+        with open(filepath, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def write_manifest(entries: dict, data_path: str) -> dict:
+    """매니페스트 저장 (임시 파일에 쓴 뒤 교체)"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'files': dict(sorted(entries.items())),
+    }
+    
+    filepath = os.path.join(data_path, MANIFEST_FILENAME)
+    tmp = filepath + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(tmp, filepath)
+    return manifest
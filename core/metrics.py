@@ -0,0 +1,60 @@
+"""성과 지표 계산"""
+
+import pandas as pd
+import numpy as np
+
+from core.profiling import timed
+
+
+@timed('calculate_metrics')
+def calculate_metrics(returns: pd.Series, periods_per_year: int = 252) -> dict:
+    """성과 지표 계산"""
+    returns = returns.dropna()
+    if len(returns) < 10:
+        return {'total_return': 0, 'cagr': 0, 'volatility': 0, 'sharpe': 0, 'max_drawdown': 0, 'win_rate': 0}
+    
+    cumulative = (1 + returns).cumprod()
+    total_return = cumulative.iloc[-1] - 1
+    years = max(len(returns) / periods_per_year, 0.1)
+    cagr = (cumulative.iloc[-1]) ** (1/years) - 1 if cumulative.iloc[-1] > 0 else 0
+    volatility = returns.std() * np.sqrt(periods_per_year)
+    sharpe = (cagr / volatility) if volatility > 0 else 0
+    peak = cumulative.expanding().max()
+    max_drawdown = ((cumulative - peak) / peak).min()
+    win_rate = (returns > 0).mean()
+    
+    return {
+        'total_return': total_return * 100,
+        'cagr': cagr * 100,
+        'volatility': volatility * 100,
+        'sharpe': sharpe,
+        'max_drawdown': max_drawdown * 100,
+        'win_rate': win_rate * 100
+    }
+
+
+@timed('relative_metrics')
+def relative_metrics(returns: pd.Series, benchmark: pd.Series, periods_per_year: int = 252) -> dict:
+    """벤치마크(Buy & Hold) 대비 지표
+    
+    - excess_return: 누적 수익률 차이 (%p)
+    - tracking_error: 봉 단위 초과 수익률 표준편차 (연환산 %)
+    - information_ratio: 연환산 평균 초과 수익률 / tracking_error
+    """
+    frame = pd.DataFrame({'strategy': returns, 'benchmark': benchmark}).dropna()
+    if len(frame) < 10:
+        return {'benchmark_return': 0, 'benchmark_cagr': 0, 'excess_return': 0, 'tracking_error': 0, 'information_ratio': 0}
+    
+    values = frame.to_numpy(dtype=np.float64)
+    growth = np.prod(1 + values, axis=0)
+    years = max(len(values) / periods_per_year, 0.1)
+    excess = values[:, 0] - values[:, 1]
+    tracking_error = excess.std(ddof=1) * np.sqrt(periods_per_year)
+    
+    return {
+        'benchmark_return': (growth[1] - 1) * 100,
+        'benchmark_cagr': (growth[1] ** (1 / years) - 1) * 100 if growth[1] > 0 else 0,
+        'excess_return': (growth[0] - growth[1]) * 100,
+        'tracking_error': tracking_error * 100,
+        'information_ratio': excess.mean() * periods_per_year / tracking_error if tracking_error > 0 else 0,
+    }
@@ -0,0 +1,137 @@
+"""
+레지스트리 → 벡터화 평가 플랜
+- 지표 노드는 (시리즈, 지표, 파라미터) 기준으로 한 번만 등록 → 같은 시리즈/윈도우를 쓰는 전략끼리 공유
+  (expr 전략은 표현식을 심볼마다 컴파일하면서 지표를 같은 노드로 등록)
+- 평가: 시리즈별 지표 계산(실행기 태스크) → leg별 전략 커널(실행기 태스크) → 설정 순서대로 포트폴리오 합산
+  (커널이 같은 봉 수익률로 Buy & Hold도 반환 → 벤치마크 / 초과 수익률을 같은 평가에서 생성)
+"""
+
+import pandas as pd
+
+from core.dsl import compile_expression
+from core.executor import run_tasks
+from core.profiling import timed
+from core.registry import strategy_legs, symbol_name
+from core.strategies import benchmark_returns, compute_series_indicators, evaluate_leg
+
+
+def _add_node(plan: dict, series: tuple, indicator: str, params: tuple) -> str:
+    """지표 노드 등록 (이미 있으면 재사용), 노드 id 반환"""
+    if indicator == 'ma':
+        node_id = f'ma({params[0]},{params[1]})'
+    else:
+        node_id = f'{indicator}({",".join(str(p) for p in params)})'
+    
+    plan['requested'] += 1
+    plan['nodes'].setdefault(series, {}).setdefault(node_id, (indicator, params))
+    return node_id
+
+
+def compile_plan(registry: dict) -> dict:
+    """레지스트리 전체를 하나의 평가 플랜으로 컴파일
+    
+    반환:
+    - nodes: {series: {node_id: (indicator, params)}}  (series = (universe, symbol, interval))
+    - strategies: {strategy_id: {'kind', 'options', 'legs'}}  (leg series['price']: 수익률 / 체결 기준 시리즈)
+    - requested / unique: 요청된 지표 수 / 실제 계산할 지표 수
+    """
+    plan = {'nodes': {}, 'strategies': {}, 'requested': 0}
+    
+    for strategy_id, strategy in registry['strategies'].items():
+        universe_id = strategy['universe']
+        universe = registry['universes'][universe_id]
+        legs = []
+        
+        for symbol, params in strategy_legs(registry, strategy_id).items():
+            leg = {'symbol': symbol, 'name': symbol_name(universe, symbol).upper(), 'params': params}
+            
+            if strategy['kind'] == 'expr':
+                series = (universe_id, symbol, strategy['interval'])
+                leg['program'] = compile_expression(
+                    strategy['position'], series, params,
+                    lambda s, indicator, p: _add_node(plan, s, indicator, p),
+                )
+                leg['series'] = {'data': series, 'price': series}
+            elif strategy['kind'] == 'ma_vote':
+                series = (universe_id, symbol, strategy['interval'])
+                leg['series'] = {'data': series, 'price': series}
+                leg['refs'] = {
+                    'stoch': _add_node(plan, series, 'stoch', tuple(params['stoch'])),
+                    'ma': {p: _add_node(plan, series, 'ma', ('close', p)) for p in params['ma_periods']},
+                }
+            else:
+                ma_series = (universe_id, symbol, strategy['ma_interval'])
+                stoch_series = (universe_id, symbol, strategy['stoch_interval'])
+                leg['series'] = {'ma': ma_series, 'stoch': stoch_series, 'price': ma_series}
+                leg['refs'] = {
+                    'ma': _add_node(plan, ma_series, 'ma', ('close', params['ma'])),
+                    'stoch': _add_node(plan, stoch_series, 'stoch', tuple(params['stoch'])),
+                }
+            
+            legs.append(leg)
+        
+        plan['strategies'][strategy_id] = {
+            'kind': strategy['kind'],
+            'options': {
+                'min_bars': strategy.get('min_bars', 0),
+                'min_extra_bars': strategy.get('min_extra_bars', 0),
+                'clip_lower': strategy.get('clip_lower'),
+                'execution': strategy.get('execution', {}),
+            },
+            'legs': legs,
+        }
+    
+    plan['unique'] = sum(len(nodes) for nodes in plan['nodes'].values())
+    return plan
+
+
+def evaluate_plan(plan: dict, frames: dict, executor: str = 'serial', max_workers: int = None) -> dict:
+    """플랜 평가
+    
+    frames: {(universe, symbol, interval): DataFrame}
+    반환: {strategy_id: {'returns': 심볼별 + portfolio_return + cumulative_return, 'positions': 심볼별,
+                        'benchmark': 심볼별 Buy & Hold + portfolio_return(동일 비중 바스켓) + excess_return}}
+          데이터가 부족한 전략은 None
+    """
+    tasks = [
+        (series, {'data': frames.get(series)}, {'nodes': [(node_id, ind, params) for node_id, (ind, params) in nodes.items()]})
+        for series, nodes in plan['nodes'].items()
+    ]
+    with timed('indicators'):
+        indicators = run_tasks(compute_series_indicators, tasks, mode=executor, max_workers=max_workers)
+    
+    leg_tasks = []
+    for strategy_id, strategy in plan['strategies'].items():
+        config = {'kind': strategy['kind'], 'options': strategy['options']}
+        for leg in strategy['legs']:
+            series = set(leg['series'].values()) | _leaf_series(leg)
+            inputs = {('data', s): frames.get(s) for s in series}
+            inputs.update({('indicators', s): indicators.get(s) for s in series})
+            leg_tasks.append(((strategy_id, leg['name']), inputs, {**config, 'leg': leg}))
+    
+    with timed('backtest'):
+        outputs = run_tasks(evaluate_leg, leg_tasks, mode=executor, max_workers=max_workers)
+    
+    results = {}
+    for strategy_id, strategy in plan['strategies'].items():
+        legs = {leg['name']: outputs[(strategy_id, leg['name'])] for leg in strategy['legs'] if (strategy_id, leg['name']) in outputs}
+        if not legs:
+            results[strategy_id] = None
+            continue
+        
+        with timed(f'portfolio:{strategy_id}'):
+            combined = pd.DataFrame({name: out['return'] for name, out in legs.items()}).fillna(0)
+            combined['portfolio_return'] = combined.mean(axis=1)
+            combined['cumulative_return'] = (1 + combined['portfolio_return']).cumprod()
+            positions = pd.DataFrame({name: out['position'] for name, out in legs.items()})
+            benchmark = benchmark_returns({name: out['hold'] for name, out in legs.items()}, combined['portfolio_return'])
+        
+        results[strategy_id] = {'returns': combined, 'positions': positions, 'benchmark': benchmark}
+    
+    return results
+
+
+def _leaf_series(leg: dict) -> set:
+    """expr leg의 표현식이 참조하는 시리즈 (@간격 포함)"""
+    program = leg.get('program')
+    return {series for _, series, _ in program['leaves'].values()} if program else set()
@@ -0,0 +1,169 @@
+"""
+실행 단위 타이밍 / 캐시 / 메모리 계측
+- timed(name): 컨텍스트 매니저 겸 데코레이터, 현재 실행(RunProfile)에 단계별 소요 시간 기록
+- 현재 실행이 없으면 (워커 프로세스, 스크립트 등) 아무것도 기록하지 않음
+- capture_profile(): 한 번의 실행을 cProfile / pyinstrument로 저장
+"""
+
+import contextvars
+import os
+import sys
+import time
+from contextlib import ContextDecorator
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current = contextvars.ContextVar('run_profile', default=None)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 실행 단위 기록
+# ════════════════════════════════════════════════════════════════════════════════
+
+class RunProfile:
+    """한 번의 Streamlit 실행(rerun)에서 수집한 계측값"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.cache = {}
+    
+    def add(self, name: str, elapsed: float):
+        stat = self.stages.setdefault(name, [0, 0.0, 0.0])
+        stat[0] += 1
+        stat[1] += elapsed
+        stat[2] = max(stat[2], elapsed)
+    
+    def cache_call(self, name: str):
+        self.cache.setdefault(name, [0, 0])[0] += 1
+    
+    def cache_miss(self, name: str):
+        self.cache.setdefault(name, [0, 0])[1] += 1
+    
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+    
+    def stage_table(self) -> pd.DataFrame:
+        """단계별 호출 수 / 합계 / 최대 (ms), 합계 내림차순"""
+        rows = {name: [calls, total * 1000, peak * 1000] for name, (calls, total, peak) in self.stages.items()}
+        df = pd.DataFrame.from_dict(rows, orient='index', columns=['calls', 'total_ms', 'max_ms'])
+        return df.sort_values('total_ms', ascending=False)
+    
+    def cache_table(self) -> pd.DataFrame:
+        """캐시 함수별 hit / miss"""
+        rows = {name: [calls - misses, misses] for name, (calls, misses) in self.cache.items()}
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['hit', 'miss'])
+
+
+def start_run() -> RunProfile:
+    """새 실행 기록 시작 (이전 기록 대체)"""
+    profile = RunProfile()
+    _current.set(profile)
+    return profile
+
+
+def current_run() -> RunProfile:
+    return _current.get()
+
+
+class timed(ContextDecorator):
+    """단계 소요 시간 기록
+    
+    with timed('backtest:upbit'): ...
+    @timed('load_csv_data', cached=True)  → 호출 수도 캐시 통계에 기록
+    """
+    
+    def __init__(self, name: str, cached: bool = False):
+        self.name = name
+        self.cached = cached
+    
+    def _recreate_cm(self):
+        # 데코레이터로 쓰일 때 호출마다 새 인스턴스 (재귀/스레드 안전)
+        return timed(self.name, self.cached)
+    
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        profile = _current.get()
+        if profile is not None:
+            profile.add(self.name, time.perf_counter() - self.t0)
+            if self.cached:
+                profile.cache_call(self.name)
+        return False
+
+
+def mark_cache_miss(name: str):
+    """캐시 함수 본문에서 호출 → 실제 계산이 일어났음을 기록"""
+    profile = _current.get()
+    if profile is not None:
+        profile.cache_miss(name)
+
+
+def memory_usage_mb() -> dict:
+    """현재 / 최대 RSS (MB)"""
+    usage = {'rss': None, 'peak': None}
+    
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        usage['rss'] = pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KB, macOS: bytes
+        usage['peak'] = peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+    
+    return usage
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 프로파일 캡처
+# ════════════════════════════════════════════════════════════════════════════════
+
+def available_profilers() -> list:
+    """사용 가능한 프로파일러 (pyinstrument는 설치된 경우만)"""
+    engines = ['cprofile']
+    try:
+        import pyinstrument  # noqa: F401
+        engines.append('pyinstrument')
+    except ImportError:
+        pass
+    return engines
+
+
+def capture_profile(func, out_dir: str, engine: str = 'cprofile') -> str:
+    """func() 한 번 실행을 프로파일링해 파일로 저장, 저장 경로 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    if engine == 'pyinstrument':
+        from pyinstrument import Profiler
+        
+        profiler = Profiler()
+        profiler.start()
+        try:
+            func()
+        finally:
+            profiler.stop()
+            path = os.path.join(out_dir, f'rerun_{stamp}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return path
+    
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(func)
+    finally:
+        path = os.path.join(out_dir, f'rerun_{stamp}.prof')
+        profiler.dump_stats(path)
+    return path
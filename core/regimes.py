@@ -0,0 +1,160 @@
+"""
+시장 국면(추세 / 변동성) 라벨링 + 국면별 성과
+- 추세: 종가 > 이동평균(trend_ma) → 상승, 아니면 하락
+- 변동성: 로그수익률 롤링 표준편차(vol_window) > 최근 vol_lookback봉 변동성의 중앙값 → 고변동, 아니면 저변동
+- 라벨은 봉마다 정수 코드 (-1: 지표 준비 전), 롤링 연산만 사용 (봉 단위 반복문 없음)
+- RegimeLabeler: 새 봉이 붙으면 마지막 lookback봉만 다시 계산해 뒤에 이어 붙임 (과거 값이 바뀌면 전체 재계산)
+- 전략 봉에는 그 봉 시작 전에 마감된 라벨 봉의 국면을 붙임 (미래 정보 없음), 인덱스가 모두 UTC라 유니버스가 달라도 그대로 비교
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.bars import INTERVAL_SECONDS
+from core.metrics import calculate_metrics
+
+REGIME_LABELS = {
+    0: '상승 · 저변동',
+    1: '상승 · 고변동',
+    2: '하락 · 저변동',
+    3: '하락 · 고변동',
+}
+
+REGIME_COLORS = {
+    0: '#00C853',
+    1: '#FFA000',
+    2: '#42A5F5',
+    3: '#FF1744',
+}
+
+UNLABELED = -1
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 라벨 계산
+# ════════════════════════════════════════════════════════════════════════════════
+
+def regime_lookback(config: dict) -> int:
+    """라벨 하나를 계산하는 데 필요한 과거 봉 수"""
+    return max(config['trend_ma'], config['vol_window'] + config['vol_lookback'])
+
+
+def label_regimes(close: np.ndarray, config: dict) -> np.ndarray:
+    """종가 배열 → 국면 코드 배열 (int8, 준비 전 -1)"""
+    close = pd.Series(np.asarray(close, dtype=np.float64))
+    
+    ma = close.rolling(config['trend_ma']).mean()
+    vol = np.log(close).diff().rolling(config['vol_window']).std()
+    threshold = vol.rolling(config['vol_lookback']).median()
+    
+    down = (close <= ma).to_numpy()
+    high = (vol > threshold).to_numpy()
+    ready = (ma.notna() & threshold.notna()).to_numpy()
+    
+    codes = down.astype(np.int8) * 2 + high.astype(np.int8)
+    return np.where(ready, codes, UNLABELED).astype(np.int8)
+
+
+class RegimeLabeler:
+    """가격 시리즈 하나의 국면 라벨 상태 (증분 갱신)"""
+    
+    def __init__(self, config: dict):
+        self.config = config
+        self.index = np.empty(0, dtype=np.int64)
+        self.close = np.empty(0, dtype=np.float64)
+        self.codes = np.empty(0, dtype=np.int8)
+        self.recomputed = 0
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def _is_prefix(self, index: np.ndarray, close: np.ndarray) -> bool:
+        """기존 상태가 새 시리즈의 앞부분과 동일한지 확인 (봉 시각 + 종가 전체 비교 → 과거 봉 수정 / 수정주가 반영도 감지)"""
+        n = len(self.index)
+        if len(index) < n:
+            return False
+        return np.array_equal(index[:n], self.index) and np.array_equal(close[:n], self.close)
+    
+    def update(self, df: pd.DataFrame) -> int:
+        """전체 가격 프레임을 받아 새 봉의 라벨만 계산, 추가된 봉 수 반환"""
+        index = df.index.as_unit('ns').asi8
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        if not self._is_prefix(index, close):
+            self.__init__(self.config)
+        
+        n = len(self.index)
+        if len(index) == n:
+            return 0
+        
+        # 새 봉 라벨에 필요한 과거 구간만 포함해 다시 계산
+        start = max(n - regime_lookback(self.config), 0)
+        new_codes = label_regimes(close[start:], self.config)[n - start:]
+        
+        # 라벨을 먼저 교체 (동시에 읽는 세션이 index보다 짧은 codes를 보지 않도록)
+        self.codes = np.concatenate([self.codes, new_codes])
+        self.close = close
+        self.index = index
+        self.recomputed += len(close) - start
+        return len(index) - n
+    
+    def labels(self) -> pd.Series:
+        """봉 시각 → 국면 코드"""
+        return pd.Series(self.codes, index=pd.DatetimeIndex(self.index.view('M8[ns]'), name='datetime'))
+    
+    def align(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """다른 시리즈의 봉 시각(UTC)에 그 시각 이전에 마감된 봉의 국면 코드를 붙임 (없으면 -1)
+        
+        라벨 봉은 시작 시각 + 봉 길이(interval)에 마감 → 봉 시작 시각 기준이면 미래 정보 없음
+        """
+        target = index.as_unit('ns').asi8
+        closes = self.index + INTERVAL_SECONDS[self.config['interval']] * 10**9
+        position = np.searchsorted(closes, target, side='right') - 1
+        return np.where(position >= 0, self.codes[np.maximum(position, 0)], UNLABELED).astype(np.int8)
+
+
+class RegimeStore:
+    """국면 정의별 RegimeLabeler 모음 (세션 간 공유)"""
+    
+    def __init__(self):
+        self.labelers = {}
+        self._lock = threading.Lock()
+    
+    def update(self, key: str, config: dict, df: pd.DataFrame) -> RegimeLabeler:
+        """키별 라벨 갱신 (새 봉만 계산) - 설정이 바뀌면 새로 만듦"""
+        with self._lock:
+            labeler = self.labelers.get(key)
+            if labeler is None or labeler.config != config:
+                labeler = self.labelers[key] = RegimeLabeler(config)
+            if df is not None and len(df) > 0:
+                labeler.update(df)
+        return labeler
+    
+    def get(self, key: str) -> RegimeLabeler:
+        return self.labelers.get(key)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 국면별 성과
+# ════════════════════════════════════════════════════════════════════════════════
+
+def regime_breakdown(returns: pd.Series, codes: np.ndarray, periods_per_year: int) -> tuple:
+    """수익률 + 봉별 국면 코드 → (국면별 지표 DataFrame, 국면별 누적 곡선 DataFrame)
+    
+    누적 곡선: 해당 국면 봉의 수익률만 반영 (다른 국면 봉은 수익률 0)
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    codes = np.asarray(codes)
+    
+    # (봉 × 국면) 마스크 한 번에 → 국면별 곡선
+    masks = codes[:, None] == np.array(list(REGIME_LABELS))[None, :]
+    masked = np.where(masks, np.nan_to_num(values)[:, None], 0.0)
+    curves = pd.DataFrame(np.cumprod(1 + masked, axis=0), index=returns.index, columns=list(REGIME_LABELS.values()))
+    
+    rows = {}
+    for column, label in enumerate(REGIME_LABELS.values()):
+        mask = masks[:, column]
+        metrics = calculate_metrics(returns[mask], periods_per_year)
+        rows[label] = {'share': mask.mean() * 100, 'bars': int(mask.sum()), **metrics}
+    
+    return pd.DataFrame.from_dict(rows, orient='index'), curves
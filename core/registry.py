@@ -0,0 +1,195 @@
+"""
+전략 / 유니버스 레지스트리 (strategies.json)
+- universes: 데이터 소스, 심볼, 봉 간격, CSV 파일명 규칙 → 업데이터와 로더가 사용
+  (선택) intrabar: 하위 봉 간격 (.npz 저장, 상위 봉으로 리샘플)
+  (선택) timezone: 소스 봉 시각의 시간대 (IANA, 기본 UTC), grid: 봉 경계 시계 utc / local (core.timebase 참고)
+- strategies: 전략 종류(kind), 유니버스, 심볼별 파라미터 → 백테스트 플랜으로 컴파일
+  (kind: expr → interval(기준 봉) + position 표현식, core.dsl 참고)
+- (선택) risk: 리스크 탭 벤치마크 (유니버스 / 심볼 / 봉 간격), 롤링 윈도우 기본값
+- (선택) regimes: 시장 국면 라벨 기준 시리즈 + 추세 / 변동성 파라미터
+- (선택) alerts: 업데이터 신호 변경 알림 (대상 전략, 상태 파일, 싱크 목록)
+"""
+
+import json
+import os
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from core.bars import INTERVAL_SECONDS
+from core.dsl import expression_intervals
+from core.timebase import GRIDS
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'strategies.json')
+
+STRATEGY_KINDS = ('ma_vote', 'ma_stoch_gate', 'expr')
+
+ALERT_SINK_TYPES = ('stdout', 'file', 'webhook')
+
+_CACHE = {}
+
+
+def load_registry(path: str = None) -> dict:
+    """레지스트리 로드 + 검증 (파일 수정 시각 기준 캐시)"""
+    path = path or REGISTRY_PATH
+    mtime = os.path.getmtime(path)
+    
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, encoding='utf-8') as f:
+        registry = json.load(f)
+    
+    validate_registry(registry)
+    _CACHE[path] = (mtime, registry)
+    return registry
+
+
+def validate_registry(registry: dict):
+    """유니버스 / 전략 정의 검증 (잘못된 설정은 ValueError)"""
+    universes = registry.get('universes', {})
+    
+    for universe_id, universe in universes.items():
+        for key in ('source', 'intervals', 'file', 'symbols'):
+            if key not in universe:
+                raise ValueError(f"universe '{universe_id}': '{key}' 누락")
+        
+        try:
+            ZoneInfo(universe.get('timezone', 'UTC'))
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"universe '{universe_id}': 알 수 없는 timezone '{universe.get('timezone')}'") from None
+        if universe.get('grid', 'utc') not in GRIDS:
+            raise ValueError(f"universe '{universe_id}': grid는 {GRIDS} 중 하나")
+        if universe.get('grid') == 'local' and universe.get('intrabar'):
+            raise ValueError(f"universe '{universe_id}': intrabar 리샘플은 UTC 격자(grid: utc)만 지원")
+        
+        for interval in universe.get('intrabar', []):
+            if interval not in INTERVAL_SECONDS:
+                raise ValueError(f"universe '{universe_id}': 알 수 없는 intrabar 간격 '{interval}'")
+            if '{interval}' not in universe['file']:
+                raise ValueError(f"universe '{universe_id}': intrabar는 파일명에 '{{interval}}'이 필요")
+    
+    for strategy_id, strategy in registry.get('strategies', {}).items():
+        if strategy.get('kind') not in STRATEGY_KINDS:
+            raise ValueError(f"strategy '{strategy_id}': 알 수 없는 kind '{strategy.get('kind')}'")
+        
+        universe = universes.get(strategy.get('universe'))
+        if universe is None:
+            raise ValueError(f"strategy '{strategy_id}': 알 수 없는 universe '{strategy.get('universe')}'")
+        
+        intervals = [strategy.get(key) for key in ('interval', 'ma_interval', 'stoch_interval') if key in strategy]
+        for interval in intervals:
+            if interval not in universe['intervals']:
+                raise ValueError(f"strategy '{strategy_id}': universe에 없는 interval '{interval}'")
+        
+        unknown = set(strategy.get('symbols') or {}) - set(universe['symbols'])
+        if unknown:
+            raise ValueError(f"strategy '{strategy_id}': universe에 없는 심볼 {sorted(unknown)}")
+        
+        if strategy['kind'] == 'expr':
+            _validate_expression(strategy_id, strategy, universe)
+    
+    benchmark = registry.get('risk', {}).get('benchmark')
+    if benchmark is not None and not _is_series(benchmark, universes):
+        raise ValueError(f"risk: 알 수 없는 벤치마크 {benchmark}")
+    
+    for regime_id, regime in registry.get('regimes', {}).items():
+        if not _is_series(regime, universes):
+            raise ValueError(f"regime '{regime_id}': 알 수 없는 시리즈 {regime}")
+        for key in ('trend_ma', 'vol_window', 'vol_lookback'):
+            if not isinstance(regime.get(key), int) or regime[key] < 2:
+                raise ValueError(f"regime '{regime_id}': '{key}'는 2 이상의 정수")
+    
+    alerts = registry.get('alerts', {})
+    unknown = set(alerts.get('strategies') or []) - set(registry.get('strategies', {}))
+    if unknown:
+        raise ValueError(f"alerts: 알 수 없는 전략 {sorted(unknown)}")
+    for sink in alerts.get('sinks', []):
+        if sink.get('type') not in ALERT_SINK_TYPES:
+            raise ValueError(f"alerts: 알 수 없는 싱크 '{sink.get('type')}'")
+        if sink['type'] == 'file' and not sink.get('path'):
+            raise ValueError("alerts: file 싱크는 'path'가 필요")
+        if sink['type'] == 'webhook' and not (sink.get('url_env') or sink.get('url')):
+            raise ValueError("alerts: webhook 싱크는 'url_env' 또는 'url'이 필요")
+
+
+def _validate_expression(strategy_id: str, strategy: dict, universe: dict):
+    """expr 전략: 기준 봉 / 표현식 문법 / @간격 검증"""
+    if 'interval' not in strategy or 'position' not in strategy:
+        raise ValueError(f"strategy '{strategy_id}': expr은 'interval'과 'position'이 필요")
+    
+    try:
+        intervals = expression_intervals(strategy['position'])
+    except ValueError as e:
+        raise ValueError(f"strategy '{strategy_id}': {e}") from None
+    
+    for interval in intervals:
+        if interval.startswith('$'):
+            continue
+        if interval not in universe['intervals']:
+            raise ValueError(f"strategy '{strategy_id}': universe에 없는 interval '{interval}'")
+        if INTERVAL_SECONDS[interval] < INTERVAL_SECONDS[strategy['interval']]:
+            raise ValueError(f"strategy '{strategy_id}': @{interval}은 기준 봉보다 짧음 (긴 간격만 매핑 가능)")
+
+
+def _is_series(ref: dict, universes: dict) -> bool:
+    """{universe, symbol, interval} 참조가 레지스트리에 있는지"""
+    universe = universes.get(ref.get('universe'))
+    return universe is not None and ref.get('symbol') in universe['symbols'] and ref.get('interval') in universe['intervals']
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 유니버스 헬퍼
+# ════════════════════════════════════════════════════════════════════════════════
+
+def symbol_name(universe: dict, symbol: str) -> str:
+    """심볼 → 파일명/컬럼용 이름 (KRW-ADA → ada, BTCUSDT → btc)"""
+    quote = universe.get('quote', '')
+    base = symbol.replace(quote, '', 1) if quote else symbol
+    return base.strip('-').lower()
+
+
+def data_filename(universe: dict, symbol: str, interval: str) -> str:
+    """심볼 / 봉 간격 → CSV 파일명"""
+    return universe['file'].format(name=symbol_name(universe, symbol), interval=interval)
+
+
+def universe_files(universe: dict) -> list:
+    """유니버스의 전체 데이터 파일 [(symbol, interval, filename), ...]"""
+    return [
+        (symbol, interval, data_filename(universe, symbol, interval))
+        for symbol in universe['symbols']
+        for interval in universe['intervals']
+    ]
+
+
+def intrabar_filename(universe: dict, symbol: str, interval: str) -> str:
+    """인트라바 .npz 파일명 (CSV 파일명 규칙에서 확장자만 변경)"""
+    return os.path.splitext(data_filename(universe, symbol, interval))[0] + '.npz'
+
+
+def intrabar_files(universe: dict) -> list:
+    """유니버스의 인트라바 파일 [(symbol, interval, filename), ...]"""
+    return [
+        (symbol, interval, intrabar_filename(universe, symbol, interval))
+        for symbol in universe['symbols']
+        for interval in universe.get('intrabar', [])
+    ]
+
+
+def intrabar_source(universe: dict, interval: str) -> str:
+    """interval 봉을 만들 수 있는 가장 큰 인트라바 간격 (없으면 None)"""
+    target = INTERVAL_SECONDS.get(interval)
+    candidates = [
+        base for base in universe.get('intrabar', [])
+        if target and INTERVAL_SECONDS[base] < target and target % INTERVAL_SECONDS[base] == 0
+    ]
+    return max(candidates, key=INTERVAL_SECONDS.get) if candidates else None
+
+
+def strategy_legs(registry: dict, strategy_id: str) -> dict:
+    """전략의 심볼별 파라미터 (defaults 병합, symbols 생략 시 유니버스 전체)"""
+    strategy = registry['strategies'][strategy_id]
+    universe = registry['universes'][strategy['universe']]
+    defaults = strategy.get('defaults', {})
+    symbols = strategy.get('symbols') or {symbol: {} for symbol in universe['symbols']}
+    
+    return {symbol: {**defaults, **params} for symbol, params in symbols.items()}
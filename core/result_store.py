@@ -0,0 +1,144 @@
+"""
+세션 간 공유 백테스트 결과 저장소
+- 키: (레지스트리 해시, 엔진, 데이터 파일 지문) → 같은 입력이면 세션 / 재실행이 결과 객체 하나를 공유 (복사 / pickle 없음)
+- single-flight: 같은 키를 여러 세션이 동시에 요청하면 한 세션만 계산하고 나머지는 그 결과를 기다림
+- 동시 계산 상한: 서로 다른 키의 계산도 max_concurrent개까지만 동시에 실행
+- 값은 읽기 전용으로만 사용: 수정이 필요한 쪽이 먼저 복사 (filter_and_rebase 등 - pandas Copy-on-Write 설정에 의존하지 않음)
+- 대시보드 로더 캐시도 파일 버전(크기, 수정 시각)을 키에 포함 → 새 지문 키에 이전 파일 내용이 저장되지 않음
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from core.data import file_version
+from core.profiling import current_run
+from core.registry import universe_files, intrabar_files
+from core.snapshot import registry_hash
+
+DEFAULT_MAX_ENTRIES = 4
+DEFAULT_MAX_CONCURRENT = 2
+
+
+def data_fingerprint(registry: dict, data_path: str) -> str:
+    """레지스트리가 참조하는 데이터 파일들의 (이름, 크기, 수정 시각) 지문 - 파일 내용을 읽지 않음"""
+    h = hashlib.sha256()
+    for universe in registry['universes'].values():
+        for _, _, filename in universe_files(universe) + intrabar_files(universe):
+            h.update(f'{filename}:{file_version(filename, data_path)};'.encode())
+    return h.hexdigest()[:32]
+
+
+def result_key(registry: dict, data_path: str, engine: str) -> tuple:
+    """백테스트 결과 키 (실행 방식은 결과가 같으므로 제외)"""
+    return (registry_hash(registry), engine, data_fingerprint(registry, data_path))
+
+
+class _Flight:
+    """진행 중인 계산 하나 (기다리는 세션은 done을 대기)"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultStore:
+    """키 → 결과 LRU 저장소 (스레드 안전, single-flight)"""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        self.max_entries = max_entries
+        self.max_concurrent = max_concurrent
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.errors = 0
+        self.evictions = 0
+        self.compute_seconds = 0.0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_or_compute(self, key: tuple, compute):
+        """저장된 결과 반환, 없으면 compute() (같은 키를 계산 중이면 그 결과를 기다림)
+        
+        compute()가 예외를 내면 기다리던 세션에도 같은 예외를 전달하고 저장하지 않음
+        """
+        profile = current_run()
+        if profile is not None:
+            profile.cache_call('result_store')
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.waits += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        
+        if profile is not None:
+            profile.cache_miss('result_store')
+        
+        try:
+            with self._slots:
+                started = time.perf_counter()
+                value = compute()
+                elapsed = time.perf_counter() - started
+        except BaseException as error:
+            flight.error = error
+            with self._lock:
+                self.errors += 1
+                del self._flights[key]
+            flight.done.set()
+            raise
+        
+        # 저장과 진행 중 표시 해제를 한 번에 (그 사이에 들어온 요청이 다시 계산하지 않도록)
+        flight.value = value
+        with self._lock:
+            self.compute_seconds += elapsed
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            del self._flights[key]
+        flight.done.set()
+        
+        return value
+    
+    def stats(self) -> dict:
+        """누적 hit / miss(계산) / wait(중복 제거) / 오류 / 항목 수 / 계산 시간"""
+        with self._lock:
+            calls = self.hits + self.misses + self.waits
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'errors': self.errors,
+                'hit_rate': (self.hits + self.waits) / calls if calls else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'in_flight': len(self._flights),
+                'evictions': self.evictions,
+                'compute_seconds': self.compute_seconds,
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,185 @@
+"""
+전략 심볼(leg) 간 상관 / 베타 / 위험 기여도
+- 모든 leg의 봉 수익률 → 일간 복리 수익률 행렬 (T × N, 4H / 일봉 혼합을 같은 UTC 달력으로 - 인덱스가 모두 UTC)
+- 롤링 상관행렬: 윈도우를 (K × N × w) 배열로 모아 배치 행렬곱 → K × N × N (청크 단위, float32)
+- 베타 / 위험 기여도: 공분산 행렬 연산 한 번 (leg 수에 대해 반복문 없음)
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 수익률 행렬
+# ════════════════════════════════════════════════════════════════════════════════
+
+def leg_label(label: str, leg: str) -> str:
+    """리스크 행렬 열 이름 (히트맵 시리즈 키와 같은 형식)"""
+    return f"{label} · {leg}"
+
+
+def daily_leg_returns(results: dict, labels: dict) -> pd.DataFrame:
+    """evaluate_plan 결과 → 일간 복리 수익률 행렬 (열: '{라벨} · {심볼}')
+    
+    labels: {strategy_id: 열 이름 앞에 붙일 라벨}
+    거래가 없는 날(TQQQ 주말 등)은 0
+    """
+    frames = []
+    for strategy_id, result in results.items():
+        if result is None:
+            continue
+        
+        df = result['returns']
+        legs = [c for c in df.columns if c not in ('portfolio_return', 'cumulative_return')]
+        with np.errstate(divide='ignore'):
+            log_returns = np.log1p(df[legs])
+        daily = log_returns.groupby(df.index.normalize()).sum()
+        daily.columns = [leg_label(labels.get(strategy_id, strategy_id), leg) for leg in legs]
+        frames.append(daily)
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    return np.expm1(pd.concat(frames, axis=1).sort_index()).fillna(0)
+
+
+def leg_weights(results: dict, labels: dict, strategy_weights: dict) -> pd.Series:
+    """포트폴리오 배분(전략별) × 전략 내 동일 비중 → leg별 비중 (합 = 1)"""
+    total = sum(strategy_weights.get(sid, 0) for sid, result in results.items() if result is not None)
+    weights = {}
+    for strategy_id, result in results.items():
+        if result is None or not total:
+            continue
+        
+        legs = [c for c in result['returns'].columns if c not in ('portfolio_return', 'cumulative_return')]
+        for leg in legs:
+            weights[leg_label(labels.get(strategy_id, strategy_id), leg)] = strategy_weights.get(strategy_id, 0) / total / len(legs)
+    
+    return pd.Series(weights, dtype=np.float64)
+
+
+def daily_price_returns(df: pd.DataFrame) -> pd.Series:
+    """가격 프레임 → 일간 종가 수익률 (벤치마크용)"""
+    close = df['close'].groupby(df.index.normalize()).last()
+    return close.pct_change().fillna(0)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 상관 / 베타 / 위험 기여도
+# ════════════════════════════════════════════════════════════════════════════════
+
+def rolling_correlations(returns: pd.DataFrame, window: int, step: int = 1, chunk: int = 64) -> tuple:
+    """롤링 상관행렬 (윈도우 끝이 step 간격)
+    
+    반환: (끝 날짜 DatetimeIndex, K × N × N float32 배열) - 분산 0인 leg는 NaN
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    n_rows, n_legs = values.shape
+    if n_rows < window:
+        return returns.index[:0], np.empty((0, n_legs, n_legs), dtype=np.float32)
+    
+    ends = np.arange(window - 1, n_rows, step)
+    windows = sliding_window_view(values, window, axis=0)  # (T - w + 1) × N × w, 복사 없음
+    out = np.empty((len(ends), n_legs, n_legs), dtype=np.float32)
+    
+    for lo in range(0, len(ends), chunk):
+        block = windows[ends[lo:lo + chunk] - window + 1]
+        block = block - block.mean(axis=2, keepdims=True)
+        cov = block @ block.transpose(0, 2, 1)
+        std = np.sqrt(np.einsum('kii->ki', cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[lo:lo + chunk] = cov / (std[:, :, None] * std[:, None, :])
+    
+    return returns.index[ends], out
+
+
+def average_correlation(correlations: np.ndarray) -> np.ndarray:
+    """상관행렬별 대각선 제외 평균 (NaN 제외)"""
+    n_legs = correlations.shape[-1]
+    if n_legs < 2:
+        return np.full(len(correlations), np.nan)
+    
+    mask = ~np.eye(n_legs, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        return np.nanmean(correlations[:, mask], axis=1)
+
+
+def betas(returns: pd.DataFrame, benchmark: pd.Series) -> pd.Series:
+    """leg별 벤치마크 베타 (cov / var, 전 구간)"""
+    bench = benchmark.reindex(returns.index).fillna(0).to_numpy(dtype=np.float64)
+    bench = bench - bench.mean()
+    values = returns.to_numpy(dtype=np.float64)
+    values = values - values.mean(axis=0)
+    
+    var = bench @ bench
+    beta = values.T @ bench / var if var > 0 else np.full(values.shape[1], np.nan)
+    return pd.Series(beta, index=returns.columns)
+
+
+def rolling_betas(returns: pd.DataFrame, benchmark: pd.Series, window: int, step: int = 1) -> pd.DataFrame:
+    """롤링 베타 (윈도우 끝이 step 간격) - 누적합으로 모든 leg 동시 계산"""
+    bench = benchmark.reindex(returns.index).fillna(0).to_numpy(dtype=np.float64)
+    values = returns.to_numpy(dtype=np.float64)
+    if len(values) < window:
+        return pd.DataFrame(columns=returns.columns)
+    
+    def window_sum(x):
+        c = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0)])
+        return c[window:] - c[:-window]
+    
+    sum_b = window_sum(bench)
+    sum_x = window_sum(values)
+    sum_xb = window_sum(values * bench[:, None])
+    sum_bb = window_sum(bench * bench)
+    
+    cov = sum_xb - sum_x * (sum_b / window)[:, None]
+    var = sum_bb - sum_b ** 2 / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov / var[:, None]
+    
+    ends = np.arange(window - 1, len(values))
+    return pd.DataFrame(beta[::step], index=returns.index[ends][::step], columns=returns.columns)
+
+
+def risk_contributions(returns: pd.DataFrame, weights: pd.Series, periods_per_year: int = 365) -> pd.DataFrame:
+    """포트폴리오 위험(변동성) 기여도
+    
+    - marginal: ∂σ_p/∂w_i = (Σw)_i / σ_p
+    - contribution: w_i × marginal (합 = σ_p)
+    - pct: contribution / σ_p (합 = 100%)
+    σ는 연환산 (%)
+    """
+    w = weights.reindex(returns.columns).fillna(0).to_numpy(dtype=np.float64)
+    cov = np.cov(returns.to_numpy(dtype=np.float64), rowvar=False) * periods_per_year
+    cov = np.atleast_2d(cov)
+    
+    sigma_w = cov @ w
+    sigma_p = np.sqrt(max(w @ sigma_w, 0.0))
+    marginal = sigma_w / sigma_p if sigma_p > 0 else np.zeros_like(w)
+    contribution = w * marginal
+    
+    return pd.DataFrame({
+        'weight': w * 100,
+        'volatility': np.sqrt(np.diag(cov)) * 100,
+        'marginal': marginal * 100,
+        'contribution': contribution * 100,
+        'pct': contribution / sigma_p * 100 if sigma_p > 0 else np.zeros_like(w),
+    }, index=returns.columns)
+
+
+def compute_risk(returns: pd.DataFrame, benchmark: pd.Series, weights: pd.Series,
+                 window: int = 60, step: int = 5) -> dict:
+    """리스크 탭 전체 계산 (기간 필터된 일간 수익률 행렬 기준)"""
+    dates, correlations = rolling_correlations(returns, window, step)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        full_corr = returns.corr().to_numpy(dtype=np.float32) if len(returns) > 1 else None
+    
+    return {
+        'legs': list(returns.columns),
+        'dates': dates,
+        'correlations': correlations,
+        'average_correlation': pd.Series(average_correlation(correlations), index=dates),
+        'full_correlation': full_corr,
+        'betas': betas(returns, benchmark) if benchmark is not None else None,
+        'rolling_betas': rolling_betas(returns, benchmark, window, step) if benchmark is not None else None,
+        'contributions': risk_contributions(returns, weights),
+    }
@@ -0,0 +1,198 @@
+"""
+이벤트 기반 (봉 단위) 시뮬레이터
+- 벡터화 커널이 만든 목표 비중(포지션)을 같은 CSV 가격으로 체결: 종가 체결, 수수료, 유지증거금 / 강제청산
+- 상태는 파이썬 float 몇 개 (현금, 수량, 직전 목표) - 봉마다 DataFrame 접근 없음
+- 포지션이 없고 목표도 0인 봉은 건너뜀 (이벤트가 있는 봉만 순회)
+- cross_check: 수수료 0 / 청산 없음 / 매 봉 리밸런싱이면 벡터화 결과와 같아야 함
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.profiling import timed
+from core.strategies import benchmark_returns
+
+ENGINES = {
+    'vectorized': '벡터화',
+    'event': '이벤트 기반',
+}
+
+SIZING_MODES = ('signal', 'rebalance')
+
+DEFAULT_EXECUTION = {
+    'fee_rate': 0.0,            # 체결 금액 대비 수수료
+    'maintenance_margin': 0.0,  # 유지증거금률 (0이면 강제청산 없음)
+    'liquidation_fee': 0.0,     # 강제청산 시 청산 금액 대비 추가 손실
+    'sizing': 'signal',         # signal: 목표 비중이 바뀔 때만 체결 / rebalance: 매 봉 목표 비중으로 재조정
+}
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 심볼 단위 시뮬레이션
+# ════════════════════════════════════════════════════════════════════════════════
+
+def simulate_leg(open_: np.ndarray, low: np.ndarray, close: np.ndarray, target: np.ndarray, execution: dict) -> dict:
+    """롱 전용 봉 단위 시뮬레이션 (초기 자본 1)
+    
+    target[t]: 봉 t 종가에 맞출 목표 비중 (자본 대비 명목 금액, 레버리지 포함)
+    강제청산: 자본(현금 + 수량 × 가격)이 유지증거금(유지증거금률 × 명목 금액) 이하가 되는 가격을
+              저가가 건드리면 그 가격(갭이면 시가)에 전량 청산, 이후 목표가 0이 될 때까지 재진입 없음
+    반환: equity / exposure 배열, trades / liquidations / fees
+    """
+    execution = {**DEFAULT_EXECUTION, **execution}
+    if execution['sizing'] not in SIZING_MODES:
+        raise ValueError(f"Unknown sizing: {execution['sizing']}")
+    
+    fee_rate = execution['fee_rate']
+    keep = 1 - execution['maintenance_margin']
+    check_liquidation = execution['maintenance_margin'] > 0
+    liquidation_keep = 1 - execution['liquidation_fee']
+    rebalance = execution['sizing'] == 'rebalance'
+    
+    n = len(close)
+    equity = np.full(n, np.nan)
+    exposure = np.zeros(n)
+    
+    # 목표가 0이고 직전 목표도 0인 봉은 포지션이 없으므로 자본 변화 없음
+    target = np.nan_to_num(np.asarray(target, dtype=np.float64))
+    prev_target = np.concatenate([[0.0], target[:-1]])
+    events = np.flatnonzero((target != 0) | (prev_target != 0))
+    
+    opens, lows, closes, targets = open_.tolist(), low.tolist(), close.tolist(), target.tolist()
+    cash, qty, held_target = 1.0, 0.0, 0.0
+    locked = False
+    trades = liquidations = 0
+    fees = 0.0
+    
+    for t in events.tolist():
+        price = closes[t]
+        
+        # 1. 보유 중 강제청산 (저가 기준)
+        if check_liquidation and qty > 0 and cash < 0:
+            liq_price = -cash / (qty * keep)
+            if lows[t] <= liq_price:
+                fill = min(liq_price, opens[t])
+                cash = max(cash + qty * fill * liquidation_keep, 0.0)
+                qty = 0.0
+                liquidations += 1
+                locked = True
+        
+        # 2. 종가 체결
+        w = targets[t]
+        if locked:
+            locked = w != 0
+        elif rebalance or w != held_target:
+            value = cash + qty * price
+            new_qty = w * value / price if value > 0 else 0.0
+            traded = (new_qty - qty) * price
+            if traded != 0:
+                fee = abs(traded) * fee_rate
+                cash -= traded + fee
+                fees += fee
+                trades += 1
+            qty = new_qty
+        held_target = w
+        
+        value = cash + qty * price
+        equity[t] = value
+        exposure[t] = qty * price / value if value > 0 else 0.0
+    
+    # 이벤트 없는 봉은 직전 자본 유지
+    filled = ~np.isnan(equity)
+    last = np.maximum.accumulate(np.where(filled, np.arange(n), -1))
+    equity = np.where(last >= 0, equity[np.maximum(last, 0)], 1.0)
+    
+    return {
+        'equity': equity,
+        'exposure': exposure,
+        'trades': trades,
+        'liquidations': liquidations,
+        'fees': fees,
+    }
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 플랜 단위 시뮬레이션
+# ════════════════════════════════════════════════════════════════════════════════
+
+def simulate_plan(plan: dict, frames: dict, results: dict, execution: dict = None) -> dict:
+    """evaluate_plan 결과의 포지션을 이벤트 기반으로 다시 체결
+    
+    execution: 전략 설정(plan options['execution'])을 덮어쓸 값 (cross_check용)
+    반환: evaluate_plan과 같은 형태 + 'stats' (심볼별 거래 수 / 청산 수 / 수수료 / 최종 자본)
+    """
+    simulated = {}
+    
+    for strategy_id, strategy in plan['strategies'].items():
+        result = results.get(strategy_id)
+        if result is None:
+            simulated[strategy_id] = None
+            continue
+        
+        options = {**strategy['options'].get('execution', {}), **(execution or {})}
+        returns, exposures, stats = {}, {}, {}
+        
+        with timed(f'simulate:{strategy_id}'):
+            for leg in strategy['legs']:
+                name = leg['name']
+                if name not in result['positions']:
+                    continue
+                
+                target = result['positions'][name].dropna()
+                data = frames[leg['series']['price']].reindex(target.index)
+                out = simulate_leg(
+                    data['open'].to_numpy(dtype=np.float64),
+                    data['low'].to_numpy(dtype=np.float64),
+                    data['close'].to_numpy(dtype=np.float64),
+                    target.to_numpy(dtype=np.float64),
+                    options,
+                )
+                
+                equity = pd.Series(out['equity'], index=target.index)
+                returns[name] = equity.pct_change().fillna(0)
+                exposures[name] = pd.Series(out['exposure'], index=target.index)
+                stats[name] = {
+                    'trades': out['trades'],
+                    'liquidations': out['liquidations'],
+                    'fees': out['fees'],
+                    'final_equity': out['equity'][-1],
+                }
+            
+            combined = pd.DataFrame(returns).fillna(0)
+            combined['portfolio_return'] = combined.mean(axis=1)
+            combined['cumulative_return'] = (1 + combined['portfolio_return']).cumprod()
+        
+        # Buy & Hold는 벡터화 결과 재사용, 초과 수익률만 체결 반영 수익률 기준으로 다시 계산
+        benchmark = result.get('benchmark')
+        if benchmark is not None:
+            benchmark = benchmark_returns(benchmark[[c for c in benchmark.columns if c in returns]], combined['portfolio_return'])
+        
+        simulated[strategy_id] = {
+            'returns': combined,
+            'positions': pd.DataFrame(exposures),
+            'benchmark': benchmark,
+            'stats': pd.DataFrame.from_dict(stats, orient='index'),
+        }
+    
+    return simulated
+
+
+def cross_check(plan: dict, frames: dict, results: dict) -> pd.DataFrame:
+    """수수료 0 / 청산 없음 / 매 봉 리밸런싱 시뮬레이션 vs 벡터화 결과
+    
+    반환: 전략별 심볼 수, 최대 절대 오차 (봉 수익률), 일치 여부
+    벡터화 쪽 clip_lower가 실제로 작동한 봉이 있으면 그 봉만큼 차이가 남
+    """
+    execution = {'fee_rate': 0.0, 'maintenance_margin': 0.0, 'liquidation_fee': 0.0, 'sizing': 'rebalance'}
+    simulated = simulate_plan(plan, frames, results, execution)
+    
+    rows = {}
+    for strategy_id, result in results.items():
+        if result is None or simulated.get(strategy_id) is None:
+            continue
+        
+        vectorized = result['returns']
+        event = simulated[strategy_id]['returns'].reindex(vectorized.index)
+        legs = [c for c in vectorized.columns if c not in ('portfolio_return', 'cumulative_return')]
+        error = float(np.nanmax(np.abs(event[legs].to_numpy() - vectorized[legs].to_numpy()))) if legs else 0.0
+        rows[strategy_id] = {'legs': len(legs), 'max_abs_error': error, 'match': error < 1e-9}
+    
+    return pd.DataFrame.from_dict(rows, orient='index')
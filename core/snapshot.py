@@ -0,0 +1,225 @@
+"""
+업데이터가 발행하는 대시보드 스냅샷 (data/snapshot.npz)
+- 전략별 수익률 시리즈(심볼별 + 포트폴리오), 포지션, Buy & Hold 벤치마크, 고정 기간(1M/6M/1Y/YTD/전체) 성과 /
+  벤치마크 대비 지표, 현재 포지션, 파일 상태
+- 배열은 npz, 나머지는 meta JSON 문자열 하나 (pickle 없음)
+- 내용 해시가 같으면 다시 쓰지 않음, 저장소에는 커밋하지 않음 (.gitignore - 업데이터 / 대시보드가 각자 생성)
+- 버전 / 레지스트리 해시 / 기준일 / 데이터 파일 지문이 맞을 때만 사용 → 대시보드는 CSV 로드와 백테스트 없이 렌더링
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from core.metrics import calculate_metrics, relative_metrics
+from core.timebase import date_slice
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_FILENAME = 'snapshot.npz'
+
+# 고정 분석 기간 (스냅샷에 지표를 미리 계산해 두는 기간)
+PERIODS = {
+    '1M': '최근 1개월',
+    '6M': '최근 6개월',
+    '1Y': '최근 1년',
+    'YTD': 'YTD (연초부터)',
+    'ALL': '전체 기간',
+}
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 기간 / 필터
+# ════════════════════════════════════════════════════════════════════════════════
+
+def period_range(period: str, today) -> tuple:
+    """고정 기간 → (시작일, 종료일)"""
+    if period == '1M':
+        return today - timedelta(days=30), today
+    if period == '6M':
+        return today - timedelta(days=180), today
+    if period == '1Y':
+        return today - timedelta(days=365), today
+    if period == 'YTD':
+        return datetime(today.year, 1, 1).date(), today
+    if period == 'ALL':
+        return today - timedelta(days=365*10), today
+    raise ValueError(f"Unknown period: {period}")
+
+
+def filter_and_rebase(df: pd.DataFrame, start, end, return_col: str = 'portfolio_return') -> pd.DataFrame:
+    """기간 필터 (UTC 날짜 [start, end], 양 끝 포함) + 누적 수익률 재계산 (기간 시작 = 1)
+    
+    인덱스가 모두 UTC라 업비트 / Binance / TQQQ가 같은 날짜 경계로 잘림
+    """
+    if df is None or len(df) == 0:
+        return None
+    filtered = date_slice(df, start, end).copy()
+    if len(filtered) > 0:
+        filtered['cumulative_return'] = (1 + filtered[return_col]).cumprod()
+    return filtered
+
+
+def registry_hash(registry: dict) -> str:
+    """레지스트리 내용 해시 (전략 / 파라미터가 바뀌면 스냅샷 무효)"""
+    return hashlib.sha256(json.dumps(registry, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 생성 / 저장 / 로드
+# ════════════════════════════════════════════════════════════════════════════════
+
+def build_snapshot(registry: dict, results: dict, files: dict, today=None, fingerprint: str = None) -> dict:
+    """evaluate_plan 결과 → 스냅샷 (메모리 형태)
+    
+    files: {filename: get_data_status 결과}
+    fingerprint: 계산에 쓴 데이터 파일 지문 (result_store.data_fingerprint) - 데이터가 바뀌면 스냅샷 무효
+    """
+    today = today or datetime.now(timezone.utc).date()
+    strategies = {}
+    
+    for strategy_id, result in results.items():
+        if result is None:
+            continue
+        
+        returns = result['returns'].drop(columns=['cumulative_return'])
+        positions = result['positions'].reindex(returns.index)
+        benchmark = result['benchmark'].reindex(returns.index).fillna(0)
+        periods_per_year = registry['strategies'][strategy_id]['periods_per_year']
+        
+        metrics, relative = {}, {}
+        for period in PERIODS:
+            start, end = period_range(period, today)
+            filtered = filter_and_rebase(returns, start, end)
+            if filtered is not None and len(filtered) > 0:
+                metrics[period] = calculate_metrics(filtered['portfolio_return'], periods_per_year)
+                relative[period] = relative_metrics(
+                    filtered['portfolio_return'], date_slice(benchmark['portfolio_return'], start, end), periods_per_year
+                )
+        
+        last = positions.ffill().iloc[-1]
+        strategies[strategy_id] = {
+            'returns': returns,
+            'positions': positions,
+            'benchmark': benchmark,
+            'metrics': metrics,
+            'relative': relative,
+            'current_positions': {leg: float(value) for leg, value in last.dropna().items()},
+        }
+    
+    return {
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'as_of': today.isoformat(),
+        'registry_hash': registry_hash(registry),
+        'data_fingerprint': fingerprint,
+        'strategies': strategies,
+        'files': {
+            filename: {k: v for k, v in status.items() if k != 'last_update'}
+            for filename, status in files.items()
+        },
+    }
+
+
+def write_snapshot(snapshot: dict, filepath: str) -> bool:
+    """스냅샷 → .npz (내용이 바뀐 경우에만, 임시 파일에 쓴 뒤 교체)
+    
+    - 수익률 / 벤치마크: float64 (지표 재현용)
+    - 포지션: float32로 정확히 표현되면 float32 (0 / 0.25 배수 / 레버리지 정수), 아니면 float64 - 손실 없음
+    - 인덱스: int64 UTC epoch ns (수익률 / 포지션 / 벤치마크 공통)
+    - content_hash: created_at을 뺀 meta + 배열 해시 → 기존 파일과 같으면 쓰지 않음
+    반환: 파일을 새로 썼는지
+    """
+    arrays = {}
+    meta = {k: v for k, v in snapshot.items() if k not in ('strategies', 'created_at')}
+    meta['strategies'] = {}
+    
+    for strategy_id, entry in snapshot['strategies'].items():
+        returns, positions, benchmark = entry['returns'], entry['positions'], entry['benchmark']
+        arrays[f'{strategy_id}.index'] = returns.index.as_unit('ns').asi8
+        arrays[f'{strategy_id}.returns'] = returns.to_numpy(dtype=np.float64)
+        arrays[f'{strategy_id}.positions'] = _compact_positions(positions.to_numpy(dtype=np.float64))
+        arrays[f'{strategy_id}.benchmark'] = benchmark.to_numpy(dtype=np.float64)
+        meta['strategies'][strategy_id] = {
+            'return_columns': list(returns.columns),
+            'position_columns': list(positions.columns),
+            'benchmark_columns': list(benchmark.columns),
+            'metrics': entry['metrics'],
+            'relative': entry['relative'],
+            'current_positions': entry['current_positions'],
+        }
+    
+    meta['content_hash'] = content_hash(meta, arrays)
+    if _stored_hash(filepath) == meta['content_hash']:
+        return False
+    
+    meta['created_at'] = snapshot['created_at']
+    arrays['meta'] = np.array(json.dumps(meta, ensure_ascii=False, default=float))
+    
+    tmp = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, filepath)
+    return True
+
+
+def content_hash(meta: dict, arrays: dict) -> str:
+    """스냅샷 내용 해시 (meta JSON + 배열 이름 / dtype / 바이트, 생성 시각 제외)"""
+    h = hashlib.sha256(json.dumps(meta, sort_keys=True, ensure_ascii=False, default=float).encode())
+    for name in sorted(arrays):
+        h.update(f'{name}:{arrays[name].dtype.str}:{arrays[name].shape}'.encode())
+        h.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _compact_positions(values: np.ndarray) -> np.ndarray:
+    """포지션 배열 → float32 (값이 그대로 복원될 때만, 아니면 float64 유지)"""
+    compact = values.astype(np.float32)
+    return compact if np.array_equal(compact.astype(np.float64), values, equal_nan=True) else values
+
+
+def _stored_hash(filepath: str) -> str:
+    """기존 스냅샷의 content_hash (없거나 읽을 수 없으면 None) - meta 배열만 읽음"""
+    if not os.path.exists(filepath):
+        return None
+    try:
+        with np.load(filepath, allow_pickle=False) as data:
+            return json.loads(str(data['meta'])).get('content_hash')
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def read_snapshot(filepath: str) -> dict:
+    """.npz → 스냅샷 (없거나 버전이 다르면 None)"""
+    if not os.path.exists(filepath):
+        return None
+    
+    with np.load(filepath, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if meta.get('version') != SNAPSHOT_VERSION:
+            return None
+        
+        strategies = {}
+        for strategy_id, entry in meta['strategies'].items():
+            index = pd.DatetimeIndex(data[f'{strategy_id}.index'].view('M8[ns]'), name='datetime')
+            returns = pd.DataFrame(data[f'{strategy_id}.returns'], index=index, columns=entry['return_columns'])
+            returns['cumulative_return'] = (1 + returns['portfolio_return']).cumprod()
+            positions = pd.DataFrame(
+                data[f'{strategy_id}.positions'].astype(np.float64), index=index, columns=entry['position_columns']
+            )
+            benchmark = pd.DataFrame(data[f'{strategy_id}.benchmark'], index=index, columns=entry['benchmark_columns'])
+            strategies[strategy_id] = {**entry, 'returns': returns, 'positions': positions, 'benchmark': benchmark}
+    
+    meta['strategies'] = strategies
+    return meta
+
+
+def snapshot_is_current(snapshot: dict, registry: dict, today, fingerprint: str = None) -> bool:
+    """현재 레지스트리 / 기준일 (fingerprint를 주면 데이터 파일 지문까지)과 일치하는 스냅샷인지"""
+    return (
+        snapshot is not None
+        and snapshot.get('registry_hash') == registry_hash(registry)
+        and snapshot.get('as_of') == today.isoformat()
+        and (fingerprint is None or snapshot.get('data_fingerprint') == fingerprint)
+    )
@@ -0,0 +1,221 @@
+"""
+전략 백테스트 커널
+- compute_series_indicators: 시리즈 하나에 필요한 지표를 지표 캐시를 통해 조회 (실행기 태스크)
+- evaluate_*: 전략 종류(kind)별 신호 → 포지션 → 수익률 (벡터 연산), evaluate_leg: leg 단위 실행기 태스크
+  같은 봉 수익률(close.pct_change)로 Buy & Hold 수익률도 함께 반환 → 벤치마크 비교에 재로드 / 재계산 없음
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.dsl import run_program
+from core.indicator_cache import INDICATOR_CACHE, series_fingerprint
+from core.profiling import timed
+from core.timebase import align_to_base
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 지표 계산 (시리즈 단위)
+# ════════════════════════════════════════════════════════════════════════════════
+
+def compute_series_indicators(frames: dict, config: dict) -> pd.DataFrame:
+    """시리즈 하나의 지표 노드 전부 계산 → 노드별 컬럼 DataFrame
+    
+    config['nodes']: [(node_id, indicator, params), ...]
+    - ('ma', (column, period))       → 컬럼 node_id
+    - ('stoch', (period, k, d))      → 컬럼 node_id.k, node_id.d
+    """
+    data = frames.get('data')
+    if data is None:
+        return None
+    
+    fingerprint = series_fingerprint(data)
+    out = {}
+    for node_id, indicator, params in config['nodes']:
+        if indicator == 'ma':
+            column, period = params
+            out[node_id] = INDICATOR_CACHE.ma(fingerprint, data, column, period)
+        elif indicator == 'stoch':
+            out[f'{node_id}.k'], out[f'{node_id}.d'] = INDICATOR_CACHE.stochastic(fingerprint, data, *params)
+        else:
+            raise ValueError(f"Unknown indicator: {indicator}")
+    
+    return pd.DataFrame(out, index=data.index)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 전략 종류별 커널
+# ════════════════════════════════════════════════════════════════════════════════
+
+def evaluate_ma_vote(leg: dict, options: dict, frames: dict, indicators: dict):
+    """MA 투표형 (TQQQ Sniper)
+    
+    K>D: 전체 MA 중 종가가 위에 있는 비율만큼 보유
+    K<D: bear_ma_periods 중 종가가 위에 있는 비율만큼 보유
+    반환: (strategy_return, position, buy_and_hold_return) 또는 None
+    """
+    series = leg['series']['data']
+    data = frames.get(series)
+    ind = indicators.get(series)
+    params = leg['params']
+    
+    if data is None or ind is None or len(data) < options['min_bars']:
+        return None
+    
+    stoch_id = leg['refs']['stoch']
+    df = data.copy()
+    df['stoch_k'] = ind[f'{stoch_id}.k']
+    df['stoch_d'] = ind[f'{stoch_id}.d']
+    for period, node_id in leg['refs']['ma'].items():
+        df[f'ma{period}'] = ind[node_id]
+    
+    df = df.dropna()
+    if len(df) < 50:
+        return None
+    
+    close = df['close']
+    bull_votes = sum((close > df[f'ma{p}']).astype(int) for p in params['ma_periods'])
+    bear_votes = sum((close > df[f'ma{p}']).astype(int) for p in params['bear_ma_periods'])
+    is_bullish = df['stoch_k'] > df['stoch_d']
+    
+    position = pd.Series(
+        np.where(is_bullish,
+                 bull_votes * (1 / len(params['ma_periods'])),
+                 bear_votes * (1 / len(params['bear_ma_periods']))),
+        index=df.index,
+    )
+    
+    price_return = close.pct_change()
+    strategy_return = (position.shift(1) * price_return).fillna(0)
+    return strategy_return, position, price_return.fillna(0)
+
+
+def evaluate_ma_stoch_gate(leg: dict, options: dict, frames: dict, indicators: dict):
+    """시가 > MA AND K > D 게이트형 (Bitget, 업비트)
+    
+    stoch 시리즈가 MA 시리즈와 다른 봉 간격이면 UTC 시각을 그 간격으로 내려 매핑 (예: 업비트 1D 스토캐스틱 → 그 일봉에 속한 4H 봉)
+    반환: (strategy_return, position, buy_and_hold_return) 또는 None (Buy & Hold는 레버리지 없음)
+    """
+    ma_series = leg['series']['ma']
+    stoch_series = leg['series']['stoch']
+    params = leg['params']
+    
+    data = frames.get(ma_series)
+    ma_ind = indicators.get(ma_series)
+    stoch_ind = indicators.get(stoch_series)
+    
+    if data is None or ma_ind is None or stoch_ind is None or len(data) < params['ma'] + options['min_extra_bars']:
+        return None
+    
+    stoch_id = leg['refs']['stoch']
+    df = data.copy()
+    df['ma'] = ma_ind[leg['refs']['ma']]
+    
+    if stoch_series == ma_series:
+        df['stoch_k'] = stoch_ind[f'{stoch_id}.k']
+        df['stoch_d'] = stoch_ind[f'{stoch_id}.d']
+    else:
+        with timed('date_mapping'):
+            for column in ('k', 'd'):
+                df[f'stoch_{column}'] = align_to_base(
+                    stoch_ind[f'{stoch_id}.{column}'].to_numpy(dtype=np.float64), stoch_ind.index, df.index, stoch_series[2]
+                )
+    
+    df = df.dropna()
+    if len(df) < 50:
+        return None
+    
+    signal = (df['open'] > df['ma']) & (df['stoch_k'] > df['stoch_d'])
+    position = signal.astype(float) * params.get('leverage', 1)
+    price_return = df['close'].pct_change()
+    strategy_return = position.shift(1) * price_return
+    if options.get('clip_lower') is not None:
+        strategy_return = strategy_return.clip(lower=options['clip_lower'])
+    
+    return strategy_return.fillna(0), position, price_return.fillna(0)
+
+
+def evaluate_expr(leg: dict, options: dict, frames: dict, indicators: dict):
+    """표현식형 (core.dsl로 컴파일된 포지션 식)
+    
+    - 기준 시리즈보다 긴 간격의 값은 기준 봉 UTC 시각을 그 간격으로 내려 매핑 (1D → 4H는 UTC 날짜 기준)
+    - 결측 행(지표 준비 전) 제거 후 노드 그래프를 NumPy 배열로 한 번 평가
+    - 최소 봉 수: max(min_bars, 기준 시리즈 최장 MA + min_extra_bars)
+    반환: (strategy_return, position, buy_and_hold_return) 또는 None
+    """
+    program = leg['program']
+    base = leg['series']['price']
+    data = frames.get(base)
+    
+    if data is None or len(data) < max(options['min_bars'], program['base_ma'] + options['min_extra_bars']):
+        return None
+    
+    leaves = {}
+    for key, (kind, series, name) in program['leaves'].items():
+        source = frames.get(series) if kind == 'column' else indicators.get(series)
+        if source is None:
+            return None
+        if series == base:
+            leaves[key] = source[name].to_numpy(dtype=np.float64)
+        else:
+            with timed('date_mapping'):
+                leaves[key] = align_to_base(source[name].to_numpy(dtype=np.float64), source.index, data.index, series[2])
+    
+    # 결측 행 제거 (기준 시리즈 컬럼 + 사용한 값 모두 있는 봉만)
+    valid = data.notna().all(axis=1).to_numpy()
+    for values in leaves.values():
+        valid = valid & ~np.isnan(values)
+    if valid.sum() < 50:
+        return None
+    
+    index = data.index[valid]
+    position = run_program(program, {key: values[valid] for key, values in leaves.items()}, len(index))
+    close = data['close'].to_numpy(dtype=np.float64)[valid]
+    
+    price_return = np.full(len(close), np.nan)
+    price_return[1:] = close[1:] / close[:-1] - 1
+    strategy_return = np.full(len(close), np.nan)
+    strategy_return[1:] = position[:-1] * price_return[1:]
+    if options.get('clip_lower') is not None:
+        strategy_return = np.where(strategy_return < options['clip_lower'], options['clip_lower'], strategy_return)
+    
+    return (
+        pd.Series(np.where(np.isnan(strategy_return), 0.0, strategy_return), index=index),
+        pd.Series(position, index=index),
+        pd.Series(np.where(np.isnan(price_return), 0.0, price_return), index=index),
+    )
+
+
+def evaluate_leg(frames: dict, config: dict) -> pd.DataFrame:
+    """leg 하나의 커널 실행 (실행기 태스크)
+    
+    frames: {('data', series): OHLCV, ('indicators', series): 지표 DataFrame} - leg가 쓰는 시리즈만
+    config: {'kind', 'leg', 'options'}
+    반환: return / position / hold 컬럼 DataFrame (커널의 세 시리즈는 같은 인덱스) 또는 None
+    """
+    data, indicators = {}, {}
+    for (role, series), df in frames.items():
+        (data if role == 'data' else indicators)[series] = df
+    
+    out = KERNELS[config['kind']](config['leg'], config['options'], data, indicators)
+    if out is None:
+        return None
+    strategy_return, position, hold = out
+    return pd.DataFrame({'return': strategy_return, 'position': position, 'hold': hold})
+
+
+def benchmark_returns(legs: dict, portfolio_return: pd.Series) -> pd.DataFrame:
+    """심볼별 Buy & Hold 수익률 → 벤치마크 프레임
+    
+    - 심볼별 컬럼 + portfolio_return (동일 비중 바스켓, 전략 포트폴리오와 같은 방식: 봉마다 심볼 평균)
+    - excess_return: 전략 포트폴리오 - 바스켓 (봉 단위)
+    """
+    bench = pd.DataFrame(legs).reindex(portfolio_return.index).fillna(0)
+    bench['portfolio_return'] = bench.mean(axis=1)
+    bench['excess_return'] = portfolio_return - bench['portfolio_return']
+    return bench
+
+
+KERNELS = {
+    'ma_vote': evaluate_ma_vote,
+    'ma_stoch_gate': evaluate_ma_stoch_gate,
+    'expr': evaluate_expr,
+}
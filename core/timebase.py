@@ -0,0 +1,104 @@
+"""
+시간 모델: 저장 / 계산은 UTC epoch int64, 소스 시간대는 유니버스 메타데이터로 선언
+- timezone: 소스가 봉 시각을 표기하는 시간대 (IANA 이름 - 업비트 Asia/Seoul, Binance UTC, TQQQ America/New_York)
+- grid: 봉 경계 기준 시계 - utc (기본, 거래소 캔들이 UTC 격자: 업비트 KST 09시 일봉 / 01·05·09…시 4H 포함)
+  / local (현지 날짜 - 미국 주식 일봉은 거래일 자정)
+- CSV: timestamp 열(UTC epoch 초) + 현지 시각 문자열 열(datetime / date, 사람이 읽는 용도)
+  → 로드 시 timestamp만 읽음 (문자열 날짜 파싱 없음), 문자열만 있는 구 형식은 업데이터가 한 번 변환
+- 메모리: naive DatetimeIndex = UTC (유니버스가 달라도 같은 시계 → 교차 거래소 정렬 / 일 단위 집계 / 기간 필터가 그대로 맞음)
+- 변환: pandas tz 연산 / 정수 연산으로 배열 전체를 한 번에 (행 단위 반복문 없음)
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.bars import INTERVAL_SECONDS
+
+EPOCH_COLUMN = 'timestamp'
+
+GRIDS = ('utc', 'local')
+
+DAY = pd.Timedelta(days=1)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 소스 시간대
+# ════════════════════════════════════════════════════════════════════════════════
+
+def universe_clock(universe: dict) -> tuple:
+    """유니버스 → (timezone, grid)"""
+    return universe.get('timezone', 'UTC'), universe.get('grid', 'utc')
+
+
+def epoch_index(seconds: np.ndarray) -> pd.DatetimeIndex:
+    """UTC epoch 초 배열 → naive UTC DatetimeIndex 'datetime' (결측 NaN은 NaT)"""
+    seconds = np.asarray(seconds)
+    if seconds.dtype.kind == 'f':
+        return pd.DatetimeIndex(pd.to_datetime(seconds, unit='s'), name='datetime').as_unit('s')
+    return pd.DatetimeIndex(seconds.astype(np.int64).astype('M8[s]'), name='datetime')
+
+
+def to_epoch(index: pd.DatetimeIndex) -> np.ndarray:
+    """naive UTC DatetimeIndex → UTC epoch 초 (int64)"""
+    return index.as_unit('s').asi8
+
+
+def localize(index: pd.DatetimeIndex, timezone: str) -> pd.DatetimeIndex:
+    """소스 시각 → naive UTC (naive면 timezone 현지 시각으로 해석, tz-aware면 그대로 변환)
+    
+    서머타임 전환으로 없거나 두 번 있는 현지 시각은 NaT (무결성 검증에서 시각 누락으로 잡힘)
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        if timezone == 'UTC':
+            return index.rename('datetime')
+        index = index.tz_localize(timezone, ambiguous='NaT', nonexistent='NaT')
+    return index.tz_convert('UTC').tz_localize(None).rename('datetime')
+
+
+def to_local(index: pd.DatetimeIndex, timezone: str) -> pd.DatetimeIndex:
+    """naive UTC → naive 현지 시각 (CSV 표기 / 현지 격자 검사용)"""
+    if timezone == 'UTC':
+        return index
+    return index.tz_localize('UTC').tz_convert(timezone).tz_localize(None).rename(index.name)
+
+
+def grid_times(index: pd.DatetimeIndex, timezone: str, grid: str) -> pd.DatetimeIndex:
+    """봉 경계를 검사할 시계의 시각 (utc: 그대로, local: 현지 시각)"""
+    return to_local(index, timezone) if grid == 'local' else index
+
+
+def parse_local_times(values, timezone: str) -> pd.DatetimeIndex:
+    """현지 시각 문자열 → naive UTC (구 형식 CSV 변환 / 검증 전용 - 로드 경로에서는 쓰지 않음)"""
+    return localize(pd.DatetimeIndex(pd.to_datetime(values, errors='coerce')), timezone)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 📌 기간 / 정렬
+# ════════════════════════════════════════════════════════════════════════════════
+
+def date_bounds(start, end) -> tuple:
+    """UTC 날짜 구간 [start, end] (양 끝 포함) → [시작 자정, 종료 다음 날 자정) Timestamp"""
+    return pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize() + DAY
+
+
+def date_slice(obj, start, end):
+    """정렬된 UTC 인덱스의 DataFrame / Series에서 날짜 구간 [start, end] 행 (이진 탐색, 복사 없음)"""
+    lo, hi = date_bounds(start, end)
+    index = obj.index
+    return obj.iloc[index.searchsorted(lo, 'left'):index.searchsorted(hi, 'left')]
+
+
+def align_to_base(values: np.ndarray, index, base_index, interval: str) -> np.ndarray:
+    """긴 간격 시리즈 값 → 기준 봉 (기준 봉 UTC 시각을 interval로 내린 시각의 값, 같은 시각은 마지막 값)
+    
+    업비트 1D(KST 09시 = UTC 00시 시작) → 4H: 4H 봉이 속한 업비트 일봉에 매핑
+    """
+    step = INTERVAL_SECONDS[interval] * 10**9
+    source = index.as_unit('ns').asi8 // step
+    target = base_index.as_unit('ns').asi8 // step
+    
+    # 같은 버킷이 여러 번이면 마지막 값
+    last = np.r_[source[1:] != source[:-1], True]
+    source, values = source[last], values[last]
+    position = np.searchsorted(source, target)
+    found = (position < len(source)) & (source[np.minimum(position, len(source) - 1)] == target)
+    return np.where(found, values[np.minimum(position, len(source) - 1)], np.nan)
@@ -0,0 +1,554 @@
+"""
+================================================================================
+⏱️ 성능 벤치마크
+================================================================================
+사용법:
+    python scripts/benchmark.py executor [--symbols 20 50 100] [--rows 8000] [--workers 1 2 4]
+    python scripts/benchmark.py imports [--repeat 5]
+    python scripts/benchmark.py simulate [--repeat 5]
+    python scripts/benchmark.py resample [--rows 8000] [--symbols 23]
+    python scripts/benchmark.py risk [--legs 24 100 200] [--days 1100] [--window 60] [--step 5]
+    python scripts/benchmark.py sessions [--sessions 1 4 8 16] [--engines vectorized event]
+    python scripts/benchmark.py ingest [--rows 2000000] [--new-rows 500000] [--page 200]
+    python scripts/benchmark.py alerts [--repeat 5]
+    python scripts/benchmark.py dsl [--repeat 3] [--variants 50]
+    python scripts/benchmark.py timeload [--repeat 5]
+================================================================================
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.alerts import MemorySink, latest_signals, run_alerts, write_signal_state
+from core.dsl import as_expression
+from core.executor import shutdown_pools
+from core.bars import read_bars, resample_ohlcv, write_bars
+from core.data import get_data_path, read_csv_data, read_universe_bars
+from core.indicator_cache import INDICATOR_CACHE
+from core.plan import compile_plan, evaluate_plan
+from core.registry import load_registry, universe_files
+from core.result_store import ResultStore, result_key
+from core.risk import compute_risk, rolling_correlations
+from core.simulator import simulate_plan, cross_check
+from core.timebase import parse_local_times, universe_clock
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 합성 데이터
+# ════════════════════════════════════════════════════════════════════════════════
+
+def make_ohlcv(rows: int, freq: str = '4h', seed: int = 0) -> pd.DataFrame:
+    """랜덤워크 OHLCV 생성"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    index = pd.date_range('2015-01-01', periods=rows, freq=freq)
+    
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(1e3, 1e6, rows),
+    }, index=index)
+
+
+def make_upbit_registry(n_symbols: int, rows: int) -> tuple:
+    """업비트 형태(MA 4H + Stoch 1D) 합성 레지스트리 + 프레임"""
+    symbols = [f'KRW-SYM{i:04d}' for i in range(n_symbols)]
+    universe = {'source': 'upbit', 'quote': 'KRW', 'intervals': ['4h', '1d'], 'file': 'upbit_{name}_{interval}.csv', 'symbols': symbols}
+    strategy = {
+        'kind': 'ma_stoch_gate', 'universe': 'upbit', 'ma_interval': '4h', 'stoch_interval': '1d',
+        'min_extra_bars': 10, 'defaults': {'leverage': 1},
+        'symbols': {
+            symbol: {'ma': 50 + (i * 7) % 230, 'stoch': [50 + (i % 4) * 10, 20 + (i % 3) * 5, 5]}
+            for i, symbol in enumerate(symbols)
+        },
+    }
+    registry = {'universes': {'upbit': universe}, 'strategies': {'upbit': strategy}}
+    
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        frames[('upbit', symbol, '4h')] = make_ohlcv(rows, '4h', seed=i)
+        frames[('upbit', symbol, '1d')] = make_ohlcv(rows // 6 + 1, '1D', seed=10_000 + i)
+    return registry, frames
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 벤치마크
+# ════════════════════════════════════════════════════════════════════════════════
+
+def bench_executor(symbol_counts: list, rows: int, worker_counts: list, repeat: int):
+    """심볼 수 × 실행 방식별 소요 시간"""
+    print(f"{'symbols':>8} {'mode':>8} {'workers':>8} {'seconds':>10} {'speedup':>8}")
+    
+    for n_symbols in symbol_counts:
+        registry, frames = make_upbit_registry(n_symbols, rows)
+        plan = compile_plan(registry)
+        baseline = None
+        
+        runs = [('serial', 1)] + [(mode, w) for mode in ('thread', 'process') for w in worker_counts]
+        for mode, workers in runs:
+            # 첫 호출은 풀 기동 비용 제외용 워밍업
+            evaluate_plan(plan, frames, executor=mode, max_workers=workers)
+            
+            best = float('inf')
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                results = evaluate_plan(plan, frames, executor=mode, max_workers=workers)
+                best = min(best, time.perf_counter() - t0)
+            
+            assert results['upbit'] is not None
+            baseline = baseline or best
+            print(f"{n_symbols:>8} {mode:>8} {workers:>8} {best:>10.3f} {baseline / best:>7.2f}x")
+    
+    shutdown_pools()
+
+
+# 측정 대상: (이름, import 전에 실행할 코드, import 대상 모듈)
+IMPORT_TARGETS = [
+    ('dashboard (app)', '', 'app'),
+    ('core.strategies', '', 'core.strategies'),
+    ('updater', "sys.path.insert(0, 'scripts')", 'update_data'),
+]
+
+
+def bench_imports(repeat: int):
+    """콜드 import 시간 (새 인터프리터, 인터프리터 기동 시간 제외)"""
+    print(f"{'target':<20} {'median_ms':>10} {'min_ms':>10}  heavy modules loaded")
+    
+    for name, setup, module in IMPORT_TARGETS:
+        code = (
+            "import sys, time\n"
+            f"{setup}\n"
+            "t0 = time.perf_counter()\n"
+            f"import {module}\n"
+            "dt = time.perf_counter() - t0\n"
+            "heavy = [m for m in ('streamlit', 'plotly', 'plotly.subplots', 'yfinance') if m in sys.modules]\n"
+            "print(dt, ','.join(heavy))\n"
+        )
+        samples = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+            dt, _, heavy = out.stdout.strip().splitlines()[-1].partition(' ')
+            samples.append(float(dt) * 1000)
+        
+        print(f"{name:<20} {statistics.median(samples):>10.1f} {min(samples):>10.1f}  {heavy or '-'}")
+
+
+def bench_simulate(repeat: int):
+    """실제 CSV 전체 심볼: 벡터화 vs 이벤트 기반 소요 시간 + 교차 검증"""
+    registry = load_registry()
+    plan = compile_plan(registry)
+    frames = {
+        (universe_id, symbol, interval): read_csv_data(filename)
+        for universe_id, universe in registry['universes'].items()
+        for symbol, interval, filename in universe_files(universe)
+    }
+    n_legs = sum(len(strategy['legs']) for strategy in plan['strategies'].values())
+    bars = sum(len(df) for df in frames.values() if df is not None)
+    print(f"{n_legs} symbols, {bars:,} bars loaded")
+    
+    vectorized, event = float('inf'), float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = evaluate_plan(plan, frames)
+        vectorized = min(vectorized, time.perf_counter() - t0)
+        
+        t0 = time.perf_counter()
+        simulate_plan(plan, frames, results)
+        event = min(event, time.perf_counter() - t0)
+    
+    print(f"{'vectorized':<12} {vectorized:>8.3f}s")
+    print(f"{'event':<12} {event:>8.3f}s")
+    print()
+    print(cross_check(plan, frames, results).to_string())
+
+
+def bench_resample(rows: int, n_symbols: int, repeat: int):
+    """4H CSV 로드 vs 인트라바(.npz, 4배 / 16배 행) 로드 + 4H 리샘플 - 심볼 n개 합계"""
+    print(f"{'source':<16} {'rows/symbol':>12} {'file_kb':>9} {'seconds':>9}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'bars_4h.csv')
+        make_ohlcv(rows, '4h').rename_axis('datetime').to_csv(csv_path)
+        
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(n_symbols):
+                df = pd.read_csv(csv_path)
+                df['datetime'] = pd.to_datetime(df['datetime'])
+                df.set_index('datetime', inplace=True)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{'csv 4h':<16} {rows:>12,} {os.path.getsize(csv_path) // 1024:>9,} {best:>9.3f}")
+        
+        for interval, factor in (('1h', 4), ('15m', 16)):
+            npz_path = os.path.join(tmp, f'bars_{interval}.npz')
+            write_bars(make_ohlcv(rows * factor, interval.replace('m', 'min')), npz_path)
+            
+            best = float('inf')
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                for _ in range(n_symbols):
+                    resample_ohlcv(read_bars(npz_path), '4h', interval)
+                best = min(best, time.perf_counter() - t0)
+            print(f"{'npz ' + interval + ' → 4h':<16} {rows * factor:>12,} {os.path.getsize(npz_path) // 1024:>9,} {best:>9.3f}")
+
+
+def bench_risk(leg_counts: list, days: int, window: int, step: int, repeat: int):
+    """리스크 탭 계산 (배치 행렬곱) vs 윈도우마다 DataFrame.corr() - 합성 일간 수익률 (공통 팩터 + 개별 노이즈)"""
+    print(f"{'legs':>6} {'matrices':>9} {'batched':>9} {'pandas':>9} {'corr_mb':>8}")
+    rng = np.random.default_rng(0)
+    
+    for n_legs in leg_counts:
+        index = pd.date_range('2023-01-01', periods=days, freq='D')
+        factor = rng.normal(0, 0.02, days)
+        values = rng.normal(0, 0.02, (days, n_legs)) + factor[:, None] * rng.uniform(0, 1.5, n_legs)
+        returns = pd.DataFrame(values, index=index, columns=[f'leg{i}' for i in range(n_legs)])
+        benchmark = pd.Series(factor, index=index)
+        weights = pd.Series(1 / n_legs, index=returns.columns)
+        
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            risk = compute_risk(returns, benchmark, weights, window=window, step=step)
+            best = min(best, time.perf_counter() - t0)
+        
+        t0 = time.perf_counter()
+        for end in range(window - 1, days, step):
+            returns.iloc[end - window + 1:end + 1].corr()
+        naive = time.perf_counter() - t0
+        
+        _, correlations = rolling_correlations(returns, window, step)
+        print(f"{n_legs:>6} {len(risk['dates']):>9} {best:>9.3f} {naive:>9.3f} {correlations.nbytes / 1024**2:>8.1f}")
+
+
+def bench_sessions(session_counts: list, engines: list, max_concurrent: int):
+    """동시 세션 N개 부하 테스트: 세션마다 로드 + 백테스트 vs 공유 결과 저장소 (single-flight)
+    
+    세션 i는 engines[i % len(engines)] 엔진으로 같은 시점에 요청 (Barrier)
+    지표 캐시는 시나리오마다 비움 (세션 간 지표 캐시 공유는 두 시나리오 모두 그대로)
+    """
+    registry = load_registry()
+    data_path = get_data_path()
+    
+    def backtest(engine):
+        frames = {
+            (universe_id, symbol, interval): read_universe_bars(universe, symbol, interval)
+            for universe_id, universe in registry['universes'].items()
+            for symbol, interval, _ in universe_files(universe)
+        }
+        plan = compile_plan(registry)
+        results = evaluate_plan(plan, frames)
+        if engine == 'event':
+            results = simulate_plan(plan, frames, results)
+        return results
+    
+    def run(n_sessions, request):
+        barrier = threading.Barrier(n_sessions)
+        latencies = [0.0] * n_sessions
+        
+        def session(i):
+            engine = engines[i % len(engines)]
+            barrier.wait()
+            t0 = time.perf_counter()
+            request(engine)
+            latencies[i] = time.perf_counter() - t0
+        
+        INDICATOR_CACHE.clear()
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - t0, latencies
+    
+    print(f"engines: {', '.join(engines)} / 동시 계산 상한 {max_concurrent}")
+    print(f"{'sessions':>8} {'mode':<10} {'wall_s':>8} {'p50_s':>8} {'max_s':>8} {'computed':>9} {'waited':>7}")
+    
+    for n_sessions in session_counts:
+        wall, latencies = run(n_sessions, backtest)
+        print(f"{n_sessions:>8} {'isolated':<10} {wall:>8.2f} {statistics.median(latencies):>8.2f} {max(latencies):>8.2f} {n_sessions:>9} {0:>7}")
+        
+        store = ResultStore(max_concurrent=max_concurrent)
+        wall, latencies = run(n_sessions, lambda engine: store.get_or_compute(
+            result_key(registry, data_path, engine), lambda: backtest(engine)
+        ))
+        stats = store.stats()
+        print(f"{n_sessions:>8} {'shared':<10} {wall:>8.2f} {statistics.median(latencies):>8.2f} {max(latencies):>8.2f} {stats['misses']:>9} {stats['waits']:>7}")
+
+
+def bench_ingest(rows: int, new_rows: int, page: int, chunk_rows: int):
+    """업데이터 수집 메모리: 기존 방식 (전체 로드 + 페이지 누적 + concat + 전체 저장) vs 스트리밍 (청크 추가)
+    
+    합성 15분봉 CSV / .npz (rows행)에 new_rows행을 page행 단위 페이지로 (최신 → 과거, 업비트 순서) 추가
+    peak_mb: tracemalloc 최대 할당량 (numpy / pandas 버퍼 포함)
+    """
+    sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+    from update_data import ingest, last_saved_time
+    
+    history = make_ohlcv(rows + new_rows, '15min').rename_axis('datetime')
+    last_complete = history.index[-1]
+    
+    def pages():
+        new = history.iloc[rows:]
+        for end in range(len(new), 0, -page):
+            yield new.iloc[max(end - page, 0):end]
+    
+    def legacy(filepath):
+        if filepath.endswith('.npz'):
+            existing = read_bars(filepath)
+        else:
+            existing = pd.read_csv(filepath)
+            existing['datetime'] = pd.to_datetime(existing['datetime'])
+            existing.set_index('datetime', inplace=True)
+        new = pd.concat(list(pages())).sort_index()
+        combined = pd.concat([existing, new])
+        combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        if filepath.endswith('.npz'):
+            write_bars(combined, filepath)
+        else:
+            combined.reset_index().to_csv(filepath, index=False)
+        return len(new)
+    
+    def streaming(filepath):
+        return ingest(pages(), filepath, last_saved_time(filepath), last_complete, chunk_rows=chunk_rows)
+    
+    print(f"existing {rows:,} rows + new {new_rows:,} rows (page {page}, chunk {chunk_rows:,})")
+    print(f"{'format':<7} {'mode':<10} {'seconds':>8} {'peak_mb':>8} {'file_mb':>8} {'added':>9}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ('csv', 'npz'):
+            for mode, run in (('legacy', legacy), ('streaming', streaming)):
+                filepath = os.path.join(tmp, f'bars_15m.{ext}')
+                if ext == 'npz':
+                    write_bars(history.iloc[:rows], filepath)
+                else:
+                    history.iloc[:rows].reset_index().to_csv(filepath, index=False)
+                
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                added = run(filepath)
+                elapsed = time.perf_counter() - t0
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                
+                print(f"{ext:<7} {mode:<10} {elapsed:>8.2f} {peak / 1024**2:>8.1f} {os.path.getsize(filepath) / 1024**2:>8.1f} {added:>9,}")
+
+
+def bench_alerts(repeat: int):
+    """최신 신호: 전체 기간 백테스트 vs 마지막 봉만 평가 (소요 시간 + 신호 일치) + 스텁 싱크로 알림 확인"""
+    registry = load_registry()
+    frames = {
+        (universe_id, symbol, interval): read_universe_bars(universe, symbol, interval)
+        for universe_id, universe in registry['universes'].items()
+        for symbol, interval, _ in universe_files(universe)
+    }
+    plan = compile_plan(registry)
+    
+    def full_signals():
+        results = evaluate_plan(plan, frames)
+        return {
+            f"{sid}/{leg['symbol']}": float(results[sid]['positions'][leg['name']].dropna().iloc[-1])
+            for sid, strategy in plan['strategies'].items() if results[sid] is not None
+            for leg in strategy['legs'] if leg['name'] in results[sid]['positions']
+        }
+    
+    timings = {}
+    for name, fn in (('full', full_signals), ('tail', lambda: latest_signals(plan, frames))):
+        runs = []
+        for _ in range(repeat):
+            INDICATOR_CACHE.clear()
+            t0 = time.perf_counter()
+            out = fn()
+            runs.append(time.perf_counter() - t0)
+        timings[name] = (min(runs), out)
+    
+    full, tail = timings['full'][1], timings['tail'][1]
+    matched = sum(1 for key, signal in tail.items() if full.get(key) == signal['position'])
+    print(f"{'mode':<6} {'best_s':>8}")
+    for name, (best, _) in timings.items():
+        print(f"{name:<6} {best:>8.3f}")
+    print(f"신호 일치: {matched}/{len(full)}")
+    
+    # 모든 심볼의 이전 포지션을 뒤집은 상태 → 심볼 수만큼 이벤트가 스텁 싱크에 도착해야 함
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, 'signals.json')
+        flipped = {key: {**signal, 'position': 0.0 if signal['position'] else 1.0} for key, signal in tail.items()}
+        write_signal_state(flipped, state_path)
+        sink = MemorySink()
+        events = run_alerts(plan, frames, state_path, [sink])
+        repeat_events = run_alerts(plan, frames, state_path, [sink])
+    print(f"스텁 싱크: {len(sink.events)}/{len(tail)} 이벤트, 재실행 {len(repeat_events)} 이벤트")
+    if events:
+        print(f"  예: {sink.messages[0]}")
+
+
+def bench_dsl(repeat: int, n_variants: int):
+    """표현식 전략: 기존 커널과 비트 단위 비교 + 소요 시간, 변형 N개 (MA 기간 스윕) 평가 시간"""
+    registry = load_registry()
+    frames = {
+        (universe_id, symbol, interval): read_universe_bars(universe, symbol, interval)
+        for universe_id, universe in registry['universes'].items()
+        for symbol, interval, _ in universe_files(universe)
+    }
+    expr_registry = {**registry, 'strategies': {sid: as_expression(s) for sid, s in registry['strategies'].items()}}
+    
+    def best_of(plan):
+        runs = []
+        for _ in range(repeat):
+            INDICATOR_CACHE.clear()
+            t0 = time.perf_counter()
+            results = evaluate_plan(plan, frames)
+            runs.append(time.perf_counter() - t0)
+        return min(runs), results
+    
+    hand_s, hand = best_of(compile_plan(registry))
+    expr_s, expr = best_of(compile_plan(expr_registry))
+    print(f"{'strategy':<10} {'legs':>5} {'bitwise':>8}")
+    for strategy_id, result in hand.items():
+        same = all(
+            result[part].index.equals(expr[strategy_id][part].index)
+            and np.array_equal(result[part].to_numpy().view(np.uint64), expr[strategy_id][part].to_numpy().view(np.uint64))
+            for part in ('returns', 'positions', 'benchmark')
+        )
+        print(f"{strategy_id:<10} {result['positions'].shape[1]:>5} {str(same):>8}")
+    print(f"kernel {hand_s:.3f}s / expr {expr_s:.3f}s (지표 캐시 비운 상태, 최소값)")
+    
+    # Bitget 게이트 변형: MA 기간 × 0.5 ~ 1.5 (지표 노드는 기간별로 공유)
+    base = expr_registry['strategies']['bitget']
+    variants = {}
+    for i, scale in enumerate(np.linspace(0.5, 1.5, n_variants)):
+        variants[f'v{i}'] = {
+            **base,
+            'symbols': {symbol: {**params, 'ma': max(2, int(params['ma'] * scale))} for symbol, params in base['symbols'].items()},
+        }
+    variant_plan = compile_plan({**registry, 'strategies': variants})
+    variant_s, _ = best_of(variant_plan)
+    print(f"변형 {n_variants}개 × {len(base['symbols'])}심볼: {variant_s:.3f}s ({variant_s / n_variants * 1000:.1f}ms/변형, "
+          f"지표 {variant_plan['unique']}/{variant_plan['requested']}개 계산)")
+
+
+def bench_timeload(repeat: int):
+    """레지스트리 CSV 전체 로드: 현지 시각 문자열 파싱 (+ UTC 변환) vs timestamp 열 (UTC epoch) - 인덱스 일치 확인"""
+    registry = load_registry()
+    files = [
+        (filename, universe_clock(universe)[0])
+        for universe in registry['universes'].values()
+        for _, _, filename in universe_files(universe)
+    ]
+    
+    def parse_strings(filename, timezone):
+        df = pd.read_csv(os.path.join(get_data_path(), filename))
+        df.columns = [c.lower() for c in df.columns]
+        labels = df.pop('date' if 'date' in df.columns else 'datetime')
+        df = df.drop(columns=[c for c in ('timestamp', 'datetime', 'date') if c in df.columns])
+        df.index = parse_local_times(labels, timezone)
+        return df
+    
+    def best_of(loader):
+        runs = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            frames = [loader(filename, timezone) for filename, timezone in files]
+            runs.append(time.perf_counter() - t0)
+        return min(runs), frames
+    
+    string_s, parsed = best_of(parse_strings)
+    epoch_s, loaded = best_of(read_csv_data)
+    same = sum(a.index.equals(b.index) and np.array_equal(a.to_numpy(), b.to_numpy()) for a, b in zip(parsed, loaded))
+    rows = sum(len(df) for df in loaded)
+    print(f"{len(files)} files, {rows:,} rows (인덱스 / 값 일치 {same}/{len(files)})")
+    print(f"{'string parse':<14} {string_s:>8.3f}s")
+    print(f"{'epoch column':<14} {epoch_s:>8.3f}s  ({string_s / epoch_s:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='트레이딩 대시보드 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    p_exec = sub.add_parser('executor', help='serial / thread / process 실행기 확장성')
+    p_exec.add_argument('--symbols', type=int, nargs='+', default=[20, 50, 100, 200])
+    p_exec.add_argument('--rows', type=int, default=8000)
+    p_exec.add_argument('--workers', type=int, nargs='+', default=[2, 4, os.cpu_count() or 1])
+    p_exec.add_argument('--repeat', type=int, default=3)
+    
+    p_imp = sub.add_parser('imports', help='대시보드 / core / 업데이터 콜드 import 시간')
+    p_imp.add_argument('--repeat', type=int, default=5)
+    
+    p_sim = sub.add_parser('simulate', help='이벤트 기반 시뮬레이터 소요 시간 + 벡터화 교차 검증')
+    p_sim.add_argument('--repeat', type=int, default=5)
+    
+    p_res = sub.add_parser('resample', help='CSV 로드 vs 인트라바 로드 + 리샘플')
+    p_res.add_argument('--rows', type=int, default=8000)
+    p_res.add_argument('--symbols', type=int, default=23)
+    p_res.add_argument('--repeat', type=int, default=3)
+    
+    p_risk = sub.add_parser('risk', help='롤링 상관 / 베타 / 위험 기여도 (leg 수별)')
+    p_risk.add_argument('--legs', type=int, nargs='+', default=[24, 100, 200])
+    p_risk.add_argument('--days', type=int, default=1100)
+    p_risk.add_argument('--window', type=int, default=60)
+    p_risk.add_argument('--step', type=int, default=5)
+    p_risk.add_argument('--repeat', type=int, default=3)
+    
+    p_sess = sub.add_parser('sessions', help='동시 세션 부하 테스트 (공유 결과 저장소 / single-flight)')
+    p_sess.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 8, 16])
+    p_sess.add_argument('--engines', nargs='+', default=['vectorized'], choices=['vectorized', 'event'])
+    p_sess.add_argument('--max-concurrent', type=int, default=2)
+    
+    p_ing = sub.add_parser('ingest', help='업데이터 수집 메모리 (기존 방식 vs 스트리밍)')
+    p_ing.add_argument('--rows', type=int, default=2_000_000)
+    p_ing.add_argument('--new-rows', type=int, default=500_000)
+    p_ing.add_argument('--page', type=int, default=200)
+    p_ing.add_argument('--chunk-rows', type=int, default=50_000)
+    
+    p_alert = sub.add_parser('alerts', help='최신 신호 평가 (전체 vs 마지막 봉) + 스텁 싱크 알림')
+    p_alert.add_argument('--repeat', type=int, default=5)
+    
+    p_dsl = sub.add_parser('dsl', help='표현식 전략 vs 기존 커널 (비트 단위 비교) + 변형 스윕')
+    p_dsl.add_argument('--repeat', type=int, default=3)
+    p_dsl.add_argument('--variants', type=int, default=50)
+    
+    p_time = sub.add_parser('timeload', help='CSV 로드: 시각 문자열 파싱 vs UTC epoch 열')
+    p_time.add_argument('--repeat', type=int, default=5)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'executor':
+        bench_executor(args.symbols, args.rows, sorted(set(args.workers)), args.repeat)
+    elif args.command == 'imports':
+        bench_imports(args.repeat)
+    elif args.command == 'simulate':
+        bench_simulate(args.repeat)
+    elif args.command == 'resample':
+        bench_resample(args.rows, args.symbols, args.repeat)
+    elif args.command == 'risk':
+        bench_risk(args.legs, args.days, args.window, args.step, args.repeat)
+    elif args.command == 'sessions':
+        bench_sessions(args.sessions, args.engines, args.max_concurrent)
+    elif args.command == 'ingest':
+        bench_ingest(args.rows, args.new_rows, args.page, args.chunk_rows)
+    elif args.command == 'alerts':
+        bench_alerts(args.repeat)
+    elif args.command == 'dsl':
+        bench_dsl(args.repeat, args.variants)
+    elif args.command == 'timeload':
+        bench_timeload(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta, timezone
 import os
+import shutil
+import sys
+import tempfile
 import requests
 import time
 import warnings
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bars import INTERVAL_SECONDS, OHLCV_COLUMNS, append_bars, read_bars, read_last_time, write_bars
+from core.integrity import CHECKS, read_manifest, registry_data_files, summarize, verify_files, write_manifest
+from core.registry import load_registry, data_filename, intrabar_filename, universe_files
+from core.timebase import EPOCH_COLUMN, localize, parse_local_times, to_epoch, to_local, universe_clock
+
 # 불필요한 FutureWarning 숨기기
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
@@ -15,25 +24,47 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 
-# Bitget 선물 코인 목록
-BITGET_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+# 실행 로그 (알림 파일 싱크 등) - 워크플로가 커밋하는 data/ 밖에 둠
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+
+# 코인 / 종목 목록은 strategies.json 유니버스에서 관리
+
+# 봉 간격별 캔들 길이
+INTERVAL_DELTAS = {interval: timedelta(seconds=seconds) for interval, seconds in INTERVAL_SECONDS.items()}
 
-# 업비트 코인 목록
-UPBIT_SYMBOLS = [
-    'KRW-ADA', 'KRW-ANKR', 'KRW-AVAX', 'KRW-AXS', 'KRW-BCH',
-    'KRW-BTC', 'KRW-CRO', 'KRW-DOGE', 'KRW-ETH', 'KRW-HBAR',
-    'KRW-IMX', 'KRW-MANA', 'KRW-MVL', 'KRW-SAND', 'KRW-SOL',
-    'KRW-THETA', 'KRW-VET', 'KRW-WAXP', 'KRW-XLM', 'KRW-XRP'
-]
+# CSV 현지 시각 표기 형식 (pandas 자동 형식은 자정 봉만 있는 청크에서 시각을 생략 → 한 파일 안에 형식이 섞임)
+# 일봉 파일(date_col: date)은 datetime 열도 날짜만 표기
+LABEL_FORMATS = {
+    'datetime': '%Y-%m-%d %H:%M:%S',
+    'date': '%Y-%m-%d',
+}
+
+# 스트리밍 수집: 메모리에 모아 두는 최대 행 수 (넘으면 임시 청크 파일로 내보냄)
+INGEST_CHUNK_ROWS = 50_000
+
+# 업비트 캔들 API 경로
+UPBIT_ENDPOINTS = {
+    '15m': 'minutes/15',
+    '1h': 'minutes/60',
+    '4h': 'minutes/240',
+    '1d': 'days',
+}
 
 # ════════════════════════════════════════════════════════════════════════════════
 # 유틸리티 함수
 # ════════════════════════════════════════════════════════════════════════════════
 
-def get_last_completed_candle_time(interval: str) -> datetime:
-    """완료된 마지막 캔들 시간 계산 (UTC 기준)"""
+def get_last_completed_candle_time(interval: str, tz: str = 'UTC', grid: str = 'utc') -> datetime:
+    """완료된 마지막 캔들 시작 시각 (UTC 기준)
+    
+    grid local 일봉 (미국 주식): UTC 어제 날짜의 현지 자정 (장 마감이 같은 UTC 날짜 안)
+    """
     now = datetime.now(timezone.utc)
     
+    if interval == '1d' and grid == 'local':
+        last_date = (now - timedelta(days=1)).date()
+        return localize(pd.DatetimeIndex([last_date]), tz)[0].to_pydatetime().replace(tzinfo=timezone.utc)
+    
     if interval == '1d':
         # 일봉: 어제까지 완료
         last_complete = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
@@ -43,85 +74,235 @@ def get_last_completed_candle_time(interval: str) -> datetime:
         current_hour = now.hour
         last_candle_hour = (current_hour // 4) * 4
         last_complete = now.replace(hour=last_candle_hour, minute=0, second=0, microsecond=0) - timedelta(hours=4)
+    elif interval in INTERVAL_SECONDS:
+        # 분/시간봉 (인트라바): 진행 중인 캔들 직전 캔들
+        step = INTERVAL_SECONDS[interval]
+        current_start = int(now.timestamp()) // step * step
+        last_complete = datetime.fromtimestamp(current_start - step, timezone.utc)
     else:
         last_complete = now - timedelta(hours=1)
     
     return last_complete
 
 
-def load_existing_csv(filepath: str) -> pd.DataFrame:
-    """기존 CSV 파일 로드"""
+def read_last_csv_time(filepath: str, tz: str = 'UTC') -> pd.Timestamp:
+    """CSV 마지막 행 시각 (naive UTC, 헤더와 파일 끝 4KB만 읽음, 없으면 None)
+    
+    timestamp 열이 있으면 그 값, 없으면 (구 형식) 현지 시각 문자열을 tz로 해석
+    """
     if not os.path.exists(filepath):
         return None
     
-    try:
-        df = pd.read_csv(filepath)
-        
-        # datetime 컬럼 처리
-        if 'date' in df.columns:
-            df['datetime'] = pd.to_datetime(df['date'])
-        elif 'datetime' in df.columns:
-            df['datetime'] = pd.to_datetime(df['datetime'])
+    with open(filepath, 'rb') as f:
+        header = f.readline().decode().strip().split(',')
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - 4096, 0))
+        lines = f.read().decode(errors='ignore').strip().splitlines()
+    
+    # 시각이 비어 있는 행은 건너뜀 (마지막 유효 행 기준)
+    epoch = EPOCH_COLUMN in header
+    position = header.index(EPOCH_COLUMN if epoch else 'date' if 'date' in header else 'datetime')
+    for line in reversed(lines):
+        fields = line.split(',')
+        if len(fields) != len(header) or fields == header or not fields[position]:
+            continue
+        
+        if epoch:
+            return pd.Timestamp(int(float(fields[position])), unit='s')
+        return localize(pd.DatetimeIndex([pd.Timestamp(fields[position])]), tz)[0]
+    
+    return None
+
+
+def last_saved_time(filepath: str, tz: str = 'UTC') -> pd.Timestamp:
+    """저장된 마지막 봉 시각 (naive UTC, .npz 인트라바 / CSV) - 파일 전체를 읽지 않음"""
+    if filepath.endswith('.npz'):
+        return read_last_time(filepath)
+    return read_last_csv_time(filepath, tz)
+
+
+def migrate_csv(filepath: str, tz: str = 'UTC') -> bool:
+    """구 형식 CSV (현지 시각 문자열만)에 timestamp 열(UTC epoch 초)을 맨 앞에 추가 (임시 파일에 쓴 뒤 교체)
+    
+    - 시각 표기가 비어 있는 행은 삭제하고 출력 (시계열에 놓을 수 없고, 마지막 행이면 다음 수집 시작 시각을 잃음
+      - 예: yfinance가 장중 부분 봉을 날짜 없이 돌려준 행)
+    - 표기는 있는데 해석할 수 없는 행은 그대로 두어 검증(시각 누락)에서 잡힘
+    이미 timestamp 열이 있으면 그대로, 반환: 변환 여부
+    """
+    if not os.path.exists(filepath):
+        return False
+    with open(filepath, 'rb') as f:
+        header = f.readline().decode().strip().split(',')
+    if EPOCH_COLUMN in header:
+        return False
+    
+    df = pd.read_csv(filepath, dtype=str, keep_default_na=False)
+    date_col = 'date' if 'date' in header else 'datetime'
+    untimed = (df[date_col].str.strip() == '').to_numpy()
+    if untimed.any():
+        print(f"  🧹 {os.path.basename(filepath)}: dropped {int(untimed.sum())} rows without a time label")
+        df = df[~untimed]
+    index = parse_local_times(df[date_col], tz)
+    epoch = pd.array(index.as_unit('s').asi8, dtype='Int64')
+    epoch[index.isna()] = pd.NA
+    df.insert(0, EPOCH_COLUMN, epoch)
+    
+    tmp = filepath + '.tmp'
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, filepath)
+    return True
+
+
+def append_csv(filepath: str, chunk_paths: list, date_col: str = 'datetime', tz: str = 'UTC') -> int:
+    """청크(.npz)들을 CSV 끝에 추가 (기존 내용은 읽지 않고 복사, 임시 파일에 쓴 뒤 교체)
+    
+    기존 헤더의 컬럼 순서를 따르고, timestamp 열에는 UTC epoch 초, 날짜 컬럼(datetime / date)에는 tz 현지 시각을 씀
+    (LABEL_FORMATS로 형식 고정 - 청크 내용과 관계없이 같은 형식)
+    기존 마지막 시각 이하 / 앞 청크와 겹치는 봉은 버림 (구 형식 파일은 먼저 timestamp 열 추가)
+    """
+    tmp = filepath + '.tmp'
+    migrate_csv(filepath, tz)
+    last = read_last_csv_time(filepath, tz)
+    
+    if os.path.exists(filepath):
+        with open(filepath, 'rb') as f:
+            header = f.readline().decode().strip().split(',')
+        shutil.copyfile(filepath, tmp)
+        with open(tmp, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        write_header = False
+    else:
+        header = [EPOCH_COLUMN, date_col] + OHLCV_COLUMNS
+        write_header = True
+    
+    added = 0
+    with open(tmp, 'a', newline='') as f:
+        for path in sorted(chunk_paths, key=read_last_time):
+            chunk = read_bars(path)
+            if last is not None:
+                chunk = chunk[chunk.index > last]
+            if len(chunk) == 0:
+                continue
+            
+            local = to_local(chunk.index, tz)
+            labels = {col: local.strftime(LABEL_FORMATS['date' if date_col == 'date' else col]) for col in LABEL_FORMATS}
+            out = pd.DataFrame({
+                col: to_epoch(chunk.index) if col == EPOCH_COLUMN else labels[col] if col in labels
+                else (chunk[col].to_numpy() if col in chunk else None)
+                for col in header
+            })
+            out.to_csv(f, header=write_header, index=False)
+            write_header = False
+            last = chunk.index[-1]
+            added += len(chunk)
+    
+    os.replace(tmp, filepath)
+    return added
+
+
+def ingest(pages, filepath: str, after, last_complete, date_col: str = 'datetime',
+           chunk_rows: int = INGEST_CHUNK_ROWS, tz: str = 'UTC') -> int:
+    """페이지 제너레이터 → 파일 끝에 추가 (스트리밍)
+    
+    - 페이지 / after / last_complete 시각은 모두 naive UTC (tz: CSV 현지 시각 표기용)
+    - 완료된 캔들(last_complete 이하) / 저장된 마지막 시각(after) 이후만
+    - chunk_rows 행마다 임시 청크 파일로 내보냄 → 메모리에는 청크 1개 분량만 유지
+    - 페이지 순서 무관 (업비트는 최신 → 과거), 청크는 시간순으로 정렬해 추가
+    반환: 추가된 행 수
+    """
+    with tempfile.TemporaryDirectory() as spill_dir:
+        chunk_paths, buffer = [], []
+        
+        def flush():
+            path = os.path.join(spill_dir, f'chunk_{len(chunk_paths):05d}.npz')
+            write_bars(pd.concat(buffer), path)
+            chunk_paths.append(path)
+            buffer.clear()
+        
+        for page in pages:
+            page = page[page.index <= last_complete]
+            if after is not None:
+                page = page[page.index > after]
+            if len(page) == 0:
+                continue
+            
+            buffer.append(page)
+            if sum(len(df) for df in buffer) >= chunk_rows:
+                flush()
         
-        df.set_index('datetime', inplace=True)
-        # 중요: CSV 데이터는 Timezone 정보 없이 로드 (Naive)
-        df.index = df.index.tz_localize(None)
+        if buffer:
+            flush()
+        if not chunk_paths:
+            return 0
         
-        return df
-    except Exception as e:
-        print(f"Error loading {filepath}: {e}")
-        return None
+        if filepath.endswith('.npz'):
+            added = append_bars(filepath, chunk_paths)
+        else:
+            added = append_csv(filepath, chunk_paths, date_col, tz)
+    
+    print(f"✅ Saved {added} new rows to {filepath}")
+    return added
 
 
-def save_csv(df: pd.DataFrame, filepath: str, date_col: str = 'datetime'):
-    """CSV 파일 저장"""
-    df_save = df.copy()
-    df_save = df_save.reset_index()
-    
-    # 컬럼명 정리
-    if 'index' in df_save.columns:
-        df_save = df_save.rename(columns={'index': date_col})
-    
-    # 중복 제거 (datetime 기준)
-    df_save = df_save.drop_duplicates(subset=[date_col], keep='last')
-    df_save = df_save.sort_values(date_col)
-    
-    df_save.to_csv(filepath, index=False)
-    print(f"✅ Saved {len(df_save)} rows to {filepath}")
+def remove_stale_temp_files() -> int:
+    """중단된 이전 실행이 남긴 임시 파일(*.tmp, *.tmp.npz) 삭제 (커밋에 섞이지 않도록)"""
+    removed = 0
+    for filename in os.listdir(DATA_DIR):
+        if filename.endswith(('.tmp', '.tmp.npz')):
+            os.remove(os.path.join(DATA_DIR, filename))
+            removed += 1
+    if removed:
+        print(f"🧹 Removed {removed} stale temp files")
+    return removed
 
 
-def merge_and_dedupe(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
-    """기존 데이터와 새 데이터 병합 및 중복 제거"""
-    if existing is None or len(existing) == 0:
-        return new
-    if new is None or len(new) == 0:
-        return existing
-    
-    combined = pd.concat([existing, new])
-    combined = combined[~combined.index.duplicated(keep='last')]
-    combined = combined.sort_index()
-    
-    return combined
+def migrate_time_columns(registry: dict) -> int:
+    """레지스트리의 구 형식 CSV에 timestamp 열 추가 (한 번만, 이후 로드는 문자열 파싱 없음)"""
+    migrated = 0
+    for universe in registry['universes'].values():
+        tz, _ = universe_clock(universe)
+        for _, _, filename in universe_files(universe):
+            migrated += migrate_csv(os.path.join(DATA_DIR, filename), tz)
+    if migrated:
+        print(f"🕒 Added UTC timestamp column to {migrated} CSV files")
+    return migrated
+
+
+def update_targets(universe: dict, symbol: str) -> list:
+    """심볼별 업데이트 대상 [(interval, filepath), ...]
+    
+    - intervals: CSV (derive_intervals면 인트라바에서 리샘플하므로 제외)
+    - intrabar: .npz
+    """
+    targets = []
+    if not universe.get('derive_intervals'):
+        targets += [(interval, os.path.join(DATA_DIR, data_filename(universe, symbol, interval))) for interval in universe['intervals']]
+    targets += [(interval, os.path.join(DATA_DIR, intrabar_filename(universe, symbol, interval))) for interval in universe.get('intrabar', [])]
+    return targets
 
 # ════════════════════════════════════════════════════════════════════════════════
 # TQQQ 데이터 업데이트 (yfinance)
 # ════════════════════════════════════════════════════════════════════════════════
 
-def update_tqqq():
+def update_tqqq(universe: dict):
     """TQQQ 일봉 데이터 업데이트"""
     print("\n📈 Updating TQQQ daily data...")
     
-    filepath = os.path.join(DATA_DIR, 'tqqq_daily.csv')
-    existing = load_existing_csv(filepath)
+    tz, grid = universe_clock(universe)
+    filepath = os.path.join(DATA_DIR, data_filename(universe, universe['symbols'][0], '1d'))
+    last_date = last_saved_time(filepath, tz)
     
-    # 마지막 완료된 캔들 시간 (UTC)
-    last_complete = get_last_completed_candle_time('1d')
+    # 마지막 완료된 캔들 시간 (거래일 현지 자정의 UTC 시각)
+    last_complete = get_last_completed_candle_time('1d', tz, grid)
     # 비교를 위해 Timezone 정보 제거 (Naive)
     last_complete = last_complete.replace(tzinfo=None)
     
     # 시작 날짜 결정
-    if existing is not None and len(existing) > 0:
-        last_date = existing.index.max()
+    if last_date is not None:
         start_date = last_date + timedelta(days=1)
         
         if start_date.date() > last_complete.date():
@@ -135,8 +316,8 @@ def update_tqqq():
         import yfinance as yf
         
         end_date = last_complete + timedelta(days=1)
-        # auto_adjust=False 추가하여 경고 해결 및 데이터 일관성 확보
-        data = yf.download('TQQQ', start=start_date, end=end_date, progress=False, auto_adjust=False)
+        # auto_adjust=False 추가하여 경고 해결 및 데이터 일관성 확보 (yfinance 날짜 인자는 거래일)
+        data = yf.download('TQQQ', start=start_date.date(), end=end_date.date(), progress=False, auto_adjust=False)
         
         if data.empty:
             print("  ⚠️ No new data available")
@@ -147,19 +328,16 @@ def update_tqqq():
             data.columns = data.columns.get_level_values(0)
         
         data.columns = [c.lower() for c in data.columns]
-        data.index = data.index.tz_localize(None)
-        data.index.name = 'datetime'
+        # 거래일 (naive면 현지 날짜로 해석) → UTC
+        data.index = localize(data.index, tz)
         
         # 필요한 컬럼만
         data = data[['open', 'high', 'low', 'close', 'volume']]
         
-        # 병합
-        combined = merge_and_dedupe(existing, data)
-        
-        # 저장
-        save_csv(combined, filepath, date_col='date')
-        print(f"  📊 TQQQ: {len(data)} new rows added")
-        
+        # 기존 파일 끝에 추가
+        added = ingest([data], filepath, last_date, last_complete, date_col=universe.get('date_col', 'datetime'), tz=tz)
+        print(f"  📊 TQQQ: {added} new rows added")
+    
     except Exception as e:
         print(f"  ❌ Error updating TQQQ: {e}")
 
@@ -167,11 +345,10 @@ def update_tqqq():
 # Bitget (Binance Futures) 데이터 업데이트
 # ════════════════════════════════════════════════════════════════════════════════
 
-def fetch_binance_futures(symbol: str, interval: str, start_time: datetime, end_time: datetime) -> pd.DataFrame:
-    """Binance Futures API에서 데이터 가져오기"""
+def iter_binance_futures(symbol: str, interval: str, start_time: datetime, end_time: datetime):
+    """Binance Futures API 페이지 제너레이터 (과거 → 최신, 페이지당 최대 1000봉)"""
     url = "https://fapi.binance.com/fapi/v1/klines"
     
-    all_data = []
     # Timezone 정보가 있다면 timestamp로 변환 시 고려됨
     current_start = int(start_time.replace(tzinfo=timezone.utc).timestamp() * 1000)
     end_ts = int(end_time.replace(tzinfo=timezone.utc).timestamp() * 1000)
@@ -193,82 +370,59 @@ def fetch_binance_futures(symbol: str, interval: str, start_time: datetime, end_
         if not data:
             break
         
-        all_data.extend(data)
-        current_start = data[-1][0] + 1
+        df = pd.DataFrame([row[:6] for row in data], columns=['timestamp'] + OHLCV_COLUMNS)
+        df.index = pd.DatetimeIndex(pd.to_datetime(df['timestamp'], unit='ms'), name='datetime')  # Naive (UTC)
+        yield df[OHLCV_COLUMNS].astype(float)
         
+        current_start = data[-1][0] + 1
         time.sleep(0.1)  # Rate limit
-    
-    if not all_data:
-        return None
-    
-    df = pd.DataFrame(all_data, columns=[
-        'timestamp', 'open', 'high', 'low', 'close', 'volume',
-        'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-        'taker_buy_quote', 'ignore'
-    ])
-    
-    df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df.set_index('datetime', inplace=True)
-    df.index = df.index.tz_localize(None) # Naive로 변환
-    
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        df[col] = df[col].astype(float)
-    
-    return df[['open', 'high', 'low', 'close', 'volume']]
 
 
-def update_bitget():
-    """Bitget (Binance Futures) 4H 데이터 업데이트"""
+def update_bitget(universe: dict):
+    """Bitget (Binance Futures) 4H (+ 인트라바) 데이터 업데이트"""
     print("\n🔶 Updating Bitget (Binance Futures) 4H data...")
     
-    last_complete = get_last_completed_candle_time('4h')
+    for symbol in universe['symbols']:
+        for interval, filepath in update_targets(universe, symbol):
+            update_bitget_symbol(symbol, interval, filepath)
+        
+        time.sleep(0.2)
+
+
+def update_bitget_symbol(symbol: str, interval: str, filepath: str):
+    """Bitget 심볼 하나 / 봉 간격 하나 업데이트"""
+    step = INTERVAL_DELTAS[interval]
+    last_complete = get_last_completed_candle_time(interval)
     # [수정] 비교 에러 방지를 위해 Timezone 제거 (Naive로 통일)
     last_complete = last_complete.replace(tzinfo=None)
     
-    for symbol in BITGET_SYMBOLS:
-        name = symbol.replace('USDT', '').lower()
-        filepath = os.path.join(DATA_DIR, f'bitget_{name}_4h.csv')
-        
-        existing = load_existing_csv(filepath)
+    last_date = last_saved_time(filepath)
+    
+    # 시작 시간 결정
+    if last_date is not None:
+        start_time = last_date + step
         
-        # 시작 시간 결정
-        if existing is not None and len(existing) > 0:
-            last_date = existing.index.max()
-            start_time = last_date + timedelta(hours=4)
-            
-            # 여기서 offset-naive vs offset-aware 에러가 발생했었음 -> 이제 둘 다 Naive라 해결됨
-            if start_time > last_complete:
-                print(f"  ℹ️ {symbol}: Already up to date")
-                continue
-        else:
-            # 새로 시작: 3년 전부터
-            start_time = last_complete - timedelta(days=365*3)
+        # 여기서 offset-naive vs offset-aware 에러가 발생했었음 -> 이제 둘 다 Naive라 해결됨
+        if start_time > last_complete:
+            print(f"  ℹ️ {symbol} {interval.upper()}: Already up to date")
+            return
+    else:
+        # 새로 시작: 3년 전부터
+        start_time = last_complete - timedelta(days=365*3)
+    
+    try:
+        # 페이지 단위로 받아 완료된 캔들만 파일 끝에 추가
+        pages = iter_binance_futures(symbol, interval, start_time, last_complete + step)
+        added = ingest(pages, filepath, last_date, last_complete)
         
-        try:
-            new_data = fetch_binance_futures(symbol, '4h', start_time, last_complete + timedelta(hours=4))
-            
-            if new_data is None or len(new_data) == 0:
-                print(f"  ⚠️ {symbol}: No new data")
-                continue
-            
-            # 완료된 캔들만 필터링
-            new_data = new_data[new_data.index <= last_complete]
-            
-            if len(new_data) == 0:
-                print(f"  ℹ️ {symbol}: No completed candles yet")
-                continue
-            
-            # 병합
-            combined = merge_and_dedupe(existing, new_data)
-            
-            # 저장
-            save_csv(combined, filepath)
-            print(f"  📊 {symbol}: {len(new_data)} new rows added")
-            
-        except Exception as e:
-            print(f"  ❌ Error updating {symbol}: {e}")
+        if added == 0:
+            print(f"  ⚠️ {symbol}: No new completed candles")
+            return
         
-        time.sleep(0.2)
+        print(f"  📊 {symbol} {interval.upper()}: {added} new rows added")
+    
+    except Exception as e:
+        print(f"  ❌ Error updating {symbol}: {e}")
 
 # ════════════════════════════════════════════════════════════════════════════════
 # 업비트 데이터 업데이트
@@ -276,12 +430,9 @@ def update_bitget():
 
 def fetch_upbit_ohlcv(market: str, interval: str, count: int = 200, to: str = None) -> pd.DataFrame:
     """업비트 API에서 OHLCV 데이터 가져오기"""
-    if interval == '4h':
-        url = "https://api.upbit.com/v1/candles/minutes/240"
-    elif interval == '1d':
-        url = "https://api.upbit.com/v1/candles/days"
-    else:
+    if interval not in UPBIT_ENDPOINTS:
         return None
+    url = f"https://api.upbit.com/v1/candles/{UPBIT_ENDPOINTS[interval]}"
     
     params = {'market': market, 'count': count}
     if to:
@@ -299,9 +450,9 @@ def fetch_upbit_ohlcv(market: str, interval: str, count: int = 200, to: str = No
     
     df = pd.DataFrame(data)
     
-    # 컬럼 매핑
+    # 컬럼 매핑 (봉 시각은 UTC 필드 사용 - KST 필드와 같은 봉)
     df = df.rename(columns={
-        'candle_date_time_kst': 'datetime',
+        'candle_date_time_utc': 'datetime',
         'opening_price': 'open',
         'high_price': 'high',
         'low_price': 'low',
@@ -316,12 +467,14 @@ def fetch_upbit_ohlcv(market: str, interval: str, count: int = 200, to: str = No
     return df[['open', 'high', 'low', 'close', 'volume']]
 
 
-def fetch_upbit_full(market: str, interval: str, start_time: datetime, end_time: datetime) -> pd.DataFrame:
-    """업비트에서 전체 기간 데이터 가져오기 (페이징)"""
-    all_data = []
-    to_time = end_time.strftime('%Y-%m-%dT%H:%M:%S')
+def iter_upbit_pages(market: str, interval: str, start_time: datetime, end_time: datetime):
+    """업비트 페이지 제너레이터 (최신 → 과거, 페이지당 200봉) - 시각은 모두 naive UTC"""
+    # to 파라미터는 UTC로 해석됨 (Z 표기)
+    to_time = end_time.strftime('%Y-%m-%dT%H:%M:%SZ')
     
-    max_iterations = 50  # 최대 50번 호출 (약 10000개 데이터)
+    # 필요한 페이지 수만큼 호출 (인트라바는 페이지가 많음), 안전 상한 2000번
+    expected_rows = (end_time - start_time) / INTERVAL_DELTAS[interval]
+    max_iterations = min(int(expected_rows // 200) + 2, 2000)
     
     for _ in range(max_iterations):
         df = fetch_upbit_ohlcv(market, interval, count=200, to=to_time)
@@ -335,97 +488,153 @@ def fetch_upbit_full(market: str, interval: str, start_time: datetime, end_time:
         if len(df) == 0:
             break
         
-        all_data.append(df)
+        yield df
         
         # 다음 페이지
         oldest = df.index.min()
         if oldest <= start_time:
             break
         
-        to_time = (oldest - timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%S')
+        to_time = (oldest - timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
         time.sleep(0.1)
-    
-    if not all_data:
-        return None
-    
-    combined = pd.concat(all_data)
-    combined = combined[~combined.index.duplicated(keep='first')]
-    combined = combined.sort_index()
-    
-    return combined
 
 
-def update_upbit():
-    """업비트 4H/1D 데이터 업데이트"""
+def update_upbit(universe: dict):
+    """업비트 4H/1D (+ 인트라바) 데이터 업데이트"""
     print("\n🟠 Updating Upbit data...")
     
-    last_complete_4h = get_last_completed_candle_time('4h')
-    last_complete_1d = get_last_completed_candle_time('1d')
-    
-    # [수정] Timezone 제거 (Naive로 통일하여 계산)
-    last_complete_4h = last_complete_4h.replace(tzinfo=None)
-    last_complete_1d = last_complete_1d.replace(tzinfo=None)
-    
-    # 한국 시간으로 변환 (값만 +9시간, Naive 유지)
-    kst_offset = timedelta(hours=9)
-    last_complete_4h_kst = last_complete_4h + kst_offset
-    last_complete_1d_kst = last_complete_1d + kst_offset
-    
-    for market in UPBIT_SYMBOLS:
-        symbol = market.replace('KRW-', '').lower()
-        
-        # 4H 데이터
-        filepath_4h = os.path.join(DATA_DIR, f'upbit_{symbol}_4h.csv')
-        existing_4h = load_existing_csv(filepath_4h)
-        
-        if existing_4h is not None and len(existing_4h) > 0:
-            last_date = existing_4h.index.max()
-            start_time = last_date + timedelta(hours=4)
-        else:
-            start_time = last_complete_4h_kst - timedelta(days=365*3)
-        
-        if start_time <= last_complete_4h_kst:
-            try:
-                new_data = fetch_upbit_full(market, '4h', start_time, last_complete_4h_kst + timedelta(hours=4))
-                
-                if new_data is not None and len(new_data) > 0:
-                    # 완료된 캔들만
-                    new_data = new_data[new_data.index <= last_complete_4h_kst]
-                    
-                    if len(new_data) > 0:
-                        combined = merge_and_dedupe(existing_4h, new_data)
-                        save_csv(combined, filepath_4h)
-                        print(f"  📊 {market} 4H: {len(new_data)} new rows")
-            except Exception as e:
-                print(f"  ❌ Error {market} 4H: {e}")
-        
-        # 1D 데이터
-        filepath_1d = os.path.join(DATA_DIR, f'upbit_{symbol}_1d.csv')
-        existing_1d = load_existing_csv(filepath_1d)
-        
-        if existing_1d is not None and len(existing_1d) > 0:
-            last_date = existing_1d.index.max()
-            start_time = last_date + timedelta(days=1)
-        else:
-            start_time = last_complete_1d_kst - timedelta(days=365*3)
-        
-        if start_time <= last_complete_1d_kst:
+    # 업비트 캔들 경계는 UTC 격자 (KST 09시 일봉 = UTC 00시), CSV 표기만 한국시간
+    tz, _ = universe_clock(universe)
+    last_complete_utc = {
+        interval: get_last_completed_candle_time(interval).replace(tzinfo=None)
+        for interval in universe['intervals'] + universe.get('intrabar', [])
+    }
+    
+    for market in universe['symbols']:
+        for interval, filepath in update_targets(universe, market):
+            step = INTERVAL_DELTAS[interval]
+            last_complete = last_complete_utc[interval]
+            
+            last_date = last_saved_time(filepath, tz)
+            
+            if last_date is not None:
+                start_time = last_date + step
+            else:
+                start_time = last_complete - timedelta(days=365*3)
+            
+            if start_time > last_complete:
+                continue
+            
             try:
-                new_data = fetch_upbit_full(market, '1d', start_time, last_complete_1d_kst + timedelta(days=1))
-                
-                if new_data is not None and len(new_data) > 0:
-                    # 완료된 캔들만
-                    new_data = new_data[new_data.index <= last_complete_1d_kst]
-                    
-                    if len(new_data) > 0:
-                        combined = merge_and_dedupe(existing_1d, new_data)
-                        save_csv(combined, filepath_1d)
-                        print(f"  📊 {market} 1D: {len(new_data)} new rows")
+                # 페이지 단위로 받아 완료된 캔들만 파일 끝에 추가
+                pages = iter_upbit_pages(market, interval, start_time, last_complete + step)
+                added = ingest(pages, filepath, last_date, last_complete, tz=tz)
+                if added > 0:
+                    print(f"  📊 {market} {interval.upper()}: {added} new rows")
             except Exception as e:
-                print(f"  ❌ Error {market} 1D: {e}")
+                print(f"  ❌ Error {market} {interval.upper()}: {e}")
         
         time.sleep(0.2)
 
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 신호 알림 / 대시보드 스냅샷
+# ════════════════════════════════════════════════════════════════════════════════
+
+def load_frames(registry: dict) -> tuple:
+    """전체 유니버스 봉 로드 1회 (알림 / 스냅샷 공용) → (frames, 파일 상태)"""
+    from core.data import get_data_status, read_universe_bars
+    
+    frames, files = {}, {}
+    for universe_id, universe in registry['universes'].items():
+        for symbol, interval, filename in universe_files(universe):
+            df = read_universe_bars(universe, symbol, interval)
+            frames[(universe_id, symbol, interval)] = df
+            files[filename] = get_data_status(filename, loader=lambda *_, df=df: df)
+    return frames, files
+
+
+def send_alerts(registry: dict, frames: dict) -> list:
+    """최신 신호를 이전 실행 상태와 비교 → 바뀐 심볼을 알림 싱크로 전달"""
+    from core.alerts import build_sinks, run_alerts
+    from core.plan import compile_plan
+    
+    config = registry.get('alerts')
+    if not config:
+        return []
+    
+    print("\n🔔 Checking signal changes...")
+    
+    try:
+        labels = {sid: strategy.get('label', sid) for sid, strategy in registry['strategies'].items()}
+        events = run_alerts(
+            compile_plan(registry), frames, os.path.join(DATA_DIR, config.get('state', 'signals.json')),
+            build_sinks(config.get('sinks', []), LOG_DIR), labels, config.get('strategies'),
+        )
+        print(f"  {len(events)} signal changes" if events else "  ℹ️ No signal changes")
+        return events
+    except Exception as e:
+        print(f"  ❌ Error checking signals: {e}")
+        return []
+
+
+def publish_snapshot(registry: dict, frames: dict, files: dict):
+    """전체 백테스트 1회 → data/snapshot.npz (내용이 바뀐 경우에만 기록, 같은 서버에서 대시보드를 띄울 때 사용)"""
+    from core.plan import compile_plan, evaluate_plan
+    from core.result_store import data_fingerprint
+    from core.snapshot import SNAPSHOT_FILENAME, build_snapshot, write_snapshot
+    
+    print("\n🧊 Publishing dashboard snapshot...")
+    
+    try:
+        results = evaluate_plan(compile_plan(registry), frames)
+        snapshot = build_snapshot(registry, results, files, fingerprint=data_fingerprint(registry, DATA_DIR))
+        filepath = os.path.join(DATA_DIR, SNAPSHOT_FILENAME)
+        if not write_snapshot(snapshot, filepath):
+            print(f"  ℹ️ Snapshot unchanged ({snapshot['as_of']}) - not rewritten")
+            return
+        print(f"✅ Snapshot v{snapshot['version']} ({snapshot['as_of']}, {len(snapshot['strategies'])} strategies, "
+              f"{os.path.getsize(filepath) // 1024} KB) → {filepath}")
+    except Exception as e:
+        print(f"  ❌ Error publishing snapshot: {e}")
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# 데이터 검증
+# ════════════════════════════════════════════════════════════════════════════════
+
+def validate_data(registry: dict) -> dict:
+    """전체 데이터 파일 검증 → data/checksums.json (체크섬이 같은 파일은 이전 결과 재사용)"""
+    print("\n🔍 Validating data files...")
+    
+    manifest = read_manifest(DATA_DIR)
+    entries, validated = verify_files(registry_data_files(registry), DATA_DIR, manifest)
+    
+    # 바뀐 파일이 없으면 매니페스트도 그대로 (워크플로가 빈 커밋을 만들지 않도록)
+    if manifest is None or manifest['files'] != entries:
+        write_manifest(entries, DATA_DIR)
+    summary = summarize(entries)
+    
+    print(f"  {summary['files']} files ({validated} changed, {summary['files'] - validated} unchanged)")
+    for filename in summary['error_files']:
+        issues = ', '.join(f"{CHECKS[name][0]} {count}" for name, count in entries[filename]['errors'].items())
+        print(f"  ❌ {filename}: {issues}")
+    if summary['warnings']:
+        issues = ', '.join(f"{CHECKS[name][0]} {count}" for name, count in summary['warnings'].items())
+        print(f"  ⚠️ {len(summary['warning_files'])} files: {issues}")
+    if not summary['error_files']:
+        print("  ✅ No errors")
+    
+    return summary
+
+
+# 데이터 소스별 업데이트 함수
+UPDATERS = {
+    'yahoo': update_tqqq,
+    'binance_futures': update_bitget,
+    'upbit': update_upbit,
+}
+
 # ════════════════════════════════════════════════════════════════════════════════
 # 메인
 # ════════════════════════════════════════════════════════════════════════════════
@@ -438,18 +647,38 @@ def main():
     
     # 데이터 폴더 생성
     os.makedirs(DATA_DIR, exist_ok=True)
+    remove_stale_temp_files()
+    
+    registry = load_registry()
+    migrate_time_columns(registry)
     
     # 현재 시간 기준으로 어떤 데이터를 업데이트할지 결정
     now = datetime.now(timezone.utc)
     hour = now.hour
     
-    # TQQQ: UTC 21시 (한국시간 화~토 06시) 전후에 실행
-    if 20 <= hour <= 22 or hour <= 1:
-        update_tqqq()
-    
-    # 4H 데이터: 항상 실행 (스케줄에서 시간 관리)
-    update_bitget()
-    update_upbit()
+    for universe_id, universe in registry['universes'].items():
+        # 미국 주식 (yahoo): UTC 21시 (한국시간 화~토 06시) 전후에만 실행
+        if universe['source'] == 'yahoo' and not (20 <= hour <= 22 or hour <= 1):
+            continue
+        
+        # 코인 (4H 등): 항상 실행 (스케줄에서 시간 관리)
+        updater = UPDATERS.get(universe['source'])
+        if updater is None:
+            print(f"\n⚠️ {universe_id}: 알 수 없는 source '{universe['source']}'")
+            continue
+        updater(universe)
+    
+    # 검증 오류가 있으면 스냅샷을 만들지 않고 실패 (워크플로가 데이터를 커밋하지 않음)
+    summary = validate_data(registry)
+    if summary['error_files']:
+        print("\n" + "=" * 60)
+        print(f"❌ Validation failed: {len(summary['error_files'])} files")
+        print("=" * 60)
+        sys.exit(1)
+    
+    frames, files = load_frames(registry)
+    send_alerts(registry, frames)
+    publish_snapshot(registry, frames, files)
     
     print("\n" + "=" * 60)
     print("✅ Update completed!")
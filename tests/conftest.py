@@ -0,0 +1,10 @@
+"""
+pytest 공통 설정 - 저장소 루트를 import 경로에 추가 (core / scripts 모듈)
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
@@ -0,0 +1,121 @@
+"""
+core.aggregates - 기간별 복리 집계
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.aggregates import AggregateStore, PeriodAggregator
+
+
+def daily_returns(days: int = 90, value: float = 0.01) -> pd.Series:
+    index = pd.date_range('2024-01-01', periods=days, freq='D', name='datetime')
+    return pd.Series(value, index=index)
+
+
+def test_compounded_matches_direct_product():
+    returns = daily_returns()
+    aggregator = PeriodAggregator()
+    assert aggregator.update(returns) == len(returns)
+    
+    expected = returns.groupby(returns.index.to_period('M')).apply(lambda r: (np.prod(1 + r) - 1) * 100)
+    result = aggregator.compounded('M')
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+    assert list(result.index) == list(expected.index)
+
+
+def test_incremental_update_appends_only_new_bars():
+    returns = daily_returns()
+    aggregator = PeriodAggregator()
+    aggregator.update(returns.iloc[:60])
+    version = aggregator.version
+    
+    assert aggregator.update(returns) == 30
+    assert aggregator.version == version + 1
+    assert aggregator.update(returns) == 0
+    
+    full = PeriodAggregator()
+    full.update(returns)
+    pd.testing.assert_series_equal(aggregator.compounded('W'), full.compounded('W'))
+
+
+def test_changed_history_rebuilds():
+    returns = daily_returns()
+    aggregator = PeriodAggregator()
+    aggregator.update(returns)
+    
+    changed = returns.copy()
+    changed.iloc[5] = 0.5
+    aggregator.update(changed)
+    
+    fresh = PeriodAggregator()
+    fresh.update(changed)
+    assert len(aggregator) == len(returns)
+    pd.testing.assert_series_equal(aggregator.compounded('M'), fresh.compounded('M'))
+
+
+def test_offsetting_revision_in_middle_rebuilds():
+    # 1월 봉 +, 2월 봉 - 로 수정 → 전체 로그수익률 합은 그대로지만 월별 값은 바뀜
+    returns = daily_returns()
+    aggregator = PeriodAggregator()
+    aggregator.update(returns)
+    before = aggregator.compounded('M')
+    
+    changed = returns.copy()
+    changed.iloc[10] = np.expm1(np.log1p(0.01) + 0.05)
+    changed.iloc[40] = np.expm1(np.log1p(0.01) - 0.05)
+    aggregator.update(changed)
+    
+    fresh = PeriodAggregator()
+    fresh.update(changed)
+    pd.testing.assert_series_equal(aggregator.compounded('M'), fresh.compounded('M'))
+    assert aggregator.compounded('M').iloc[0] > before.iloc[0]
+
+
+def test_date_bounds_are_inclusive_utc_days():
+    index = pd.date_range('2024-01-01', periods=24 * 10, freq='h', name='datetime')
+    aggregator = PeriodAggregator()
+    aggregator.update(pd.Series(0.001, index=index))
+    
+    result = aggregator.compounded('Y', '2024-01-03', '2024-01-04')
+    np.testing.assert_allclose(result.iloc[0], (1.001 ** 48 - 1) * 100)
+
+
+def test_total_loss_does_not_poison_later_periods():
+    returns = daily_returns()
+    returns.iloc[40] = -1.0
+    aggregator = PeriodAggregator()
+    aggregator.update(returns)
+    
+    result = aggregator.compounded('M')
+    assert np.isfinite(result.to_numpy()).all()
+    np.testing.assert_allclose(result.iloc[1], -100)
+    np.testing.assert_allclose(result.iloc[2], (1.01 ** 30 - 1) * 100)
+
+
+def test_concurrent_readers_see_consistent_state():
+    returns = daily_returns(400)
+    store = AggregateStore()
+    store.update('s', returns.iloc[:10])
+    aggregator = store.get('s')
+    errors = []
+    
+    def read():
+        for _ in range(200):
+            try:
+                result = aggregator.compounded('M')
+                assert np.isfinite(result.to_numpy()).all()
+            except Exception as e:
+                errors.append(e)
+    
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for n in range(11, 400, 7):
+        store.update('s', returns.iloc[:n])
+    for thread in readers:
+        thread.join()
+    
+    assert not errors
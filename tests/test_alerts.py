@@ -0,0 +1,169 @@
+"""
+core.alerts - 최신 신호 / 신호 변경 이벤트 / 싱크
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.alerts import (FileSink, MemorySink, StdoutSink, WebhookSink, build_sinks, diff_signals, format_event,
+                         latest_signals, read_signal_state, run_alerts, write_signal_state)
+from core.plan import compile_plan, evaluate_plan
+
+SERIES = ('u', 'BTCUSDT', '4h')
+
+
+def make_ohlcv(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(1e3, 1e6, rows),
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='4h', name='datetime'))
+
+
+@pytest.fixture
+def plan():
+    registry = {
+        'universes': {'u': {'quote': 'USDT', 'intervals': ['4h'], 'file': 'u_{name}_{interval}.csv', 'symbols': ['BTCUSDT']}},
+        'strategies': {'s': {
+            'kind': 'ma_stoch_gate', 'universe': 'u', 'ma_interval': '4h', 'stoch_interval': '4h',
+            'min_extra_bars': 10, 'symbols': {'BTCUSDT': {'ma': 20, 'stoch': [14, 3, 3]}},
+        }},
+    }
+    return compile_plan(registry)
+
+
+@pytest.fixture
+def frames():
+    return {SERIES: make_ohlcv(600)}
+
+
+def signal(position: float, bar: str = '2024-01-01 00:00:00') -> dict:
+    return {'strategy': 's', 'symbol': 'BTCUSDT', 'name': 'BTC', 'position': position, 'bar': bar}
+
+
+def test_diff_signals_kinds():
+    previous = {'a': signal(0.0), 'b': signal(1.0), 'c': signal(1.0), 'd': signal(0.5)}
+    current = {'a': signal(1.0), 'b': signal(0.0), 'c': signal(2.0), 'd': signal(0.5), 'new': signal(1.0)}
+    
+    events = {event['kind']: event for event in diff_signals(previous, current)}
+    assert set(events) == {'entry', 'exit', 'resize'}
+    assert events['entry']['previous'] == 0.0 and events['entry']['position'] == 1.0
+    assert events['resize']['previous'] == 1.0 and events['resize']['position'] == 2.0
+    assert len(diff_signals(previous, current)) == 3
+
+
+def test_latest_signals_match_full_backtest(plan, frames):
+    positions = evaluate_plan(plan, frames)['s']['positions']['BTC'].dropna()
+    signals = latest_signals(plan, frames)
+    assert signals['s/BTCUSDT']['position'] == positions.iloc[-1]
+    assert signals['s/BTCUSDT']['bar'] == str(positions.index[-1])
+
+
+def test_signal_flip_reaches_stub_sink(plan, frames, tmp_path):
+    positions = evaluate_plan(plan, frames)['s']['positions']['BTC'].dropna()
+    flips = np.flatnonzero(positions.to_numpy()[1:] != positions.to_numpy()[:-1]) + 1
+    flip_bar = positions.index[flips[-1]]
+    before = {SERIES: frames[SERIES].loc[:flip_bar].iloc[:-1]}
+    after = {SERIES: frames[SERIES].loc[:flip_bar]}
+    
+    state_path = str(tmp_path / 'signals.json')
+    sink = MemorySink()
+    assert run_alerts(plan, before, state_path, [sink]) == []  # 첫 실행: 상태만 저장
+    events = run_alerts(plan, after, state_path, [sink], labels={'s': 'Strategy'})
+    
+    assert len(events) == 1 and sink.events == events
+    event = events[0]
+    assert event['previous'] == positions.iloc[flips[-1] - 1]
+    assert event['position'] == positions.iloc[flips[-1]]
+    assert event['bar'] == str(flip_bar)
+    assert event['kind'] == ('entry' if event['previous'] == 0 else 'exit' if event['position'] == 0 else 'resize')
+    assert sink.messages == [format_event(event, {'s': 'Strategy'})]
+    assert read_signal_state(state_path)['s/BTCUSDT']['position'] == event['position']
+    
+    # 같은 데이터로 다시 실행 → 이벤트 없음
+    assert run_alerts(plan, after, state_path, [sink]) == []
+    assert len(sink.events) == 1
+
+
+def test_failing_sink_does_not_block_others(plan, frames, tmp_path):
+    state_path = str(tmp_path / 'signals.json')
+    current = latest_signals(plan, frames)
+    write_signal_state({key: {**s, 'position': 0.0 if s['position'] else 1.0} for key, s in current.items()}, state_path)
+    
+    class BrokenSink:
+        def emit(self, events, messages):
+            raise RuntimeError('down')
+    
+    sink = MemorySink()
+    events = run_alerts(plan, frames, state_path, [BrokenSink(), sink])
+    assert len(events) == 1 and sink.events == events
+
+
+def test_state_version_mismatch_is_ignored(tmp_path):
+    state_path = tmp_path / 'signals.json'
+    state_path.write_text(json.dumps({'version': 0, 'signals': {'a': signal(1.0)}}))
+    assert read_signal_state(str(state_path)) is None
+    assert read_signal_state(str(tmp_path / 'missing.json')) is None
+
+
+def test_stdout_and_file_sinks(tmp_path):
+    events = diff_signals({'a': signal(0.0)}, {'a': signal(1.0)})
+    messages = [format_event(event) for event in events]
+    
+    stream = io.StringIO()
+    StdoutSink(stream).emit(events, messages)
+    assert stream.getvalue() == f"  {messages[0]}\n"
+    
+    path = tmp_path / 'logs' / 'alerts.jsonl'  # 폴더가 없으면 만듦
+    FileSink(str(path)).emit(events, messages)
+    FileSink(str(path)).emit(events, messages)
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert len(lines) == 2 and lines[0]['message'] == messages[0] and lines[0]['kind'] == 'entry'
+
+
+def test_webhook_sink_posts_text_and_events(monkeypatch):
+    import requests
+    
+    posted = {}
+    
+    class Response:
+        def raise_for_status(self):
+            pass
+    
+    def post(url, json, timeout):
+        posted.update(url=url, json=json, timeout=timeout)
+        return Response()
+    
+    monkeypatch.setattr(requests, 'post', post)
+    events = diff_signals({'a': signal(1.0)}, {'a': signal(0.0)})
+    WebhookSink('https://hooks.example/x', timeout=3).emit(events, ['m1'])
+    assert posted['url'] == 'https://hooks.example/x' and posted['timeout'] == 3
+    assert posted['json']['text'] == posted['json']['content'] == 'm1'
+    assert posted['json']['events'][0]['kind'] == 'exit'
+
+
+def test_build_sinks(monkeypatch, tmp_path):
+    monkeypatch.setenv('TEST_ALERT_URL', 'https://hooks.example/y')
+    monkeypatch.delenv('UNSET_ALERT_URL', raising=False)
+    sinks = build_sinks([
+        {'type': 'stdout'},
+        {'type': 'file', 'path': 'alerts.jsonl'},
+        {'type': 'webhook', 'url_env': 'TEST_ALERT_URL'},
+        {'type': 'webhook', 'url_env': 'UNSET_ALERT_URL'},
+    ], str(tmp_path))
+    
+    assert [type(sink) for sink in sinks] == [StdoutSink, FileSink, WebhookSink]
+    assert sinks[1].path == str(tmp_path / 'alerts.jsonl')
+    assert sinks[2].url == 'https://hooks.example/y'
+    with pytest.raises(ValueError):
+        build_sinks([{'type': 'pager'}], str(tmp_path))
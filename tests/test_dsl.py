@@ -0,0 +1,122 @@
+"""
+core.dsl - 표현식 파서 / 컴파일러 (CSE) / NumPy 평가
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.dsl import as_expression, compile_expression, expression_intervals, parse, run_program
+from core.plan import compile_plan, evaluate_plan
+
+BASE = ('u', 'BTCUSDT', '4h')
+
+
+def compile_text(text: str, params: dict = None):
+    nodes = []
+    
+    def add_node(series, indicator, p):
+        nodes.append((series, indicator, p))
+        return f'{indicator}{p}'
+    
+    return compile_expression(text, BASE, params or {}, add_node), nodes
+
+
+def evaluate(text: str, columns: dict, params: dict = None) -> np.ndarray:
+    program, _ = compile_text(text, params)
+    leaves = {key: columns[spec[2]] for key, spec in program['leaves'].items()}
+    return run_program(program, leaves, len(next(iter(columns.values()))))
+
+
+def make_ohlcv(rows: int, freq: str, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    return pd.DataFrame({
+        'open': open_, 'high': np.maximum(open_, close) + spread, 'low': np.minimum(open_, close) - spread,
+        'close': close, 'volume': rng.uniform(1e3, 1e6, rows),
+    }, index=pd.date_range('2024-01-01', periods=rows, freq=freq, name='datetime'))
+
+
+def test_precedence_and_is_lower_than_comparison():
+    assert parse('close > 1 & open < 2') == (
+        'binary', 'and', ('binary', 'gt', ('column', 'close', None), ('const', 1)),
+        ('binary', 'lt', ('column', 'open', None), ('const', 2)),
+    )
+    assert parse('-close * 2')[1] == 'mul'
+
+
+@pytest.mark.parametrize('text', ['close >', 'foo(close)', 'ma(close)', 'close@', 'where(close, 1, 2)@1d', '(close'])
+def test_syntax_errors(text):
+    with pytest.raises(ValueError):
+        program, _ = compile_text(text)
+
+
+def test_arithmetic_and_logic():
+    close = np.array([1.0, 2.0, 3.0, 4.0])
+    open_ = np.array([2.0, 2.0, 2.0, 2.0])
+    columns = {'close': close, 'open': open_}
+    np.testing.assert_array_equal(evaluate('(close > open) * 2 + 1', columns), [1, 1, 3, 3])
+    np.testing.assert_array_equal(evaluate('~(close > open) | close == 4', columns), [1, 1, 0, 1])
+    np.testing.assert_array_equal(evaluate('where(close > open, close, -open)', columns), [-2, -2, 3, 4])
+    np.testing.assert_array_equal(evaluate('max(close, open, 3)', columns), [3, 3, 3, 4])
+    np.testing.assert_array_equal(evaluate('$w', columns, {'w': 0.5}), [0.5] * 4)
+
+
+def test_common_subexpressions_compile_once():
+    text = '(close > ma(close, 20)) & (close > ma(close, 20)) | stoch_k(14, 3) > stoch_d(14, 3, 5)'
+    program, nodes = compile_text(text)
+    
+    assert sorted(nodes) == [(BASE, 'ma', ('close', 20)), (BASE, 'stoch', (14, 3, 5))]
+    assert len([op for _, op, _ in program['ops'] if op == 'gt']) == 2
+    
+    # 모든 연산 / 값은 출력에서 도달 가능
+    reachable, stack = set(), [program['output']]
+    ops = {key: args for key, _, args in program['ops']}
+    while stack:
+        key = stack.pop()
+        reachable.add(key)
+        stack.extend(a for a in ops.get(key, ()) if isinstance(a, str) and a not in reachable)
+    assert set(ops) | set(program['leaves']) == reachable
+
+
+def test_list_parameters_expand():
+    program, nodes = compile_text('vote(close > ma(close, $periods))', {'periods': [5, 10, 20]})
+    assert [n[2] for n in nodes] == [('close', 5), ('close', 10), ('close', 20)]
+    assert program['base_ma'] == 20
+    
+    with pytest.raises(ValueError):
+        compile_text('close > ma(close, $periods)', {'periods': [5, 10]})
+
+
+def test_intervals():
+    assert expression_intervals('stoch_k(1, 2)@1d > close@$iv') == {'1d', '$iv'}
+    program, _ = compile_text('close@1d > ma(close, 3)@1d')
+    assert set(program['series']) == {BASE, BASE[:2] + ('1d',)}
+
+
+@pytest.mark.parametrize('kind', ['ma_vote', 'ma_stoch_gate'])
+def test_kind_expressions_match_hand_written_kernels(kind):
+    symbols = ['AAA', 'BBB']
+    strategy = {
+        'kind': kind, 'universe': 'u', 'min_extra_bars': 10, 'clip_lower': -0.99,
+        'symbols': {s: {'ma': 30 + 10 * i, 'stoch': [20, 3, 3], 'leverage': 2,
+                        'ma_periods': [10, 20, 30], 'bear_ma_periods': [10, 20]} for i, s in enumerate(symbols)},
+    }
+    if kind == 'ma_vote':
+        strategy.update(interval='4h', min_bars=100)
+    else:
+        strategy.update(ma_interval='4h', stoch_interval='1d')
+    registry = {
+        'universes': {'u': {'intervals': ['4h', '1d'], 'file': 'u_{name}_{interval}.csv', 'symbols': symbols}},
+        'strategies': {'kernel': strategy, 'expr': as_expression(strategy)},
+    }
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        frames[('u', symbol, '4h')] = make_ohlcv(1200, '4h', i)
+        frames[('u', symbol, '1d')] = make_ohlcv(201, '1D', 100 + i)
+    
+    results = evaluate_plan(compile_plan(registry), frames)
+    for key in ('returns', 'positions', 'benchmark'):
+        pd.testing.assert_frame_equal(results['kernel'][key], results['expr'][key], check_exact=True, check_freq=False)
@@ -0,0 +1,98 @@
+"""
+core.integrity - 데이터 파일 검증 / 체크섬 매니페스트
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.integrity import (check_bars, read_manifest, registry_data_files, summarize, validate_file, verify_files,
+                            write_manifest)
+from core.timebase import localize
+
+
+def frame(index) -> pd.DataFrame:
+    n = len(index)
+    close = np.linspace(100, 110, n)
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.ones(n)},
+                        index=pd.DatetimeIndex(index, name='datetime'))
+
+
+def write_csv(path, df: pd.DataFrame, labels=None):
+    out = df.copy()
+    out.insert(0, 'timestamp', df.index.as_unit('s').asi8)
+    out.insert(1, 'datetime', labels if labels is not None else df.index.strftime('%Y-%m-%d %H:%M:%S'))
+    out.to_csv(path, index=False)
+
+
+def test_clean_frame_has_no_findings():
+    assert check_bars(frame(pd.date_range('2026-08-01', periods=12, freq='4h')), '4h') == {}
+
+
+def test_errors_and_gap_warning():
+    index = list(pd.date_range('2026-08-01', periods=8, freq='4h'))
+    index[3] = index[2]                              # 중복
+    index[5] = index[5] + pd.Timedelta(minutes=30)   # 격자 이탈
+    index.append(index[-1] + pd.Timedelta(hours=12))  # 누락 구간
+    df = frame(index)
+    df.iloc[1, df.columns.get_loc('high')] = 0.5      # OHLC 불일치
+    df.iloc[2, df.columns.get_loc('close')] = np.nan  # OHLC 결측
+    df.iloc[4, df.columns.get_loc('volume')] = -1
+    
+    counts = check_bars(df, '4h')
+    assert counts['not_increasing'] == 1
+    assert counts['off_grid'] == 1
+    assert counts['gaps'] >= 1
+    assert counts['ohlc_inconsistent'] == 1
+    assert counts['missing_price'] == 1
+    assert counts['negative_volume'] == 1
+
+
+def test_local_grid_survives_dst():
+    days = localize(pd.DatetimeIndex(['2026-03-06', '2026-03-09', '2026-03-10']), 'America/New_York')
+    df = frame(days)
+    assert 'off_grid' not in check_bars(df, '1d', 'America/New_York', 'local')
+    assert check_bars(df, '1d')['off_grid'] == 3  # UTC 격자로는 전부 어긋남
+
+
+def test_time_mismatch_between_epoch_and_label(tmp_path):
+    df = frame(pd.date_range('2026-08-01', periods=4, freq='4h'))
+    labels = list(df.index.strftime('%Y-%m-%d %H:%M:%S'))
+    labels[2] = '2026-08-01'
+    path = tmp_path / 'x.csv'
+    write_csv(path, df, labels)
+    
+    entry = validate_file(str(path), '4h')
+    assert entry['errors'] == {'time_mismatch': 1}
+    assert entry['rows'] == 4 and entry['start'] == '2026-08-01 00:00:00'
+
+
+def test_legacy_file_warning(tmp_path):
+    path = tmp_path / 'legacy.csv'
+    frame(pd.date_range('2026-08-01', periods=3, freq='4h')).to_csv(path)
+    entry = validate_file(str(path), '4h')
+    assert entry['errors'] == {} and entry['warnings'] == {'legacy_time': 3}
+
+
+def test_manifest_reuses_unchanged_files(tmp_path):
+    registry = {'universes': {'u': {'file': 'u_{name}_{interval}.csv', 'symbols': ['A', 'B'], 'intervals': ['4h'],
+                                    'timezone': 'Asia/Seoul'}}}
+    files = registry_data_files(registry)
+    assert files == [('u_a_4h.csv', '4h', 'Asia/Seoul', 'utc'), ('u_b_4h.csv', '4h', 'Asia/Seoul', 'utc')]
+    
+    write_csv(tmp_path / 'u_a_4h.csv', frame(pd.date_range('2026-08-01', periods=6, freq='4h')),
+              labels=pd.date_range('2026-08-01 09:00', periods=6, freq='4h').strftime('%Y-%m-%d %H:%M:%S'))
+    entries, validated = verify_files(files, str(tmp_path))
+    assert validated == 1 and list(entries) == ['u_a_4h.csv']  # 없는 파일은 건너뜀
+    assert entries['u_a_4h.csv']['errors'] == {}
+    
+    write_manifest(entries, str(tmp_path))
+    manifest = read_manifest(str(tmp_path))
+    assert verify_files(files, str(tmp_path), manifest)[1] == 0
+    
+    # 시간대 메타데이터가 바뀌면 다시 검증
+    changed = [(name, interval, 'UTC', grid) for name, interval, _, grid in files]
+    entries, validated = verify_files(changed, str(tmp_path), manifest)
+    assert validated == 1 and entries['u_a_4h.csv']['errors'] == {'time_mismatch': 6}
+    
+    summary = summarize(entries)
+    assert summary['error_files'] == ['u_a_4h.csv'] and summary['errors'] == {'time_mismatch': 6}
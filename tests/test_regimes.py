@@ -0,0 +1,56 @@
+"""
+core.regimes - 국면 라벨 (증분 갱신)
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.regimes import UNLABELED, RegimeLabeler, label_regimes
+
+CONFIG = {'interval': '4h', 'trend_ma': 20, 'vol_window': 5, 'vol_lookback': 10}
+
+
+def prices(rows: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    return pd.DataFrame({'close': close}, index=pd.date_range('2026-01-01', periods=rows, freq='4h', name='datetime'))
+
+
+def test_incremental_labels_match_full_recompute():
+    df = prices()
+    labeler = RegimeLabeler(CONFIG)
+    assert labeler.update(df.iloc[:150]) == 150
+    assert labeler.update(df) == 50
+    assert labeler.update(df) == 0
+    
+    expected = label_regimes(df['close'].to_numpy(), CONFIG)
+    np.testing.assert_array_equal(labeler.codes, expected)
+    assert (expected[:19] == UNLABELED).all() and expected[19] != UNLABELED
+
+
+def test_revised_historical_close_recomputes():
+    df = prices()
+    labeler = RegimeLabeler(CONFIG)
+    labeler.update(df)
+    before = labeler.codes
+    
+    # 마지막 종가는 그대로, 중간 봉만 수정 (수정주가 / 오류 정정)
+    revised = df.copy()
+    revised.iloc[60:80, 0] *= 1.5
+    labeler.update(revised)
+    
+    expected = label_regimes(revised['close'].to_numpy(), CONFIG)
+    np.testing.assert_array_equal(labeler.codes, expected)
+    assert not np.array_equal(before, expected)
+
+
+def test_align_uses_only_closed_bars():
+    df = prices()
+    labeler = RegimeLabeler(CONFIG)
+    labeler.update(df)
+    
+    # 라벨 봉 i는 시작 + 4시간에 마감 → 그 시각에 시작하는 봉부터 사용
+    target = df.index[[0, 50, 51]]
+    aligned = labeler.align(target)
+    assert aligned[0] == UNLABELED
+    assert aligned[1] == labeler.codes[49] and aligned[2] == labeler.codes[50]
@@ -0,0 +1,73 @@
+"""
+core.result_store - single-flight 결과 저장소 / 데이터 파일 지문
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from core.data import file_version
+from core.result_store import ResultStore, data_fingerprint
+
+REGISTRY = {'universes': {'u': {'file': 'u_{name}_{interval}.csv', 'symbols': ['A'], 'intervals': ['4h']}}}
+
+
+def test_concurrent_requests_compute_once():
+    store = ResultStore()
+    calls = []
+    started = threading.Event()
+    
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {'value': 1}
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_compute('k', compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = store.stats()
+    assert stats['misses'] == 1 and stats['hits'] + stats['waits'] == 7
+
+
+def test_errors_propagate_and_are_not_stored():
+    store = ResultStore()
+    
+    def fail():
+        raise RuntimeError('boom')
+    
+    with pytest.raises(RuntimeError):
+        store.get_or_compute('k', fail)
+    assert store.get_or_compute('k', lambda: 2) == 2
+    assert store.stats()['errors'] == 1
+
+
+def test_lru_eviction():
+    store = ResultStore(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        store.get_or_compute(key, lambda key=key: key)
+    assert len(store) == 2
+    assert store.get_or_compute('a', lambda: 'recomputed') == 'recomputed'
+
+
+def test_fingerprint_and_file_version_follow_file_changes(tmp_path):
+    filepath = tmp_path / 'u_a_4h.csv'
+    assert file_version(filepath.name, str(tmp_path)) == '-'
+    before = data_fingerprint(REGISTRY, str(tmp_path))
+    
+    filepath.write_text('timestamp,close\n0,1\n')
+    version = file_version(filepath.name, str(tmp_path))
+    after = data_fingerprint(REGISTRY, str(tmp_path))
+    assert version != '-' and after != before
+    
+    os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10**9))
+    assert file_version(filepath.name, str(tmp_path)) != version
+    assert data_fingerprint(REGISTRY, str(tmp_path)) != after
@@ -0,0 +1,72 @@
+"""
+core.snapshot - 스냅샷 저장 / 로드
+"""
+
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from core.snapshot import build_snapshot, read_snapshot, snapshot_is_current, write_snapshot
+
+REGISTRY = {'strategies': {'s': {'periods_per_year': 365}}, 'universes': {}}
+
+
+def make_results(position_values=(0.0, 0.25, 1.0, 2.0)) -> dict:
+    index = pd.date_range('2026-01-01', periods=120, freq='D', name='datetime').as_unit('ns')
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame({'A': rng.normal(0, 0.01, len(index))}, index=index)
+    returns['portfolio_return'] = returns['A']
+    returns['cumulative_return'] = (1 + returns['portfolio_return']).cumprod()
+    positions = pd.DataFrame({'A': rng.choice(position_values, len(index))}, index=index)
+    benchmark = pd.DataFrame({'A': returns['A'], 'portfolio_return': returns['A'], 'excess_return': 0.0}, index=index)
+    return {'s': {'returns': returns, 'positions': positions, 'benchmark': benchmark}}
+
+
+def build(results, **kwargs):
+    return build_snapshot(REGISTRY, results, {}, today=date(2026, 4, 30), **kwargs)
+
+
+def test_round_trip(tmp_path):
+    filepath = str(tmp_path / 'snapshot.npz')
+    results = make_results()
+    assert write_snapshot(build(results, fingerprint='f1'), filepath)
+    
+    snapshot = read_snapshot(filepath)
+    pd.testing.assert_frame_equal(snapshot['strategies']['s']['returns'], results['s']['returns'], check_freq=False)
+    pd.testing.assert_frame_equal(snapshot['strategies']['s']['positions'], results['s']['positions'], check_freq=False)
+    assert snapshot_is_current(snapshot, REGISTRY, date(2026, 4, 30), 'f1')
+    assert not snapshot_is_current(snapshot, REGISTRY, date(2026, 4, 30), 'f2')
+    assert not snapshot_is_current(snapshot, REGISTRY, date(2026, 5, 1))
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    filepath = str(tmp_path / 'snapshot.npz')
+    results = make_results()
+    assert write_snapshot(build(results), filepath)
+    mtime = os.stat(filepath).st_mtime_ns
+    
+    # created_at만 다른 같은 내용 → 쓰지 않음
+    snapshot = build(results)
+    snapshot['created_at'] = '2099-01-01T00:00:00+00:00'
+    assert not write_snapshot(snapshot, filepath)
+    assert os.stat(filepath).st_mtime_ns == mtime
+    
+    results['s']['returns'].iloc[-1, 0] += 0.001
+    assert write_snapshot(build(results), filepath)
+
+
+def test_positions_never_lose_precision(tmp_path):
+    filepath = str(tmp_path / 'snapshot.npz')
+    results = make_results(position_values=(0.0, 1 / 3, 0.1))
+    write_snapshot(build(results), filepath)
+    
+    positions = read_snapshot(filepath)['strategies']['s']['positions']
+    np.testing.assert_array_equal(positions.to_numpy(), results['s']['positions'].to_numpy())
+    
+    with np.load(filepath) as data:
+        assert data['s.positions'].dtype == np.float64
+    write_snapshot(build(make_results()), filepath)
+    with np.load(filepath) as data:
+        assert data['s.positions'].dtype == np.float32
@@ -0,0 +1,73 @@
+"""
+core.timebase - UTC epoch 시간 모델
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.timebase import (align_to_base, date_slice, epoch_index, grid_times, localize, parse_local_times,
+                           to_epoch, to_local)
+
+
+def test_epoch_round_trip():
+    seconds = np.array([0, 1785614400, 1785628800], dtype=np.int64)
+    index = epoch_index(seconds)
+    assert index.name == 'datetime' and index.tz is None
+    assert index[1] == pd.Timestamp('2026-08-01 20:00')
+    np.testing.assert_array_equal(to_epoch(index), seconds)
+    
+    # 결측이 있는 열(float)은 NaT
+    with_missing = epoch_index(np.array([0.0, np.nan]))
+    assert with_missing[0] == pd.Timestamp(0) and with_missing[1] is pd.NaT
+
+
+def test_localize_and_to_local():
+    kst = pd.DatetimeIndex(['2026-08-02 09:00', '2026-08-02 01:00'])
+    utc = localize(kst, 'Asia/Seoul')
+    assert list(utc) == [pd.Timestamp('2026-08-02 00:00'), pd.Timestamp('2026-08-01 16:00')]
+    pd.testing.assert_index_equal(to_local(utc, 'Asia/Seoul'), kst.rename('datetime'))
+    
+    aware = pd.DatetimeIndex(['2026-08-02 00:00'], tz='America/New_York')
+    assert localize(aware, 'Asia/Seoul')[0] == pd.Timestamp('2026-08-02 04:00')
+
+
+def test_dst_gaps_become_nat():
+    # 2026-03-08 02:30은 뉴욕에 없는 시각, 2026-11-01 01:30은 두 번 있는 시각
+    index = localize(pd.DatetimeIndex(['2026-03-08 02:30', '2026-11-01 01:30', '2026-11-02 00:00']), 'America/New_York')
+    assert index[0] is pd.NaT and index[1] is pd.NaT
+    assert index[2] == pd.Timestamp('2026-11-02 05:00')
+
+
+def test_local_grid_is_midnight_across_dst():
+    days = pd.DatetimeIndex(['2026-03-06', '2026-03-09', '2026-11-02'])
+    utc = localize(days, 'America/New_York')
+    assert [t.hour for t in utc] == [5, 4, 5]
+    times = grid_times(utc, 'America/New_York', 'local')
+    assert (times == times.normalize()).all()
+    assert grid_times(utc, 'America/New_York', 'utc').equals(utc)
+
+
+def test_parse_local_times():
+    parsed = parse_local_times(pd.Series(['2026-08-02 09:00:00', 'bad']), 'Asia/Seoul')
+    assert parsed[0] == pd.Timestamp('2026-08-02 00:00') and parsed[1] is pd.NaT
+
+
+def test_date_slice_is_inclusive_utc_days():
+    index = pd.date_range('2026-08-01', periods=24, freq='4h', name='datetime')
+    series = pd.Series(np.arange(len(index)), index=index)
+    sliced = date_slice(series, '2026-08-02', '2026-08-03')
+    assert sliced.index[0] == pd.Timestamp('2026-08-02 00:00')
+    assert sliced.index[-1] == pd.Timestamp('2026-08-03 20:00')
+    assert len(sliced) == 12
+
+
+def test_align_to_base_maps_daily_to_containing_bar():
+    daily = pd.date_range('2026-08-01', periods=3, freq='D')
+    base = pd.date_range('2026-08-01 00:00', periods=14, freq='4h')
+    values = align_to_base(np.array([1.0, 2.0, 3.0]), daily, base, '1d')
+    np.testing.assert_array_equal(values, [1.0] * 6 + [2.0] * 6 + [3.0] * 2)
+    
+    # 일봉이 없는 날은 NaN, 같은 버킷이 여러 번이면 마지막 값
+    gappy = pd.DatetimeIndex(['2026-08-01', '2026-08-01', '2026-08-03'])
+    values = align_to_base(np.array([1.0, 1.5, 3.0]), gappy, base, '1d')
+    assert values[0] == 1.5 and np.isnan(values[6:12]).all() and values[12] == 3.0
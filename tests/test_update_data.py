@@ -0,0 +1,98 @@
+"""
+scripts/update_data.py - CSV 추가 (스트리밍 수집)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.data
+import update_data
+from core.integrity import validate_file
+from core.timebase import localize
+
+
+def bars(start: str, periods: int, freq: str) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq=freq, name='datetime')
+    close = np.linspace(100, 110, periods)
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.ones(periods),
+    }, index=index)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.data, 'DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+def label_column(filepath, column: str = 'datetime') -> pd.Series:
+    return pd.read_csv(filepath, dtype=str)[column]
+
+
+def test_midnight_only_chunk_keeps_label_format(data_dir):
+    filepath = str(data_dir / 'x_4h.csv')
+    first = bars('2026-08-01 12:00', 3, '4h')
+    update_data.ingest([first], filepath, None, first.index[-1])
+    
+    # 자정 봉 하나만 있는 청크 - pandas 자동 형식이면 '2026-08-02'로 써짐
+    midnight = bars('2026-08-02 00:00', 1, '4h')
+    assert update_data.ingest([midnight], filepath, first.index[-1], midnight.index[-1]) == 1
+    
+    labels = label_column(filepath)
+    assert labels.iloc[-1] == '2026-08-02 00:00:00'
+    assert labels.str.len().nunique() == 1
+    
+    df = core.data.read_csv_data('x_4h.csv')
+    assert df is not None and len(df) == 4
+    entry = validate_file(filepath, '4h')
+    assert entry['errors'] == {}
+
+
+def test_local_labels_follow_source_timezone(data_dir):
+    filepath = str(data_dir / 'upbit_4h.csv')
+    page = bars('2026-08-01 16:00', 3, '4h')  # KST 01:00 / 05:00 / 09:00
+    update_data.ingest([page], filepath, None, page.index[-1], tz='Asia/Seoul')
+    
+    assert list(label_column(filepath)) == ['2026-08-02 01:00:00', '2026-08-02 05:00:00', '2026-08-02 09:00:00']
+    assert validate_file(filepath, '4h', 'Asia/Seoul')['errors'] == {}
+    pd.testing.assert_index_equal(core.data.read_csv_data('upbit_4h.csv', 'Asia/Seoul').index, page.index.as_unit('s'))
+
+
+def test_daily_file_labels_are_dates(data_dir):
+    filepath = str(data_dir / 'daily.csv')
+    days = pd.DatetimeIndex(['2026-08-03', '2026-08-04'])
+    page = bars('2026-08-03', 2, 'D').set_axis(localize(days, 'America/New_York'))
+    update_data.ingest([page], filepath, None, page.index[-1], date_col='date', tz='America/New_York')
+    
+    assert list(label_column(filepath, 'date')) == ['2026-08-03', '2026-08-04']
+    assert validate_file(filepath, '1d', 'America/New_York', 'local')['errors'] == {}
+
+
+def test_legacy_file_is_migrated_before_append(data_dir):
+    filepath = data_dir / 'legacy_4h.csv'
+    filepath.write_text('datetime,open,high,low,close,volume\n2026-08-01 20:00:00,1,2,0.5,1.5,10\n')
+    
+    page = bars('2026-08-02 00:00', 2, '4h')
+    assert update_data.ingest([page], str(filepath), None, page.index[-1]) == 2
+    
+    df = pd.read_csv(filepath)
+    assert list(df.columns[:2]) == ['timestamp', 'datetime']
+    assert df['timestamp'].tolist() == [1785614400, 1785628800, 1785643200]
+    assert validate_file(str(filepath), '4h')['errors'] == {}
+
+
+def test_migration_drops_rows_without_time_label(data_dir):
+    filepath = data_dir / 'tqqq_daily.csv'
+    filepath.write_text(
+        'datetime,date,open,high,low,close,volume\n'
+        '2025-12-16,2025-12-16,51.4,52.8,51.1,52.3,100\n'
+        '2025-12-17,2025-12-17,52.6,52.8,49.4,49.4,120\n'
+        ',,51.7,52.5,51.0,51.5,108\n'
+    )
+    assert update_data.migrate_csv(str(filepath), 'America/New_York')
+    
+    df = pd.read_csv(filepath)
+    assert len(df) == 2 and df['timestamp'].notna().all()
+    assert update_data.read_last_csv_time(str(filepath), 'America/New_York') == pd.Timestamp('2025-12-17 05:00')
+    assert validate_file(str(filepath), '1d', 'America/New_York', 'local')['errors'] == {}